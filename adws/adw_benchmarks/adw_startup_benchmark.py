@@ -0,0 +1,239 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#   "pydantic",
+#   "python-dotenv",
+#   "click",
+#   "rich",
+#   "schedule",
+# ]
+# ///
+"""
+Startup benchmark for the ADW entry points.
+
+Times how long each entry point takes to start (`--help`, and a `--once`
+trigger check against an empty task list) and records its `-X importtime`
+profile, so import-time regressions show up before they reach tight shell
+loops.
+
+Usage:
+    # Benchmark every entry point
+    ./adws/adw_benchmarks/adw_startup_benchmark.py
+
+    # Save the results as a baseline
+    ./adws/adw_benchmarks/adw_startup_benchmark.py --output startup.json
+
+    # Compare against a saved baseline
+    ./adws/adw_benchmarks/adw_startup_benchmark.py --baseline startup.json
+
+Examples:
+    # More runs per entry point, top 10 imports each
+    ./adws/adw_benchmarks/adw_startup_benchmark.py --runs 10 --top 10
+
+    # Only the trigger
+    ./adws/adw_benchmarks/adw_startup_benchmark.py --only trigger
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+# adws/ directory holding the entry points
+ADWS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmark name -> argv relative to ADWS_DIR ({task_file} is an empty tasks.md)
+ENTRY_POINTS: Dict[str, List[str]] = {
+    "slash_command --help": ["adw_slash_command.py", "--help"],
+    "prompt --help": ["adw_prompt.py", "--help"],
+    "chore_implement --help": ["adw_chore_implement.py", "--help"],
+    "build_update_task --help": ["adw_build_update_task.py", "--help"],
+    "plan_implement_update_task --help": ["adw_plan_implement_update_task.py", "--help"],
+    "trigger --help": ["adw_triggers/adw_trigger_cron_todone.py", "--help"],
+    "trigger --once": [
+        "adw_triggers/adw_trigger_cron_todone.py",
+        "--once",
+        "--task-file",
+        "{task_file}",
+    ],
+}
+
+# "import time: <self us> | <cumulative us> | <indented module name>"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s*\|\s+(\d+)\s*\|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Top-level imports from `-X importtime` output.
+
+    Returns:
+        (module, self microseconds, cumulative microseconds) for each import
+        made directly by the entry point or the interpreter, in load order
+    """
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Nested imports are indented by two spaces per level after the "|"
+        if match and len(match.group(3)) <= 1:
+            imports.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return imports
+
+
+def run_entry_point(argv: List[str], cwd: str, importtime: bool = False) -> Tuple[float, str, int]:
+    """Run an entry point once.
+
+    Returns:
+        (wall-clock seconds, stderr, exit code)
+    """
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += [os.path.join(ADWS_DIR, argv[0]), *argv[1:]]
+
+    started_at = time.perf_counter()
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    return time.perf_counter() - started_at, result.stderr, result.returncode
+
+
+def benchmark_entry_point(argv: List[str], cwd: str, runs: int, top: int) -> Dict[str, Any]:
+    """Time an entry point over several runs and profile its imports."""
+    durations = []
+    exit_code = 0
+    for _ in range(runs):
+        seconds, _stderr, exit_code = run_entry_point(argv, cwd)
+        durations.append(seconds)
+
+    _seconds, stderr, _exit_code = run_entry_point(argv, cwd, importtime=True)
+    imports = parse_importtime(stderr)
+    slowest = sorted(imports, key=lambda item: item[2], reverse=True)[:top]
+
+    return {
+        "min_ms": round(min(durations) * 1000, 1),
+        "median_ms": round(statistics.median(durations) * 1000, 1),
+        "exit_code": exit_code,
+        "import_ms": round(sum(item[2] for item in imports) / 1000, 1),
+        "module_count": sum(1 for line in stderr.splitlines() if IMPORTTIME_LINE.match(line)),
+        "top_imports": [
+            {"module": module, "self_ms": round(self_us / 1000, 1), "cumulative_ms": round(cumulative_us / 1000, 1)}
+            for module, self_us, cumulative_us in slowest
+        ],
+    }
+
+
+def format_delta(current: float, baseline: Optional[float]) -> str:
+    """Difference from the baseline, colored by direction."""
+    if baseline is None:
+        return "-"
+    delta = current - baseline
+    color = "red" if delta > 0 else "green"
+    return f"[{color}]{delta:+.1f}[/{color}]"
+
+
+@click.command()
+@click.option("--runs", default=5, show_default=True, help="Timed runs per entry point")
+@click.option("--top", default=5, show_default=True, help="Slowest top-level imports to report")
+@click.option(
+    "--only",
+    help="Only benchmark entry points whose name contains this text",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="Write the results as JSON (usable as a --baseline later)",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Compare against results saved with --output",
+)
+def main(runs: int, top: int, only: Optional[str], output: Optional[str], baseline: Optional[str]):
+    """Measure startup time and import profile of each ADW entry point."""
+    console = Console()
+
+    baseline_results: Dict[str, Any] = {}
+    if baseline:
+        with open(baseline, "r") as f:
+            baseline_results = json.load(f).get("entry_points", {})
+
+    entry_points = {
+        name: argv for name, argv in ENTRY_POINTS.items() if not only or only in name
+    }
+    if not entry_points:
+        console.print(f"[red]No entry point matches '{only}'[/red]")
+        sys.exit(1)
+
+    results: Dict[str, Any] = {}
+    # The trigger runs against an empty task list in a scratch directory
+    with tempfile.TemporaryDirectory(prefix="adw-startup-") as scratch_dir:
+        task_file = os.path.join(scratch_dir, "tasks.md")
+        with open(task_file, "w") as f:
+            f.write("# Tasks\n")
+
+        with console.status("[bold yellow]Benchmarking...[/bold yellow]") as status:
+            for name, argv in entry_points.items():
+                status.update(f"[bold yellow]Benchmarking {name}...[/bold yellow]")
+                argv = [arg.format(task_file=task_file) for arg in argv]
+                results[name] = benchmark_entry_point(argv, scratch_dir, runs, top)
+
+    summary_table = Table(show_header=True, box=None)
+    summary_table.add_column("Entry Point", style="bold cyan")
+    summary_table.add_column("Min (ms)", justify="right")
+    summary_table.add_column("Median (ms)", justify="right")
+    summary_table.add_column("Δ Median", justify="right")
+    summary_table.add_column("Imports (ms)", justify="right")
+    summary_table.add_column("Slowest Imports", style="dim")
+
+    for name, result in results.items():
+        previous = baseline_results.get(name, {}).get("median_ms")
+        slowest = ", ".join(
+            f"{item['module']} {item['cumulative_ms']:.0f}" for item in result["top_imports"]
+        )
+        median = f"{result['median_ms']:.1f}"
+        if result["exit_code"] != 0:
+            median += f" [red](exit {result['exit_code']})[/red]"
+        summary_table.add_row(
+            name,
+            f"{result['min_ms']:.1f}",
+            median,
+            format_delta(result["median_ms"], previous),
+            f"{result['import_ms']:.1f}",
+            slowest,
+        )
+
+    console.print(
+        Panel(
+            summary_table,
+            title="[bold blue]⏱️  Startup Benchmark[/bold blue]",
+            border_style="blue",
+        )
+    )
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(
+                {
+                    "python": sys.version.split()[0],
+                    "runs": runs,
+                    "entry_points": results,
+                },
+                f,
+                indent=2,
+            )
+        console.print(f"\n[bold cyan]Results:[/bold cyan] {output}")
+
+    # Fail when an entry point itself failed, so the benchmark can gate CI
+    sys.exit(1 if any(result["exit_code"] != 0 for result in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
-"""Claude Code agent module for executing prompts programmatically."""
+"""Claude Code agent module for executing prompts programmatically.
 
+asyncio and python-dotenv are imported on first use rather than at import
+time, so scripts that only parse arguments (or never run the async API)
+don't pay for them.
+"""
+
+import shutil
+import signal
 import subprocess
+import tempfile
+import threading
 import sys
 import os
 import json
@@ -8,10 +17,20 @@ import re
 import logging
 import time
 import uuid
-from typing import Optional, List, Dict, Any, Tuple, Final, Literal
+from typing import Optional, List, Dict, Any, Set, Tuple, Final, Literal, AsyncIterator, Callable
+from collections import deque
 from enum import Enum
 from pydantic import BaseModel
-from dotenv import load_dotenv
+
+from agent_slots import AgentSlot, SlotWaitCancelled
+from result_cache import ResultCache, build_cache_key, is_cacheable
+from retry_budget import acquire_retry, get_backoff_delay, record_attempt
+from transcripts import (
+    TranscriptReader,
+    TranscriptWriter,
+    get_storage_mode,
+    write_prompt_file,
+)
 
 
 # Retry codes for Claude Code execution errors
@@ -35,6 +54,12 @@ class AgentPromptRequest(BaseModel):
     dangerously_skip_permissions: bool = False
     output_file: str
     working_dir: Optional[str] = None
+    timeout_seconds: Optional[int] = None  # Wall-clock limit, None = module default, 0 = none
+    idle_timeout_seconds: Optional[int] = None  # Max seconds without a JSONL line
+    resume_session_id: Optional[str] = None  # Continue an existing session (--resume)
+    fork_session: bool = False  # With resume_session_id, branch into a new session (--fork-session)
+    resume_on_retry: bool = False  # Retry by resuming the failed session instead of replaying
+    on_message: Optional[Callable[[Dict[str, Any]], Any]] = None  # Called with each parsed message
 
 
 class AgentPromptResponse(BaseModel):
@@ -43,6 +68,13 @@ class AgentPromptResponse(BaseModel):
     success: bool
     session_id: Optional[str] = None
     retry_code: RetryCode = RetryCode.NONE
+    duration_ms: Optional[int] = None
+    num_turns: Optional[int] = None
+    total_cost_usd: Optional[float] = None
+    usage: Optional[Dict[str, Any]] = None
+    queue_wait_seconds: Optional[float] = None  # Time spent waiting for an agent slot
+    attempts: List[Dict[str, Any]] = []  # Per-attempt metadata from the retry wrappers
+    cached: bool = False  # Served from the result cache instead of a Claude Code run
 
 
 class AgentTemplateRequest(BaseModel):
@@ -53,6 +85,14 @@ class AgentTemplateRequest(BaseModel):
     adw_id: str
     model: Literal["sonnet", "opus"] = "sonnet"
     working_dir: Optional[str] = None
+    timeout_seconds: Optional[int] = None
+    idle_timeout_seconds: Optional[int] = None
+    resume_session_id: Optional[str] = None  # Start from an earlier session's context
+    fork_session: bool = False  # Branch from resume_session_id instead of appending to it
+    resume_on_retry: bool = False
+    on_message: Optional[Callable[[Dict[str, Any]], Any]] = None
+    cache_inputs: Optional[List[str]] = None  # Files the result depends on; set to use the result cache
+    cache_ttl_seconds: Optional[int] = None  # Overrides ADW_CACHE_TTL_SECONDS
 
 
 class ClaudeCodeResultMessage(BaseModel):
@@ -76,6 +116,7 @@ def get_safe_subprocess_env() -> Dict[str, str]:
     Returns:
         Dictionary containing only required environment variables
     """
+    load_env()
     safe_env_vars = {
         # Anthropic Configuration (required)
         "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY"),
@@ -107,11 +148,35 @@ def get_safe_subprocess_env() -> Dict[str, str]:
     return {k: v for k, v in safe_env_vars.items() if v is not None}
 
 
-# Load environment variables
-load_dotenv()
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load .env into the environment once, on first use."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
+def get_claude_path() -> str:
+    """Claude Code CLI path from the environment (CLAUDE_CODE_PATH)."""
+    load_env()
+    return os.getenv("CLAUDE_CODE_PATH", "claude")
+
+
+def get_default_timeouts() -> Tuple[int, int]:
+    """Default (wall-clock, idle) limits for a Claude Code run in seconds (0 disables a limit)."""
+    load_env()
+    return (
+        int(os.getenv("ADW_AGENT_TIMEOUT_SECONDS", "0")),
+        int(os.getenv("ADW_AGENT_IDLE_TIMEOUT_SECONDS", "0")),
+    )
 
-# Get Claude Code CLI path from environment
-CLAUDE_PATH = os.getenv("CLAUDE_CODE_PATH", "claude")
+# Seconds between SIGTERM and SIGKILL when stopping a timed-out process group
+KILL_GRACE_SECONDS = 5
 
 # Output file name constants (matching adw_prompt.py and adw_slash_command.py)
 OUTPUT_JSONL = "cc_raw_output.jsonl"
@@ -188,18 +253,49 @@ def truncate_output(
     return output[:truncate_at] + suffix
 
 
+# Installations whose probe succeeded, keyed on (resolved binary path, mtime)
+_claude_install_cache: Set[Tuple[str, float]] = set()
+
+
+def invalidate_claude_install_cache() -> None:
+    """Forget cached installation probes so the next call runs `claude --version` again."""
+    _claude_install_cache.clear()
+
+
 def check_claude_installed() -> Optional[str]:
-    """Check if Claude Code CLI is installed. Return error message if not."""
+    """Check if Claude Code CLI is installed. Return error message if not.
+
+    A successful `claude --version` probe is memoized per process, keyed on
+    the resolved binary path and its mtime, so retries and polls don't pay
+    for an extra process spawn. Failures are never cached, so a CLI that is
+    fixed or finishes installing is picked up on the next call. The cache is
+    cleared when an execution fails with FileNotFoundError.
+    """
+    claude_path = get_claude_path()
+    not_installed = f"Error: Claude Code CLI is not installed. Expected at: {claude_path}"
+
+    resolved_path = shutil.which(claude_path)
+    if not resolved_path:
+        return not_installed
+
+    try:
+        cache_key = (os.path.realpath(resolved_path), os.stat(resolved_path).st_mtime)
+    except OSError:
+        return not_installed
+
+    if cache_key in _claude_install_cache:
+        return None
+
     try:
         result = subprocess.run(
-            [CLAUDE_PATH, "--version"], capture_output=True, text=True
+            [resolved_path, "--version"], capture_output=True, text=True
         )
-        if result.returncode != 0:
-            return (
-                f"Error: Claude Code CLI is not installed. Expected at: {CLAUDE_PATH}"
-            )
     except FileNotFoundError:
-        return f"Error: Claude Code CLI is not installed. Expected at: {CLAUDE_PATH}"
+        return not_installed
+    if result.returncode != 0:
+        return not_installed
+
+    _claude_install_cache.add(cache_key)
     return None
 
 
@@ -208,22 +304,24 @@ def parse_jsonl_output(
 ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
     """Parse JSONL output file and return all messages and the result message.
 
+    Reads plain and compressed transcripts alike (see transcripts.py). To
+    fetch only the result, TranscriptReader(output_file).result_message()
+    seeks through the offset index instead of decoding every line.
+
     Returns:
         Tuple of (all_messages, result_message) where result_message is None if not found
     """
     try:
-        with open(output_file, "r") as f:
-            # Read all lines and parse each as JSON
-            messages = [json.loads(line) for line in f if line.strip()]
-
-            # Find the result message (should be the last one)
-            result_message = None
-            for message in reversed(messages):
-                if message.get("type") == "result":
-                    result_message = message
-                    break
+        messages = TranscriptReader(output_file).messages()
+
+        # Find the result message (should be the last one)
+        result_message = None
+        for message in reversed(messages):
+            if message.get("type") == "result":
+                result_message = message
+                break
 
-            return messages, result_message
+        return messages, result_message
     except Exception as e:
         return [], None
 
@@ -232,7 +330,8 @@ def convert_jsonl_to_json(jsonl_file: str) -> str:
     """Convert JSONL file to JSON array file.
 
     Creates a cc_raw_output.json file in the same directory as the JSONL file,
-    containing all messages as a JSON array.
+    containing all messages as a JSON array. This is also how the array view
+    of a compressed transcript is generated on demand.
 
     Returns:
         Path to the created JSON file
@@ -241,14 +340,7 @@ def convert_jsonl_to_json(jsonl_file: str) -> str:
     output_dir = os.path.dirname(jsonl_file)
     json_file = os.path.join(output_dir, OUTPUT_JSON)
 
-    # Parse the JSONL file
-    messages, _ = parse_jsonl_output(jsonl_file)
-
-    # Write as JSON array
-    with open(json_file, "w") as f:
-        json.dump(messages, f, indent=2)
-
-    return json_file
+    return TranscriptReader(jsonl_file).write_json_array(json_file)
 
 
 def save_last_entry_as_raw_result(json_file: str) -> Optional[str]:
@@ -261,15 +353,17 @@ def save_last_entry_as_raw_result(json_file: str) -> Optional[str]:
         Path to the created cc_final_object.json file, or None if error
     """
     try:
-        # Read the JSON array
-        with open(json_file, "r") as f:
-            messages = json.load(f)
-        
-        if not messages:
+        if os.path.exists(json_file):
+            # Read the JSON array
+            with open(json_file, "r") as f:
+                messages = json.load(f)
+            last_entry = messages[-1] if messages else None
+        else:
+            # Compressed storage has no array file; read the transcript instead
+            last_entry = TranscriptReader(os.path.dirname(json_file)).last_message()
+
+        if last_entry is None:
             return None
-            
-        # Get the last entry
-        last_entry = messages[-1]
         
         # Create cc_final_object.json in the same directory
         output_dir = os.path.dirname(json_file)
@@ -285,6 +379,185 @@ def save_last_entry_as_raw_result(json_file: str) -> Optional[str]:
         return None
 
 
+def get_message_text(message: Dict[str, Any]) -> str:
+    """Get the first text block of an assistant message, or "" if there is none."""
+    content = (message.get("message") or {}).get("content", [])
+    if isinstance(content, list) and content and isinstance(content[0], dict):
+        return content[0].get("text", "") or ""
+    return ""
+
+
+def get_message_events(message: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Split a stream-json message into progress events.
+
+    Event kinds are "init", "text", "tool_use", "tool_result" and "result";
+    assistant and user messages yield one event per content block.
+
+    Returns:
+        List of (kind, payload) tuples, where payload is the content block for
+        text/tool events and the message itself for init/result
+    """
+    message_type = message.get("type")
+    if message_type == "system" and message.get("subtype") == "init":
+        return [("init", message)]
+    if message_type == "result":
+        return [("result", message)]
+
+    content = (message.get("message") or {}).get("content", [])
+    if message_type not in ("assistant", "user") or not isinstance(content, list):
+        return []
+
+    events = []
+    for block in content:
+        if isinstance(block, dict) and block.get("type") in ("text", "tool_use", "tool_result"):
+            events.append((block["type"], block))
+    return events
+
+
+def describe_message(message: Dict[str, Any], max_length: int = 80) -> Optional[str]:
+    """One-line progress description of a stream-json message, for status spinners."""
+    descriptions = []
+    for kind, payload in get_message_events(message):
+        if kind == "init":
+            descriptions.append(f"session {payload.get('session_id', '')[:8]} started")
+        elif kind == "text" and payload.get("text", "").strip():
+            descriptions.append(payload["text"].strip().splitlines()[0])
+        elif kind == "tool_use":
+            descriptions.append(f"→ {payload.get('name', 'tool')}")
+        elif kind == "tool_result":
+            descriptions.append("✗ tool error" if payload.get("is_error") else "← tool result")
+        elif kind == "result":
+            descriptions.append(f"finished ({payload.get('num_turns', '?')} turns)")
+
+    if not descriptions:
+        return None
+    description = " ".join(descriptions)
+    return description if len(description) <= max_length else description[: max_length - 1] + "…"
+
+
+def make_status_hook(status: Any, action: str) -> Callable[[Dict[str, Any]], None]:
+    """Build an on_message hook that shows live progress on a rich console.status.
+
+    Usage:
+        with console.status("[bold yellow]Implementing plan...[/bold yellow]") as status:
+            request.on_message = make_status_hook(status, "Implementing plan...")
+            response = execute_template(request)
+    """
+
+    def on_message(message: Dict[str, Any]) -> None:
+        description = describe_message(message)
+        if description:
+            # Escape rich markup in agent output
+            description = description.replace("[", "\\[")
+            status.update(f"[bold yellow]{action}[/bold yellow] [dim]{description}[/dim]")
+
+    return on_message
+
+
+def notify_message(request: AgentPromptRequest, message: Dict[str, Any]) -> None:
+    """Hand a parsed message to the request's on_message hook.
+
+    Hook errors are reported and swallowed so that a broken progress display
+    never takes down the agent run.
+    """
+    if request.on_message is None:
+        return
+    try:
+        request.on_message(message)
+    except Exception as e:
+        print(f"on_message hook failed: {e}", file=sys.stderr)
+
+
+class TranscriptCollector:
+    """Ingest a Claude Code stream-json transcript in a single pass.
+
+    Every line is written to the JSONL file, decoded once, appended to the
+    cc_raw_output.json array and checked for the result message. The last
+    few assistant messages are kept in a ring buffer for error extraction,
+    and cc_final_object.json is written from the last message on close(), so
+    no artifact needs the JSONL file to be read back.
+
+    In compressed storage mode (see transcripts.py) the transcript goes to
+    cc_raw_output.jsonl.gz and no array file is written. Either way the
+    offset index cc_raw_output.jsonl.idx is written alongside it.
+    """
+
+    def __init__(self, output_file: str, assistant_buffer_size: int = 5):
+        output_dir = os.path.dirname(output_file)
+        load_env()
+        self.compressed = get_storage_mode() == "compressed"
+        self.json_file = None if self.compressed else os.path.join(output_dir, OUTPUT_JSON)
+        self.final_object_file = os.path.join(output_dir, FINAL_OBJECT_JSON)
+
+        self.message_count = 0
+        self.result_message: Optional[Dict[str, Any]] = None
+        self.last_message: Optional[Dict[str, Any]] = None
+        self.session_id: Optional[str] = None
+        self.last_line = ""
+        self.recent_assistant_messages = deque(maxlen=assistant_buffer_size)
+
+        self._transcript = TranscriptWriter(output_file, compressed=self.compressed)
+        self.output_file = self._transcript.path
+        self._json_f = open(self.json_file, "w") if self.json_file else None
+        self._closed = False
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        """Record one raw output line.
+
+        Returns:
+            The decoded message, or None for blank or non-JSON lines
+        """
+        if not line.strip():
+            self._transcript.write(line)
+            return None
+        self.last_line = line.strip()
+
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            # Non-JSON noise is kept in the JSONL file but not surfaced or indexed
+            self._transcript.write(line)
+            return None
+        self._transcript.write(line, message.get("type") or "-")
+
+        if self._json_f:
+            # Match json.dump(messages, f, indent=2) output one element at a time
+            element = json.dumps(message, indent=2).replace("\n", "\n  ")
+            self._json_f.write(("[\n  " if self.message_count == 0 else ",\n  ") + element)
+        self.message_count += 1
+        self.last_message = message
+        self.session_id = message.get("session_id") or self.session_id
+
+        message_type = message.get("type")
+        if message_type == "result":
+            self.result_message = message
+            # Get the result (and its index row) onto disk without waiting for a full frame
+            self._transcript.flush()
+        elif message_type == "assistant" and message.get("message"):
+            self.recent_assistant_messages.append(message)
+
+        return message
+
+    def close(self) -> None:
+        """Flush the JSONL file and finish the derived artifacts."""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._transcript.close()
+        if self._json_f:
+            self._json_f.write("\n]" if self.message_count else "[]")
+            self._json_f.close()
+
+        if self.last_message is not None:
+            try:
+                with open(self.final_object_file, "w") as f:
+                    json.dump(self.last_message, f, indent=2)
+            except Exception:
+                # Silently fail - this is a nice-to-have feature
+                pass
+
+
 def get_claude_env() -> Dict[str, str]:
     """Get only the required environment variables for Claude Code execution.
 
@@ -317,10 +590,112 @@ def save_prompt(prompt: str, adw_id: str, agent_name: str = "ops") -> None:
     prompt_dir = os.path.join(project_root, "agents", adw_id, agent_name, "prompts")
     os.makedirs(prompt_dir, exist_ok=True)
 
-    # Save prompt to file
+    # Save prompt to file (deduplicated by content in compressed storage mode)
     prompt_file = os.path.join(prompt_dir, f"{command_name}.txt")
-    with open(prompt_file, "w") as f:
-        f.write(prompt)
+    write_prompt_file(prompt_file, prompt)
+
+
+# Retry codes that are worth another attempt
+RETRYABLE_CODES = [
+    RetryCode.CLAUDE_CODE_ERROR,
+    RetryCode.TIMEOUT_ERROR,
+    RetryCode.EXECUTION_ERROR,
+    RetryCode.ERROR_DURING_EXECUTION,
+]
+
+# Max bytes in one stream-json line (tool results can be large)
+STREAM_LINE_LIMIT = 64 * 1024 * 1024
+
+
+def get_retry_pause(retry_number: int, retry_delays: List[int] = None) -> Optional[float]:
+    """Seconds to wait before a retry, or None if the host-wide retry budget is spent.
+
+    Uses jittered exponential backoff unless explicit retry_delays are given,
+    and waits longer while the shared circuit breaker is open.
+    """
+    if retry_delays:
+        delay = retry_delays[min(retry_number, len(retry_delays)) - 1]
+    else:
+        delay = get_backoff_delay(retry_number)
+
+    load_env()
+    try:
+        circuit_pause = acquire_retry()
+    except OSError:
+        # Shared state unavailable - fall back to local backoff only
+        circuit_pause = 0.0
+
+    if circuit_pause is None:
+        return None
+    return max(delay, circuit_pause)
+
+
+def record_retry_outcome(response: AgentPromptResponse, attempt: int) -> None:
+    """Record an attempt in the host-wide retry budget."""
+    transient_failure = not response.success and response.retry_code in RETRYABLE_CODES
+    load_env()
+    try:
+        record_attempt(success=not transient_failure, is_retry=attempt > 0)
+    except OSError:
+        pass
+
+
+def should_retry(response: AgentPromptResponse, attempt: int, max_retries: int) -> bool:
+    """Check whether a response should be retried after the given attempt."""
+    if response.success or response.retry_code == RetryCode.NONE:
+        # Success or non-retryable error
+        return False
+    return response.retry_code in RETRYABLE_CODES and attempt < max_retries
+
+
+# Prompt sent when a retry resumes the failed session instead of starting over
+RESUME_CONTINUATION_PROMPT = (
+    "Your previous run was interrupted before it finished. Review what you have "
+    "already done in this session and continue the original task from where you "
+    "left off. Do not redo completed work."
+)
+
+
+def get_retry_request(
+    request: AgentPromptRequest, response: AgentPromptResponse
+) -> AgentPromptRequest:
+    """Build the request for the next attempt after a failed response.
+
+    Resumes the failed session with a short continuation prompt when
+    resume_on_retry is set and the failed run reported a session_id,
+    otherwise replays the original request.
+    """
+    if request.resume_on_retry and response.session_id:
+        # The failed session is already this request's own, so never fork it
+        return request.model_copy(
+            update={
+                "prompt": RESUME_CONTINUATION_PROMPT,
+                "resume_session_id": response.session_id,
+                "fork_session": False,
+            }
+        )
+    return request
+
+
+def build_attempt_record(
+    attempt: int,
+    request: AgentPromptRequest,
+    response: AgentPromptResponse,
+    wall_time_seconds: float,
+) -> Dict[str, Any]:
+    """Describe one attempt for the summary JSON."""
+    return {
+        "attempt": attempt + 1,
+        "resumed_session_id": request.resume_session_id,
+        "session_id": response.session_id,
+        "success": response.success,
+        "retry_code": response.retry_code.value,
+        "wall_time_seconds": round(wall_time_seconds, 3),
+        "queue_wait_seconds": response.queue_wait_seconds,
+        "duration_ms": response.duration_ms,
+        "num_turns": response.num_turns,
+        "total_cost_usd": response.total_cost_usd,
+    }
 
 
 def prompt_claude_code_with_retry(
@@ -330,56 +705,87 @@ def prompt_claude_code_with_retry(
 ) -> AgentPromptResponse:
     """Execute Claude Code with retry logic for certain error types.
 
+    Retries back off exponentially with jitter and draw from a retry budget
+    shared by every ADW process on the host; while the shared circuit
+    breaker is open they pause. With request.resume_on_retry, retries
+    continue the failed session rather than replaying the whole prompt.
+    Every attempt is recorded in response.attempts.
+
     Args:
         request: The prompt request configuration
         max_retries: Maximum number of retry attempts (default: 3)
-        retry_delays: List of delays in seconds between retries (default: [1, 3, 5])
+        retry_delays: Optional fixed delays in seconds between retries
+            (default: jittered exponential backoff)
 
     Returns:
         AgentPromptResponse with output and retry code
     """
-    if retry_delays is None:
-        retry_delays = [1, 3, 5]
-
-    # Ensure we have enough delays for max_retries
-    while len(retry_delays) < max_retries:
-        retry_delays.append(retry_delays[-1] + 2)  # Add incrementing delays
-
-    last_response = None
+    attempt_request = request
+    attempts = []
+    response = None
 
     for attempt in range(max_retries + 1):  # +1 for initial attempt
         if attempt > 0:
             # This is a retry
-            delay = retry_delays[attempt - 1]
-            time.sleep(delay)
-
-        response = prompt_claude_code(request)
-        last_response = response
+            if agents_cancelled():
+                return response
+            pause = get_retry_pause(attempt, retry_delays)
+            if pause is None:
+                attempts[-1]["retry_budget_exhausted"] = True
+                return response
+            if _agents_cancelled.wait(pause):
+                return response
+            attempt_request = get_retry_request(request, response)
+
+        started_at = time.monotonic()
+        response = prompt_claude_code(attempt_request)
+        record_retry_outcome(response, attempt)
+        attempts.append(
+            build_attempt_record(
+                attempt, attempt_request, response, time.monotonic() - started_at
+            )
+        )
+        response.attempts = attempts
 
-        # Check if we should retry based on the retry code
-        if response.success or response.retry_code == RetryCode.NONE:
-            # Success or non-retryable error
+        if not should_retry(response, attempt, max_retries):
             return response
 
-        # Check if this is a retryable error
-        if response.retry_code in [
-            RetryCode.CLAUDE_CODE_ERROR,
-            RetryCode.TIMEOUT_ERROR,
-            RetryCode.EXECUTION_ERROR,
-            RetryCode.ERROR_DURING_EXECUTION,
-        ]:
-            if attempt < max_retries:
-                continue
-            else:
-                return response
+    return response
 
-    # Should not reach here, but return last response just in case
-    return last_response
 
+def build_claude_command(request: AgentPromptRequest) -> List[str]:
+    """Build the Claude Code CLI command for a prompt request."""
+    # Build command - always use stream-json format and verbose
+    cmd = [get_claude_path(), "-p", request.prompt]
+    cmd.extend(["--model", request.model])
+    cmd.extend(["--output-format", "stream-json"])
+    cmd.append("--verbose")
 
-def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
-    """Execute Claude Code with the given prompt configuration."""
+    # Check for MCP config in working directory
+    if request.working_dir:
+        mcp_config_path = os.path.join(request.working_dir, ".mcp.json")
+        if os.path.exists(mcp_config_path):
+            cmd.extend(["--mcp-config", mcp_config_path])
+
+    # Add dangerous skip permissions flag if enabled
+    if request.dangerously_skip_permissions:
+        cmd.append("--dangerously-skip-permissions")
+
+    # Continue an earlier session instead of starting a fresh one
+    if request.resume_session_id:
+        cmd.extend(["--resume", request.resume_session_id])
+        if request.fork_session:
+            cmd.append("--fork-session")
+
+    return cmd
 
+
+def prepare_prompt_execution(request: AgentPromptRequest) -> Optional[AgentPromptResponse]:
+    """Run pre-execution checks and set up output paths.
+
+    Returns:
+        An error response if execution cannot start, None otherwise
+    """
     # Check if Claude Code CLI is installed
     error_msg = check_claude_installed()
     if error_msg:
@@ -398,184 +804,368 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    # Build command - always use stream-json format and verbose
-    cmd = [CLAUDE_PATH, "-p", request.prompt]
-    cmd.extend(["--model", request.model])
-    cmd.extend(["--output-format", "stream-json"])
-    cmd.append("--verbose")
+    return None
 
-    # Check for MCP config in working directory
-    if request.working_dir:
-        mcp_config_path = os.path.join(request.working_dir, ".mcp.json")
-        if os.path.exists(mcp_config_path):
-            cmd.extend(["--mcp-config", mcp_config_path])
 
-    # Add dangerous skip permissions flag if enabled
-    if request.dangerously_skip_permissions:
-        cmd.append("--dangerously-skip-permissions")
+class TimeoutTracker:
+    """Track wall-clock and idle-output deadlines for one Claude Code run."""
+
+    def __init__(self, request: AgentPromptRequest):
+        timeout = request.timeout_seconds
+        idle_timeout = request.idle_timeout_seconds
+        default_timeout, default_idle_timeout = get_default_timeouts()
+        self.timeout_seconds = default_timeout if timeout is None else timeout
+        self.idle_timeout_seconds = (
+            default_idle_timeout if idle_timeout is None else idle_timeout
+        )
+        self.started_at = time.monotonic()
+        self.last_activity = self.started_at
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.timeout_seconds or self.idle_timeout_seconds)
+
+    def touch(self) -> None:
+        """Record that the process produced output."""
+        self.last_activity = time.monotonic()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the nearest limit is hit, or None if there are no limits."""
+        now = time.monotonic()
+        deadlines = []
+        if self.timeout_seconds:
+            deadlines.append(self.started_at + self.timeout_seconds - now)
+        if self.idle_timeout_seconds:
+            deadlines.append(self.last_activity + self.idle_timeout_seconds - now)
+        return min(deadlines) if deadlines else None
+
+    def expired_reason(self) -> Optional[str]:
+        """Describe the limit that was exceeded, or None if none was."""
+        now = time.monotonic()
+        if self.timeout_seconds and now - self.started_at >= self.timeout_seconds:
+            return f"timed out after {self.timeout_seconds} seconds"
+        if (
+            self.idle_timeout_seconds
+            and now - self.last_activity >= self.idle_timeout_seconds
+        ):
+            return f"produced no output for {self.idle_timeout_seconds} seconds"
+        return None
 
-    # Set up environment with only required variables
-    env = get_claude_env()
 
+def signal_process_group(pid: int, sig: int) -> None:
+    """Send a signal to a process group, ignoring groups that already exited."""
     try:
-        # Open output file for streaming
-        with open(request.output_file, "w") as output_f:
-            # Execute Claude Code and stream output to file
-            result = subprocess.run(
-                cmd,
-                stdout=output_f,  # Stream directly to file
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env,
-                cwd=request.working_dir,  # Use working_dir if provided
-            )
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class ProcessWatchdog(threading.Thread):
+    """Kill a synchronous Claude Code process group once a TimeoutTracker limit is hit."""
+
+    def __init__(self, process: subprocess.Popen, tracker: TimeoutTracker):
+        super().__init__(daemon=True)
+        self.process = process
+        self.tracker = tracker
+        self.timeout_reason: Optional[str] = None
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            remaining = self.tracker.remaining()
+            if remaining is not None and remaining <= 0:
+                self.timeout_reason = self.tracker.expired_reason()
+                if self.timeout_reason:
+                    break
+            self._stopped.wait(1.0 if remaining is None else min(max(remaining, 0.05), 1.0))
+        else:
+            return
 
-        if result.returncode == 0:
+        signal_process_group(self.process.pid, signal.SIGTERM)
+        if not self._stopped.wait(KILL_GRACE_SECONDS) and self.process.poll() is None:
+            signal_process_group(self.process.pid, signal.SIGKILL)
 
-            # Parse the JSONL file
-            messages, result_message = parse_jsonl_output(request.output_file)
+    def stop(self) -> None:
+        self._stopped.set()
 
-            # Convert JSONL to JSON array file
-            json_file = convert_jsonl_to_json(request.output_file)
-            
-            # Save the last entry as raw_result.json
-            save_last_entry_as_raw_result(json_file)
-
-            if result_message:
-                # Extract session_id from result message
-                session_id = result_message.get("session_id")
-
-                # Check if there was an error in the result
-                is_error = result_message.get("is_error", False)
-                subtype = result_message.get("subtype", "")
-
-                # Handle error_during_execution case where there's no result field
-                if subtype == "error_during_execution":
-                    error_msg = "Error during execution: Agent encountered an error and did not return a result"
-                    return AgentPromptResponse(
-                        output=error_msg,
-                        success=False,
-                        session_id=session_id,
-                        retry_code=RetryCode.ERROR_DURING_EXECUTION,
-                    )
 
-                result_text = result_message.get("result", "")
+# Process groups of the Claude Code runs in flight in this process. The CLI
+# runs in its own session, so a Ctrl+C in the terminal never reaches it;
+# cancel_agents() stops these groups when a workflow is interrupted.
+_live_agent_groups: Set[int] = set()
+_live_agents_lock = threading.Lock()
+_agents_cancelled = threading.Event()
 
-                # For error cases, truncate the output to prevent JSONL blobs
-                if is_error and len(result_text) > 1000:
-                    result_text = truncate_output(result_text, max_length=800)
 
-                return AgentPromptResponse(
-                    output=result_text,
-                    success=not is_error,
-                    session_id=session_id,
-                    retry_code=RetryCode.NONE,  # No retry needed for successful or non-retryable errors
-                )
-            else:
-                # No result message found, try to extract meaningful error
-                error_msg = "No result message found in Claude Code output"
+def register_agent_process(pid: int) -> None:
+    """Track a launched Claude Code process group until unregister_agent_process()."""
+    with _live_agents_lock:
+        _live_agent_groups.add(pid)
+        if _agents_cancelled.is_set():
+            # Launched while cancel_agents() ran; stop it right away
+            signal_process_group(pid, signal.SIGKILL)
+
+
+def unregister_agent_process(pid: int) -> None:
+    """Stop tracking a Claude Code process group once it has exited."""
+    with _live_agents_lock:
+        _live_agent_groups.discard(pid)
+
+
+def cancel_agents() -> int:
+    """Kill every Claude Code run in flight in this process and refuse new ones.
+
+    After this call prompt_claude_code() fails fast and retries stop, so
+    threads still running agents return promptly. Meant for a process that
+    is shutting down, e.g. a workflow interrupted with Ctrl+C.
+
+    Returns:
+        Number of process groups killed
+    """
+    with _live_agents_lock:
+        _agents_cancelled.set()
+        for pid in _live_agent_groups:
+            signal_process_group(pid, signal.SIGKILL)
+        return len(_live_agent_groups)
 
-                # Try to get the last few lines of output for context
-                try:
-                    with open(request.output_file, "r") as f:
-                        lines = f.readlines()
-                        if lines:
-                            # Get last 5 lines or less
-                            last_lines = lines[-5:] if len(lines) > 5 else lines
-                            # Try to parse each as JSON to find any error messages
-                            for line in reversed(last_lines):
-                                try:
-                                    data = json.loads(line.strip())
-                                    if data.get("type") == "assistant" and data.get(
-                                        "message"
-                                    ):
-                                        # Extract text from assistant message
-                                        content = data["message"].get("content", [])
-                                        if isinstance(content, list) and content:
-                                            text = content[0].get("text", "")
-                                            if text:
-                                                error_msg = f"Claude Code output: {text[:500]}"  # Truncate
-                                                break
-                                except:
-                                    pass
-                except:
-                    pass
 
+def agents_cancelled() -> bool:
+    """Whether cancel_agents() has been called in this process."""
+    return _agents_cancelled.is_set()
+
+
+def build_cancelled_response() -> AgentPromptResponse:
+    """Build the response for a run refused or stopped by cancel_agents()."""
+    return AgentPromptResponse(
+        output="Error: Claude Code run cancelled",
+        success=False,
+        session_id=None,
+        retry_code=RetryCode.NONE,
+    )
+
+
+def build_timeout_response(
+    reason: str, transcript: Optional[TranscriptCollector] = None
+) -> AgentPromptResponse:
+    """Build the response for a run killed by a timeout."""
+    return AgentPromptResponse(
+        output=f"Error: Claude Code command {reason}",
+        success=False,
+        session_id=transcript.session_id if transcript else None,
+        retry_code=RetryCode.TIMEOUT_ERROR,
+    )
+
+
+def build_prompt_response(
+    returncode: int, stderr: Optional[str], transcript: TranscriptCollector
+) -> AgentPromptResponse:
+    """Build the response for a finished Claude Code process from its ingested transcript."""
+    response = build_prompt_response_from_transcript(returncode, stderr, transcript)
+
+    # Carry run metrics from the result message, if the run got that far
+    result_message = transcript.result_message or {}
+    response.duration_ms = result_message.get("duration_ms")
+    response.num_turns = result_message.get("num_turns")
+    response.total_cost_usd = result_message.get("total_cost_usd")
+    response.usage = result_message.get("usage")
+    return response
+
+
+def build_prompt_response_from_transcript(
+    returncode: int, stderr: Optional[str], transcript: TranscriptCollector
+) -> AgentPromptResponse:
+    """Map the process exit code and transcript onto success, output and retry code."""
+    result_message = transcript.result_message
+
+    if returncode == 0:
+        if result_message:
+            # Extract session_id from result message
+            session_id = result_message.get("session_id")
+
+            # Check if there was an error in the result
+            is_error = result_message.get("is_error", False)
+            subtype = result_message.get("subtype", "")
+
+            # Handle error_during_execution case where there's no result field
+            if subtype == "error_during_execution":
+                error_msg = "Error during execution: Agent encountered an error and did not return a result"
                 return AgentPromptResponse(
-                    output=truncate_output(error_msg, max_length=800),
+                    output=error_msg,
                     success=False,
-                    session_id=None,
-                    retry_code=RetryCode.NONE,
+                    session_id=session_id,
+                    retry_code=RetryCode.ERROR_DURING_EXECUTION,
                 )
-        else:
-            # Error occurred - stderr is captured, stdout went to file
-            stderr_msg = result.stderr.strip() if result.stderr else ""
 
-            # Try to read the output file to check for errors in stdout
-            stdout_msg = ""
-            error_from_jsonl = None
-            try:
-                if os.path.exists(request.output_file):
-                    # Parse JSONL to find error message
-                    messages, result_message = parse_jsonl_output(request.output_file)
-
-                    if result_message and result_message.get("is_error"):
-                        # Found error in result message
-                        error_from_jsonl = result_message.get("result", "Unknown error")
-                    elif messages:
-                        # Look for error in last few messages
-                        for msg in reversed(messages[-5:]):
-                            if msg.get("type") == "assistant" and msg.get(
-                                "message", {}
-                            ).get("content"):
-                                content = msg["message"]["content"]
-                                if isinstance(content, list) and content:
-                                    text = content[0].get("text", "")
-                                    if text and (
-                                        "error" in text.lower()
-                                        or "failed" in text.lower()
-                                    ):
-                                        error_from_jsonl = text[:500]  # Truncate
-                                        break
-
-                    # If no structured error found, get last line only
-                    if not error_from_jsonl:
-                        with open(request.output_file, "r") as f:
-                            lines = f.readlines()
-                            if lines:
-                                # Just get the last line instead of entire file
-                                stdout_msg = lines[-1].strip()[
-                                    :200
-                                ]  # Truncate to 200 chars
-            except:
-                pass
+            result_text = result_message.get("result", "")
+
+            # For error cases, truncate the output to prevent JSONL blobs
+            if is_error and len(result_text) > 1000:
+                result_text = truncate_output(result_text, max_length=800)
+
+            return AgentPromptResponse(
+                output=result_text,
+                success=not is_error,
+                session_id=session_id,
+                retry_code=RetryCode.NONE,  # No retry needed for successful or non-retryable errors
+            )
+        else:
+            # No result message found, try to extract meaningful error
+            error_msg = "No result message found in Claude Code output"
+
+            # Use the most recent assistant text for context
+            for message in reversed(transcript.recent_assistant_messages):
+                text = get_message_text(message)
+                if text:
+                    error_msg = f"Claude Code output: {text[:500]}"  # Truncate
+                    break
 
-            if error_from_jsonl:
-                error_msg = f"Claude Code error: {error_from_jsonl}"
-            elif stdout_msg and not stderr_msg:
-                error_msg = f"Claude Code error: {stdout_msg}"
-            elif stderr_msg and not stdout_msg:
-                error_msg = f"Claude Code error: {stderr_msg}"
-            elif stdout_msg and stderr_msg:
-                error_msg = f"Claude Code error: {stderr_msg}\nStdout: {stdout_msg}"
-            else:
-                error_msg = f"Claude Code error: Command failed with exit code {result.returncode}"
-
-            # Always truncate error messages to prevent huge outputs
             return AgentPromptResponse(
                 output=truncate_output(error_msg, max_length=800),
                 success=False,
                 session_id=None,
-                retry_code=RetryCode.CLAUDE_CODE_ERROR,
+                retry_code=RetryCode.NONE,
             )
+    else:
+        # Error occurred - stderr is captured, stdout went to the transcript
+        stderr_msg = stderr.strip() if stderr else ""
+
+        stdout_msg = ""
+        error_from_jsonl = None
 
-    except subprocess.TimeoutExpired:
-        error_msg = "Error: Claude Code command timed out after 5 minutes"
+        if result_message and result_message.get("is_error"):
+            # Found error in result message
+            error_from_jsonl = result_message.get("result", "Unknown error")
+        else:
+            # Look for error in the last few assistant messages
+            for message in reversed(transcript.recent_assistant_messages):
+                text = get_message_text(message)
+                if text and ("error" in text.lower() or "failed" in text.lower()):
+                    error_from_jsonl = text[:500]  # Truncate
+                    break
+
+        # If no structured error found, get last line only
+        if not error_from_jsonl:
+            stdout_msg = transcript.last_line[:200]  # Truncate to 200 chars
+
+        if error_from_jsonl:
+            error_msg = f"Claude Code error: {error_from_jsonl}"
+        elif stdout_msg and not stderr_msg:
+            error_msg = f"Claude Code error: {stdout_msg}"
+        elif stderr_msg and not stdout_msg:
+            error_msg = f"Claude Code error: {stderr_msg}"
+        elif stdout_msg and stderr_msg:
+            error_msg = f"Claude Code error: {stderr_msg}\nStdout: {stdout_msg}"
+        else:
+            error_msg = f"Claude Code error: Command failed with exit code {returncode}"
+
+        # Always truncate error messages to prevent huge outputs
+        return AgentPromptResponse(
+            output=truncate_output(error_msg, max_length=800),
+            success=False,
+            session_id=transcript.session_id,  # Lets retries resume the session
+            retry_code=RetryCode.CLAUDE_CODE_ERROR,
+        )
+
+
+def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
+    """Execute Claude Code with the given prompt configuration.
+
+    Waits for a host-wide agent slot (see agent_slots.py) before launching,
+    and reports the time spent queued in response.queue_wait_seconds. With
+    ADW_CLAUDE_WORKERS set, the prompt runs on a warm worker process (see
+    claude_workers.py) instead of a fresh CLI.
+    """
+    from claude_workers import run_with_worker
+
+    error_response = prepare_prompt_execution(request)
+    if error_response:
+        return error_response
+
+    try:
+        with AgentSlot(request.model, cancel_event=_agents_cancelled) as slot:
+            if agents_cancelled():
+                return build_cancelled_response()
+            response = run_with_worker(request)
+            if response is None:
+                response = run_claude_code_process(request)
+    except SlotWaitCancelled:
+        return build_cancelled_response()
+
+    response.queue_wait_seconds = round(slot.wait_seconds, 3)
+    return response
+
+
+def run_claude_code_process(request: AgentPromptRequest) -> AgentPromptResponse:
+    """Run the Claude Code CLI for a prepared request and build its response."""
+    cmd = build_claude_command(request)
+
+    # Set up environment with only required variables
+    env = get_claude_env()
+
+    try:
+        transcript = TranscriptCollector(request.output_file)
+        tracker = TimeoutTracker(request)
+        watchdog = None
+
+        # stderr goes to a temp file so it can never block the stdout reader
+        with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as stderr_f:
+            process = None
+            try:
+                # Execute Claude Code in its own process group and ingest output as it streams
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_f,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    env=env,
+                    cwd=request.working_dir,  # Use working_dir if provided
+                    start_new_session=True,
+                )
+                register_agent_process(process.pid)
+                if tracker.enabled:
+                    watchdog = ProcessWatchdog(process, tracker)
+                    watchdog.start()
+
+                for line in process.stdout:
+                    tracker.touch()
+                    message = transcript.feed(line)
+                    if message is not None:
+                        notify_message(request, message)
+                returncode = process.wait()
+            except BaseException:
+                # Don't leave an orphaned agent behind on errors or Ctrl+C
+                if process and process.poll() is None:
+                    signal_process_group(process.pid, signal.SIGKILL)
+                    process.wait()
+                raise
+            finally:
+                if process:
+                    unregister_agent_process(process.pid)
+                if watchdog:
+                    watchdog.stop()
+                transcript.close()
+
+            stderr_f.seek(0)
+            stderr = stderr_f.read()
+
+        if watchdog and watchdog.timeout_reason:
+            return build_timeout_response(watchdog.timeout_reason, transcript)
+        if agents_cancelled():
+            return build_cancelled_response()
+
+        return build_prompt_response(returncode, stderr, transcript)
+
+    except FileNotFoundError as e:
+        # The binary went away since it was probed - re-check next time
+        invalidate_claude_install_cache()
+        error_msg = f"Error executing Claude Code: {e}"
         return AgentPromptResponse(
             output=error_msg,
             success=False,
             session_id=None,
-            retry_code=RetryCode.TIMEOUT_ERROR,
+            retry_code=RetryCode.EXECUTION_ERROR,
         )
     except Exception as e:
         error_msg = f"Error executing Claude Code: {e}"
@@ -587,20 +1177,8 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
         )
 
 
-def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
-    """Execute a Claude Code template with slash command and arguments.
-
-    Example:
-        request = AgentTemplateRequest(
-            agent_name="planner",
-            slash_command="/implement",
-            args=["plan.md"],
-            adw_id="abc12345",
-            model="sonnet"  # Explicitly set model
-        )
-        response = execute_template(request)
-    """
-
+def build_template_prompt_request(request: AgentTemplateRequest) -> AgentPromptRequest:
+    """Build the prompt request for a slash command template execution."""
     # Construct prompt from slash command and args
     prompt = f"{request.slash_command} {' '.join(request.args)}"
 
@@ -618,7 +1196,7 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
     output_file = os.path.join(output_dir, OUTPUT_JSONL)
 
     # Create prompt request with specific parameters
-    prompt_request = AgentPromptRequest(
+    return AgentPromptRequest(
         prompt=prompt,
         adw_id=request.adw_id,
         agent_name=request.agent_name,
@@ -626,7 +1204,363 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
         dangerously_skip_permissions=True,
         output_file=output_file,
         working_dir=request.working_dir,  # Pass through working_dir
+        timeout_seconds=request.timeout_seconds,
+        idle_timeout_seconds=request.idle_timeout_seconds,
+        resume_session_id=request.resume_session_id,
+        fork_session=request.fork_session,
+        resume_on_retry=request.resume_on_retry,
+        on_message=request.on_message,
     )
 
+
+def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
+    """Execute a Claude Code template with slash command and arguments.
+
+    Example:
+        request = AgentTemplateRequest(
+            agent_name="planner",
+            slash_command="/implement",
+            args=["plan.md"],
+            adw_id="abc12345",
+            model="sonnet"  # Explicitly set model
+        )
+        response = execute_template(request)
+
+    Requests that set cache_inputs are served from the result cache (see
+    result_cache.py) while their command, args, model, input files and
+    command template are unchanged; response.cached marks such responses.
+    """
+    cache_key, cached_response = load_cached_response(request)
+    if cached_response:
+        return cached_response
+
+    prompt_request = build_template_prompt_request(request)
+
     # Execute with retry logic and return response (prompt_claude_code now handles all parsing)
-    return prompt_claude_code_with_retry(prompt_request)
+    response = prompt_claude_code_with_retry(prompt_request)
+    store_cached_response(request, cache_key, response)
+    return response
+
+
+def get_template_cache_key(request: AgentTemplateRequest) -> Optional[str]:
+    """Result cache key of a template request, or None if it must run uncached."""
+    if (
+        request.cache_inputs is None
+        or request.resume_session_id
+        or not is_cacheable(request.slash_command)
+    ):
+        return None
+    return build_cache_key(
+        request.slash_command,
+        request.args,
+        request.model,
+        request.cache_inputs,
+        request.working_dir,
+    )
+
+
+def load_cached_response(
+    request: AgentTemplateRequest,
+) -> Tuple[Optional[str], Optional[AgentPromptResponse]]:
+    """Look a template request up in the result cache.
+
+    Returns:
+        (cache key or None if uncacheable, cached response or None on a miss)
+    """
+    cache_key = get_template_cache_key(request)
+    if cache_key is None:
+        return None, None
+
+    load_env()
+    cached = ResultCache(ttl_seconds=request.cache_ttl_seconds).get(cache_key)
+    if cached is None:
+        return cache_key, None
+    response = AgentPromptResponse.model_validate(cached)
+    response.cached = True
+    return cache_key, response
+
+
+def store_cached_response(
+    request: AgentTemplateRequest, cache_key: Optional[str], response: AgentPromptResponse
+) -> None:
+    """Cache a successful response under the key from load_cached_response()."""
+    if cache_key is None or not response.success:
+        return
+    ResultCache(ttl_seconds=request.cache_ttl_seconds).put(
+        cache_key,
+        response.model_dump(mode="json", exclude={"attempts", "queue_wait_seconds", "cached"}),
+    )
+
+
+class ClaudeCodeStream:
+    """A Claude Code run driven by asyncio that yields stream-json messages as they arrive.
+
+    Iterate it for live messages, then await it for the final response:
+
+        stream = stream_claude_code(request)
+        async for message in stream:
+            print(message.get("type"))
+        response = await stream
+
+    Awaiting without iterating consumes the remaining output silently. Each
+    line goes through a TranscriptCollector as it is read, so the usual
+    artifacts are produced exactly as with prompt_claude_code().
+    """
+
+    def __init__(self, request: AgentPromptRequest):
+        import asyncio
+
+        self.request = request
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._response: Optional[AgentPromptResponse] = None
+        self._transcript: Optional[TranscriptCollector] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._tracker: Optional[TimeoutTracker] = None
+        self._slot: Optional[AgentSlot] = None
+        self._lock = asyncio.Lock()
+        self._started = False
+        self._finished = False
+
+    async def _start(self) -> None:
+        """Run preflight checks and launch the Claude Code process."""
+        import asyncio
+
+        self._started = True
+
+        error_response = prepare_prompt_execution(self.request)
+        if error_response:
+            self._response = error_response
+            self._finished = True
+            return
+
+        # Wait for a host-wide agent slot before launching
+        try:
+            self._slot = await AgentSlot(self.request.model, cancel_event=_agents_cancelled).acquire_async()
+        except SlotWaitCancelled:
+            self._complete(build_cancelled_response())
+            return
+        if agents_cancelled():
+            self._complete(build_cancelled_response())
+            return
+
+        try:
+            self._transcript = TranscriptCollector(self.request.output_file)
+            self.process = await asyncio.create_subprocess_exec(
+                *build_claude_command(self.request),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=get_claude_env(),
+                cwd=self.request.working_dir,  # Use working_dir if provided
+                limit=STREAM_LINE_LIMIT,
+                start_new_session=True,
+            )
+            register_agent_process(self.process.pid)
+            self._tracker = TimeoutTracker(self.request)
+            # Drain stderr concurrently so a chatty process never blocks on a full pipe
+            self._stderr_task = asyncio.create_task(self.process.stderr.read())
+        except FileNotFoundError as e:
+            # The binary went away since it was probed - re-check next time
+            invalidate_claude_install_cache()
+            self._fail(f"Error executing Claude Code: {e}")
+        except Exception as e:
+            self._fail(f"Error executing Claude Code: {e}")
+
+    def _fail(self, error_msg: str) -> None:
+        """Finish the run with an execution error."""
+        if self._transcript:
+            self._transcript.close()
+        self._complete(
+            AgentPromptResponse(
+                output=error_msg,
+                success=False,
+                session_id=None,
+                retry_code=RetryCode.EXECUTION_ERROR,
+            )
+        )
+
+    def _complete(self, response: AgentPromptResponse) -> None:
+        """Record the final response and give the agent slot back."""
+        if self.process:
+            unregister_agent_process(self.process.pid)
+        if self._slot:
+            response.queue_wait_seconds = round(self._slot.wait_seconds, 3)
+            self._slot.release()
+        self._response = response
+        self._finished = True
+
+    async def _next_message(self) -> Optional[Dict[str, Any]]:
+        """Read the next stream-json message, or None once the output is exhausted."""
+        import asyncio
+
+        async with self._lock:
+            if not self._started:
+                await self._start()
+
+            while not self._finished:
+                try:
+                    line = await asyncio.wait_for(
+                        self.process.stdout.readline(), self._tracker.remaining()
+                    )
+                except asyncio.TimeoutError:
+                    reason = self._tracker.expired_reason()
+                    if not reason:
+                        continue
+                    await self._kill()
+                    self._transcript.close()
+                    self._complete(build_timeout_response(reason, self._transcript))
+                    return None
+                except asyncio.CancelledError:
+                    # Don't leave an orphaned agent or an unfinished transcript behind
+                    try:
+                        if self.process.returncode is None:
+                            signal_process_group(self.process.pid, signal.SIGKILL)
+                        self._stderr_task.cancel()
+                    finally:
+                        self._transcript.close()
+                        self._complete(build_cancelled_response())
+                    raise
+                except Exception as e:
+                    signal_process_group(self.process.pid, signal.SIGKILL)
+                    await self.process.wait()
+                    self._fail(f"Error executing Claude Code: {e}")
+                    return None
+
+                if not line:
+                    await self._finish()
+                    return None
+
+                self._tracker.touch()
+                message = self._transcript.feed(line.decode("utf-8", errors="replace"))
+                if message is not None:
+                    notify_message(self.request, message)
+                    return message
+
+            return None
+
+    async def _kill(self) -> None:
+        """Stop the process group: SIGTERM first, SIGKILL after a grace period."""
+        import asyncio
+
+        signal_process_group(self.process.pid, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(self.process.wait(), KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            signal_process_group(self.process.pid, signal.SIGKILL)
+            await self.process.wait()
+        self._stderr_task.cancel()
+
+    async def _finish(self) -> None:
+        """Wait for the process to exit and build the response from its output."""
+        returncode = await self.process.wait()
+        stderr = (await self._stderr_task).decode("utf-8", errors="replace")
+        self._transcript.close()
+        if agents_cancelled():
+            self._complete(build_cancelled_response())
+            return
+
+        try:
+            self._complete(build_prompt_response(returncode, stderr, self._transcript))
+        except Exception as e:
+            self._complete(
+                AgentPromptResponse(
+                    output=f"Error executing Claude Code: {e}",
+                    success=False,
+                    session_id=None,
+                    retry_code=RetryCode.EXECUTION_ERROR,
+                )
+            )
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            message = await self._next_message()
+            if message is None:
+                return
+            yield message
+
+    async def wait(self) -> AgentPromptResponse:
+        """Consume any remaining output and return the final response."""
+        while await self._next_message() is not None:
+            pass
+        return self._response
+
+    def __await__(self):
+        return self.wait().__await__()
+
+
+def stream_claude_code(request: AgentPromptRequest) -> ClaudeCodeStream:
+    """Start Claude Code lazily and return a stream of its messages.
+
+    The process is launched on first iteration or await.
+    """
+    return ClaudeCodeStream(request)
+
+
+async def prompt_claude_code_async(request: AgentPromptRequest) -> AgentPromptResponse:
+    """Async counterpart of prompt_claude_code() built on asyncio subprocesses."""
+    return await stream_claude_code(request)
+
+
+async def prompt_claude_code_with_retry_async(
+    request: AgentPromptRequest,
+    max_retries: int = 3,
+    retry_delays: List[int] = None,
+) -> AgentPromptResponse:
+    """Async counterpart of prompt_claude_code_with_retry() with the same retry semantics."""
+    import asyncio
+
+    attempt_request = request
+    attempts = []
+    response = None
+
+    for attempt in range(max_retries + 1):  # +1 for initial attempt
+        if attempt > 0:
+            # This is a retry
+            if agents_cancelled():
+                return response
+            pause = await asyncio.to_thread(get_retry_pause, attempt, retry_delays)
+            if pause is None:
+                attempts[-1]["retry_budget_exhausted"] = True
+                return response
+            # Back off in short steps so cancel_agents() ends the wait early
+            deadline = time.monotonic() + pause
+            while not agents_cancelled() and time.monotonic() < deadline:
+                await asyncio.sleep(min(deadline - time.monotonic(), 0.25))
+            if agents_cancelled():
+                return response
+            attempt_request = get_retry_request(request, response)
+
+        started_at = time.monotonic()
+        response = await prompt_claude_code_async(attempt_request)
+        await asyncio.to_thread(record_retry_outcome, response, attempt)
+        attempts.append(
+            build_attempt_record(
+                attempt, attempt_request, response, time.monotonic() - started_at
+            )
+        )
+        response.attempts = attempts
+
+        if not should_retry(response, attempt, max_retries):
+            return response
+
+    return response
+
+
+async def execute_template_async(request: AgentTemplateRequest) -> AgentPromptResponse:
+    """Async counterpart of execute_template().
+
+    Example:
+        responses = await asyncio.gather(
+            execute_template_async(plan_request_a),
+            execute_template_async(plan_request_b),
+        )
+    """
+    import asyncio
+
+    cache_key, cached_response = await asyncio.to_thread(load_cached_response, request)
+    if cached_response:
+        return cached_response
+
+    prompt_request = build_template_prompt_request(request)
+    response = await prompt_claude_code_with_retry_async(prompt_request)
+    await asyncio.to_thread(store_cached_response, request, cache_key, response)
+    return response
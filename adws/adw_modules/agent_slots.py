@@ -0,0 +1,155 @@
+"""
+Host-wide concurrency limiter for Claude Code processes.
+
+A counting semaphore shared by every ADW entry point on the host, built from
+slot files under agents/.agent_slots/. Holding an exclusive flock on a slot
+file means holding that slot; the kernel releases it when the holder exits,
+so slots are never leaked by crashed processes. There is a pool of global
+slots plus a pool per model, and a run needs one of each. Idle warm Claude
+workers (claude_workers.py) hold a slot of a separate "warm" pool, so they
+are bounded host-wide without ever blocking a run.
+"""
+
+import fcntl
+import os
+import threading
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SLOTS_DIR = os.path.join(PROJECT_ROOT, "agents", ".agent_slots")
+
+# Seconds between attempts to grab a free slot while queued
+POLL_INTERVAL_SECONDS = 0.25
+
+
+def get_slot_limits() -> Tuple[int, Dict[str, int]]:
+    """Maximum live agents on the host, overall and per model (0 disables a limit).
+
+    Read when a slot is created rather than at import, so values from .env
+    apply once it has been loaded.
+    """
+    return (
+        int(os.getenv("ADW_MAX_AGENTS", "8")),
+        {
+            "sonnet": int(os.getenv("ADW_MAX_SONNET_AGENTS", "8")),
+            "opus": int(os.getenv("ADW_MAX_OPUS_AGENTS", "4")),
+        },
+    )
+
+
+def get_warm_worker_limit() -> int:
+    """Maximum idle warm Claude workers on the host (0 disables the limit)."""
+    return int(os.getenv("ADW_MAX_WARM_WORKERS", "4"))
+
+
+def try_lock_slot(pool: str, size: int) -> Optional[TextIO]:
+    """Try to lock any free slot in a pool without blocking.
+
+    Returns:
+        The open slot file holding the lock, or None if every slot is taken
+    """
+    os.makedirs(SLOTS_DIR, exist_ok=True)
+    for index in range(size):
+        slot_file = open(os.path.join(SLOTS_DIR, f"{pool}-{index}.lock"), "a")
+        try:
+            fcntl.flock(slot_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            slot_file.close()
+            continue
+        slot_file.truncate(0)
+        slot_file.write(str(os.getpid()))
+        slot_file.flush()
+        return slot_file
+    return None
+
+
+def unlock_slot(slot_file: TextIO) -> None:
+    """Give back a slot locked by try_lock_slot()."""
+    fcntl.flock(slot_file.fileno(), fcntl.LOCK_UN)
+    slot_file.close()
+
+
+class SlotWaitCancelled(Exception):
+    """Raised when a slot's cancel event is set while it is still queued."""
+
+
+class AgentSlot:
+    """A held (or pending) place in the host-wide agent limit.
+
+    Usage:
+        with AgentSlot("opus") as slot:
+            ...  # run the agent
+        print(slot.wait_seconds)
+
+    Args:
+        model: Model the agent runs on
+        cancel_event: Stops a queued acquire() with SlotWaitCancelled once set
+    """
+
+    def __init__(self, model: str, cancel_event: Optional[threading.Event] = None):
+        self.model = model
+        self.cancel_event = cancel_event
+        self.wait_seconds = 0.0
+        self._pools = []
+        max_agents, max_agents_per_model = get_slot_limits()
+        model_limit = max_agents_per_model.get(model, 0)
+        # Always take the model slot before the global slot to avoid lock-order deadlocks
+        if model_limit:
+            self._pools.append((model, model_limit))
+        if max_agents:
+            self._pools.append(("global", max_agents))
+        self._held: List[TextIO] = []
+
+    def _try_acquire_next(self) -> bool:
+        """Try to lock the next pool's slot. Returns True once every pool is held."""
+        while len(self._held) < len(self._pools):
+            pool, size = self._pools[len(self._held)]
+            slot_file = try_lock_slot(pool, size)
+            if slot_file is None:
+                return False
+            self._held.append(slot_file)
+        return True
+
+    def acquire(self) -> "AgentSlot":
+        """Block until a slot is free in every pool (or the cancel event is set)."""
+        started_at = time.monotonic()
+        try:
+            while not self._try_acquire_next():
+                if self.cancel_event is None:
+                    time.sleep(POLL_INTERVAL_SECONDS)
+                elif self.cancel_event.wait(POLL_INTERVAL_SECONDS):
+                    raise SlotWaitCancelled(f"Cancelled while waiting for a {self.model} agent slot")
+        except BaseException:
+            # Don't keep a partial set of slots when interrupted while queued
+            self.release()
+            raise
+        self.wait_seconds = time.monotonic() - started_at
+        return self
+
+    async def acquire_async(self) -> "AgentSlot":
+        """Wait for a slot in every pool without blocking the event loop."""
+        import asyncio
+
+        started_at = time.monotonic()
+        try:
+            while not self._try_acquire_next():
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        except BaseException:
+            # Don't keep a partial set of slots when interrupted while queued
+            self.release()
+            raise
+        self.wait_seconds = time.monotonic() - started_at
+        return self
+
+    def release(self) -> None:
+        """Release all held slots."""
+        while self._held:
+            unlock_slot(self._held.pop())
+
+    def __enter__(self) -> "AgentSlot":
+        return self.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,84 @@
+"""
+Phase checkpoints for resumable workflows.
+
+Each workflow phase records its result (status, session ID, plan path, commit
+hash) in agents/<adw_id>/checkpoint.json as soon as it finishes. A run started
+with --resume <adw_id> loads the file, skips the phases that completed and
+restarts at the first unfinished one, so a crash or timeout after /plan
+doesn't pay for planning again.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from workflow_models import PhaseCheckpoint, WorkflowCheckpoint
+from task_list import write_file_atomic
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+AGENTS_DIR = os.path.join(PROJECT_ROOT, "agents")
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class CheckpointError(Exception):
+    """Raised when a run cannot be resumed from its checkpoint."""
+
+
+def get_checkpoint_path(adw_id: str) -> str:
+    """Path of a run's checkpoint file under the project root's agents/ directory.
+
+    Anchored on the project root like the agents' output directories, so
+    --resume finds the checkpoint whatever the current directory is.
+    """
+    return os.path.join(AGENTS_DIR, adw_id, CHECKPOINT_FILE)
+
+
+def load_checkpoint(adw_id: str) -> Optional[WorkflowCheckpoint]:
+    """Load a run's checkpoint, or None if it has none yet."""
+    try:
+        with open(get_checkpoint_path(adw_id), "r") as f:
+            return WorkflowCheckpoint.model_validate(json.load(f))
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(checkpoint: WorkflowCheckpoint) -> None:
+    """Write a checkpoint atomically, so a crash never leaves it half-written."""
+    checkpoint.updated_at = datetime.now()
+    path = get_checkpoint_path(checkpoint.adw_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_file_atomic(path, checkpoint.model_dump_json(indent=2))
+
+
+def start_checkpoint(adw_id: str, workflow: str, inputs: Dict[str, Any]) -> WorkflowCheckpoint:
+    """Create and save the checkpoint of a new run."""
+    checkpoint = WorkflowCheckpoint(adw_id=adw_id, workflow=workflow, inputs=inputs)
+    save_checkpoint(checkpoint)
+    return checkpoint
+
+
+def resume_checkpoint(adw_id: str, workflow: str) -> WorkflowCheckpoint:
+    """Load the checkpoint of a run to resume.
+
+    Raises:
+        CheckpointError: If the run has no checkpoint or belongs to another workflow
+    """
+    checkpoint = load_checkpoint(adw_id)
+    if checkpoint is None:
+        raise CheckpointError(
+            f"No checkpoint found for ADW ID {adw_id} ({get_checkpoint_path(adw_id)})"
+        )
+    if checkpoint.workflow != workflow:
+        raise CheckpointError(
+            f"ADW ID {adw_id} is a {checkpoint.workflow} run, not {workflow}"
+        )
+    return checkpoint
+
+
+def record_phase(checkpoint: WorkflowCheckpoint, phase: PhaseCheckpoint) -> None:
+    """Record a finished phase and save the checkpoint immediately."""
+    checkpoint.phases[phase.phase] = phase
+    save_checkpoint(checkpoint)
+
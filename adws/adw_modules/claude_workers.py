@@ -0,0 +1,519 @@
+"""
+Persistent Claude Code workers driven over stream-json stdin/stdout.
+
+Every `claude -p <prompt>` run pays for Node startup, MCP server startup and
+session initialization before the first token. A ClaudeWorker instead starts
+
+    claude -p --input-format stream-json --output-format stream-json --verbose ...
+
+ahead of time and is handed prompts as stream-json user messages on stdin,
+one job at a time; its stdout is ingested exactly like a one-shot run, so the
+agents/ artifacts are unchanged.
+
+Session boundaries: before a worker takes another job it is sent /clear, and
+it is only reused if that started a new session; otherwise (or after
+max_jobs jobs, a failed job, a timeout or an exit) it is recycled and a
+fresh process takes its place. The pool keeps idle workers booted per
+process configuration (CLI, model, working directory, flags), so even a
+recycled worker's replacement has usually finished starting up before the
+next job arrives.
+
+Enabled with ADW_CLAUDE_WORKERS=<idle workers per configuration> (0, the
+default, keeps one process per run); ADW_CLAUDE_WORKER_MAX_JOBS bounds how
+many jobs a worker serves. Requests that resume a session always run as a
+one-shot process, since --resume is fixed when the process starts.
+
+Limits: a worker running a job does so under the job's AgentSlot, and an
+idle worker holds a host-wide "warm" slot (ADW_MAX_WARM_WORKERS, see
+agent_slots.py). When none is free no worker is kept idle; a process first
+stops its idle workers of other configurations to make room.
+"""
+
+import atexit
+import json
+import os
+import queue
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
+from agent import (
+    KILL_GRACE_SECONDS,
+    AgentPromptRequest,
+    AgentPromptResponse,
+    RetryCode,
+    TimeoutTracker,
+    TranscriptCollector,
+    build_prompt_response,
+    build_timeout_response,
+    get_claude_env,
+    get_claude_path,
+    invalidate_claude_install_cache,
+    load_env,
+    notify_message,
+    register_agent_process,
+    signal_process_group,
+    unregister_agent_process,
+)
+from agent_slots import get_warm_worker_limit, try_lock_slot, unlock_slot
+
+# Seconds to wait for a worker to acknowledge /clear before recycling it
+CLEAR_TIMEOUT_SECONDS = 30
+
+# Marks the end of a worker's stdout in its line queue
+_EOF = None
+
+# (claude path, model, working dir, skip permissions, MCP config) a worker is started with
+WorkerKey = Tuple[str, str, Optional[str], bool, Optional[str]]
+
+
+def get_worker_settings() -> Tuple[int, int]:
+    """(idle workers per configuration, max jobs per worker); 0 idle workers disables the pool."""
+    load_env()
+    return (
+        int(os.getenv("ADW_CLAUDE_WORKERS", "0")),
+        max(1, int(os.getenv("ADW_CLAUDE_WORKER_MAX_JOBS", "10"))),
+    )
+
+
+def get_worker_key(request: AgentPromptRequest) -> WorkerKey:
+    """The process-level settings a request needs from its worker."""
+    mcp_config = None
+    if request.working_dir:
+        mcp_config_path = os.path.join(request.working_dir, ".mcp.json")
+        if os.path.exists(mcp_config_path):
+            mcp_config = mcp_config_path
+    return (
+        get_claude_path(),
+        request.model,
+        request.working_dir,
+        request.dangerously_skip_permissions,
+        mcp_config,
+    )
+
+
+def build_worker_command(key: WorkerKey) -> List[str]:
+    """The Claude Code CLI command of a stream-json worker."""
+    claude_path, model, _working_dir, skip_permissions, mcp_config = key
+    cmd = [
+        claude_path,
+        "-p",
+        "--input-format",
+        "stream-json",
+        "--output-format",
+        "stream-json",
+        "--verbose",
+        "--model",
+        model,
+    ]
+    if mcp_config:
+        cmd.extend(["--mcp-config", mcp_config])
+    if skip_permissions:
+        cmd.append("--dangerously-skip-permissions")
+    return cmd
+
+
+def build_user_message(prompt: str) -> str:
+    """A stream-json user message line."""
+    return json.dumps(
+        {
+            "type": "user",
+            "message": {"role": "user", "content": prompt},
+            "parent_tool_use_id": None,
+        }
+    ) + "\n"
+
+
+class ClaudeWorker:
+    """A long-lived Claude Code process that runs one prompt at a time."""
+
+    def __init__(self, key: WorkerKey):
+        self.key = key
+        self.jobs = 0
+        self.last_session_id: Optional[str] = None
+        self.broken = False
+        # Whether the pool expects this worker back after its current job
+        self.returning = False
+        # Host-wide warm slot held while the worker is idle
+        self.warm_slot: Optional[TextIO] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr: TextIO = tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace")
+        self.process = subprocess.Popen(
+            build_worker_command(key),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=get_claude_env(),
+            cwd=key[2],
+            start_new_session=True,
+        )
+        # A reader thread feeds the queue so that reads can time out
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+
+    def _read_stdout(self) -> None:
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(_EOF)
+
+    @property
+    def alive(self) -> bool:
+        return not self.broken and self.process.poll() is None
+
+    def release_warm_slot(self) -> None:
+        """Give back the worker's warm slot, if it holds one."""
+        if self.warm_slot is not None:
+            unlock_slot(self.warm_slot)
+            self.warm_slot = None
+
+    def _send(self, prompt: str) -> None:
+        self.process.stdin.write(build_user_message(prompt))
+        self.process.stdin.flush()
+
+    def _read_stderr(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read()
+
+    def run(self, request: AgentPromptRequest) -> AgentPromptResponse:
+        """Run one prompt and build its response like a one-shot process run.
+
+        The worker is marked broken (and will be recycled) when the job fails,
+        times out or the process exits.
+        """
+        transcript = TranscriptCollector(request.output_file)
+        tracker = TimeoutTracker(request)
+        # A busy worker is stopped along with one-shot runs by cancel_agents()
+        register_agent_process(self.process.pid)
+        try:
+            try:
+                self._send(request.prompt)
+            except (BrokenPipeError, OSError):
+                self.broken = True
+                self.process.wait()
+                return build_prompt_response(self.process.returncode or 1, self._read_stderr(), transcript)
+
+            while True:
+                timeout = tracker.remaining()
+                try:
+                    line = self._lines.get(timeout=None if timeout is None else max(timeout, 0.01))
+                except queue.Empty:
+                    reason = tracker.expired_reason()
+                    if reason:
+                        self.stop()
+                        return build_timeout_response(reason, transcript)
+                    continue
+
+                if line is _EOF:
+                    # The worker died mid-job; report it like a failed one-shot run
+                    self.broken = True
+                    returncode = self.process.wait()
+                    return build_prompt_response(returncode or 1, self._read_stderr(), transcript)
+
+                tracker.touch()
+                message = transcript.feed(line)
+                if message is None:
+                    continue
+                notify_message(request, message)
+                if message.get("type") == "result":
+                    break
+        finally:
+            unregister_agent_process(self.process.pid)
+            transcript.close()
+
+        self.jobs += 1
+        response = build_prompt_response(0, None, transcript)
+        self.last_session_id = response.session_id
+        if not response.success:
+            self.broken = True
+        return response
+
+    def reset(self) -> bool:
+        """Start a new session for the next job with /clear.
+
+        Returns:
+            True if the worker answered with a session other than the last
+            job's, i.e. the next job won't see this one's context
+        """
+        try:
+            self._send("/clear")
+        except (BrokenPipeError, OSError):
+            self.broken = True
+            return False
+
+        deadline = time.monotonic() + CLEAR_TIMEOUT_SECONDS
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0.01))
+            except queue.Empty:
+                self.broken = True
+                return False
+            if line is _EOF:
+                self.broken = True
+                return False
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if message.get("type") == "result":
+                session_id = message.get("session_id")
+                if message.get("is_error") or not session_id or session_id == self.last_session_id:
+                    self.broken = True
+                    return False
+                return True
+
+    def stop(self) -> None:
+        """Stop the worker process group and mark the worker unusable."""
+        self.broken = True
+        self.release_warm_slot()
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            signal_process_group(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=KILL_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                signal_process_group(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+        self._stderr.close()
+
+
+class ClaudeWorkerPool:
+    """Warm Claude Code workers, grouped by process configuration.
+
+    A worker goes back to the idle set after each job it can be reused for;
+    a replacement is only started when a worker is about to be recycled, so
+    the idle set holds up to idle_workers workers per configuration. Every
+    idle worker holds a host-wide warm slot; without one it isn't kept.
+
+    Usage:
+        pool = ClaudeWorkerPool(idle_workers=1, max_jobs=10)
+        response = pool.run(request)
+        pool.shutdown()
+    """
+
+    def __init__(self, idle_workers: int = 1, max_jobs: int = 10):
+        self.idle_workers = idle_workers
+        self.max_jobs = max_jobs
+        # Cleared once a worker fails to start a new session on /clear
+        self.reuse_supported = True
+        self.stats = {"spawned": 0, "reused": 0, "recycled": 0}
+        self._idle: Dict[WorkerKey, List[ClaudeWorker]] = {}
+        # Busy workers per configuration that should rejoin the idle set
+        self._returning: Dict[WorkerKey, int] = {}
+        # Every worker process started and not yet stopped (idle, busy or resetting)
+        self._live: Set[ClaudeWorker] = set()
+        self._lock = threading.Lock()
+
+    def _spawn(self, key: WorkerKey, warm_slot: Optional[TextIO] = None) -> ClaudeWorker:
+        try:
+            worker = ClaudeWorker(key)
+        except BaseException:
+            if warm_slot is not None:
+                unlock_slot(warm_slot)
+            raise
+        worker.warm_slot = warm_slot
+        with self._lock:
+            self.stats["spawned"] += 1
+            self._live.add(worker)
+        return worker
+
+    def _stop(self, worker: ClaudeWorker) -> None:
+        worker.stop()
+        with self._lock:
+            self._live.discard(worker)
+
+    def _reserve_warm_slot(self, key: WorkerKey) -> Tuple[bool, Optional[TextIO]]:
+        """Lock a warm slot for an idle worker of the configuration.
+
+        When the host is at its limit, this process's idle workers of other
+        configurations are stopped (oldest first) until a slot frees up.
+
+        Returns:
+            (whether a worker may be kept idle, the slot file or None when
+            ADW_MAX_WARM_WORKERS is 0)
+        """
+        limit = get_warm_worker_limit()
+        if not limit:
+            return True, None
+        while True:
+            slot_file = try_lock_slot("warm", limit)
+            if slot_file is not None:
+                return True, slot_file
+            with self._lock:
+                other_key = next((other for other, idle in self._idle.items() if other != key and idle), None)
+                if other_key is None:
+                    return False, None
+                evicted = self._idle[other_key].pop(0)
+            self._stop(evicted)
+
+    def _top_up(self, key: WorkerKey) -> None:
+        """Start replacements so that idle plus returning workers reach idle_workers."""
+        with self._lock:
+            missing = (
+                self.idle_workers
+                - len(self._idle.get(key, []))
+                - self._returning.get(key, 0)
+            )
+        # Starting a process doesn't block; replacements boot in the background
+        for _ in range(max(missing, 0)):
+            reserved, warm_slot = self._reserve_warm_slot(key)
+            if not reserved:
+                return
+            replacement = self._spawn(key, warm_slot)
+            with self._lock:
+                self._idle.setdefault(key, []).append(replacement)
+
+    def _will_return(self, worker: ClaudeWorker) -> bool:
+        return self.reuse_supported and worker.jobs + 1 < self.max_jobs
+
+    def acquire(self, key: WorkerKey) -> ClaudeWorker:
+        """Take an idle worker for the configuration, or start one."""
+        worker = None
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            while idle and worker is None:
+                candidate = idle.pop(0)
+                if candidate.alive:
+                    worker = candidate
+                else:
+                    candidate.stop()
+                    self._live.discard(candidate)
+            if worker is not None and worker.jobs:
+                self.stats["reused"] += 1
+
+        if worker is None:
+            worker = self._spawn(key)
+        else:
+            # From here on the worker runs under the job's AgentSlot
+            worker.release_warm_slot()
+        with self._lock:
+            worker.returning = self._will_return(worker)
+            if worker.returning:
+                self._returning[key] = self._returning.get(key, 0) + 1
+        self._top_up(key)
+        return worker
+
+    def release(self, worker: ClaudeWorker) -> None:
+        """Return a worker after a job, recycling it unless it can start a clean session."""
+        if not (worker.returning and worker.alive and self.reuse_supported):
+            self._recycle(worker)
+            return
+        # /clear runs off the caller's critical path
+        threading.Thread(target=self._reset_and_park, args=(worker,), daemon=True).start()
+
+    def _reset_and_park(self, worker: ClaudeWorker) -> None:
+        # The job's AgentSlot is gone, so an idle worker needs a warm slot
+        reserved, worker.warm_slot = self._reserve_warm_slot(worker.key)
+        if not reserved:
+            self._recycle(worker)
+            return
+        if not worker.reset():
+            if worker.process.poll() is None:
+                # The CLI didn't give /clear a new session: one job per process from now on
+                self.reuse_supported = False
+            self._recycle(worker)
+            return
+        with self._lock:
+            self._returning[worker.key] -= 1
+            worker.returning = False
+            idle = self._idle.setdefault(worker.key, [])
+            if len(idle) < self.idle_workers:
+                idle.append(worker)
+                return
+        self._recycle(worker)
+
+    def _recycle(self, worker: ClaudeWorker) -> None:
+        self._stop(worker)
+        with self._lock:
+            self.stats["recycled"] += 1
+            replace = worker.returning
+            if worker.returning:
+                self._returning[worker.key] -= 1
+                worker.returning = False
+        if replace:
+            # A worker that was expected back isn't coming; boot its successor now
+            self._top_up(worker.key)
+
+    def run(self, request: AgentPromptRequest) -> AgentPromptResponse:
+        """Run a prepared request on a worker."""
+        worker = self.acquire(get_worker_key(request))
+        try:
+            response = worker.run(request)
+        except BaseException:
+            # Don't leave a half-fed worker behind on errors or Ctrl+C
+            self._recycle(worker)
+            raise
+        self.release(worker)
+        return response
+
+    def shutdown(self) -> None:
+        """Stop every worker the pool started, idle or not."""
+        with self._lock:
+            workers = list(self._live)
+            self._live.clear()
+            self._idle.clear()
+        for worker in workers:
+            worker.stop()
+
+
+_pool: Optional[ClaudeWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> Optional[ClaudeWorkerPool]:
+    """The process-wide worker pool, or None when ADW_CLAUDE_WORKERS is 0."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            idle_workers, max_jobs = get_worker_settings()
+            if idle_workers <= 0:
+                return None
+            _pool = ClaudeWorkerPool(idle_workers=idle_workers, max_jobs=max_jobs)
+            atexit.register(shutdown_worker_pool)
+        return _pool
+
+
+def shutdown_worker_pool() -> None:
+    """Stop the process-wide pool's workers, if a pool was started.
+
+    Runs at exit, but processes that leave with os._exit (forked workflow
+    jobs, see workflow_workers.py) have to call it themselves.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def run_with_worker(request: AgentPromptRequest) -> Optional[AgentPromptResponse]:
+    """Run a prepared request on a pooled worker.
+
+    Returns:
+        The response, or None if the request must run as a one-shot process
+        (pool disabled, or the request resumes a session)
+    """
+    if request.resume_session_id:
+        return None
+    pool = get_worker_pool()
+    if pool is None:
+        return None
+    try:
+        return pool.run(request)
+    except Exception as e:
+        if isinstance(e, FileNotFoundError):
+            # The binary went away since it was probed - re-check next time
+            invalidate_claude_install_cache()
+        return AgentPromptResponse(
+            output=f"Error executing Claude Code: {e}",
+            success=False,
+            session_id=None,
+            retry_code=RetryCode.EXECUTION_ERROR,
+        )
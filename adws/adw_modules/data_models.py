@@ -8,7 +8,17 @@ used throughout the ToDone system.
 from typing import List, Optional, Literal
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class ADWModel(BaseModel):
+    """Base for the ADW models.
+
+    Validators are built on first use instead of at import, so entry points
+    only pay for the models they actually instantiate.
+    """
+
+    model_config = ConfigDict(defer_build=True)
 
 
 class SystemTag(str, Enum):
@@ -49,7 +59,7 @@ class SystemTag(str, Enum):
         return cls.PLAN_IMPLEMENT_UPDATE in tags
 
 
-class Task(BaseModel):
+class Task(ADWModel):
     """Represents a single task in the task list."""
 
     description: str = Field(..., description="The task description")
@@ -69,7 +79,8 @@ class Task(BaseModel):
         None, description="Associated git worktree name"
     )
 
-    @validator("status")
+    @field_validator("status")
+    @classmethod
     def validate_status(cls, v):
         """Ensure status is one of the valid values."""
         valid_statuses = ["[]", "[⏰]", "[🟡]", "[✅]", "[❌]"]
@@ -86,7 +97,7 @@ class Task(BaseModel):
         return self.status in ["[✅]", "[❌]"]
 
 
-class Worktree(BaseModel):
+class Worktree(ADWModel):
     """Represents a git worktree section in the task list."""
 
     name: str = Field(..., description="Name of the git worktree")
@@ -111,7 +122,7 @@ class Worktree(BaseModel):
         return eligible
 
 
-class TaskToStart(BaseModel):
+class TaskToStart(ADWModel):
     """Task ready to be started by an agent."""
 
     description: str = Field(..., description="The task description")
@@ -120,7 +131,7 @@ class TaskToStart(BaseModel):
     )
 
 
-class WorktreeTaskGroup(BaseModel):
+class WorktreeTaskGroup(ADWModel):
     """Groups tasks by worktree for processing."""
 
     worktree_name: str = Field(..., description="Name of the git worktree")
@@ -129,7 +140,7 @@ class WorktreeTaskGroup(BaseModel):
     )
 
 
-class ProcessTasksResponse(BaseModel):
+class ProcessTasksResponse(ADWModel):
     """Response from the /process_tasks command."""
 
     task_groups: List[WorktreeTaskGroup] = Field(
@@ -141,7 +152,7 @@ class ProcessTasksResponse(BaseModel):
         return any(len(group.tasks_to_start) > 0 for group in self.task_groups)
 
 
-class TaskUpdate(BaseModel):
+class TaskUpdate(ADWModel):
     """Update information for a task after agent processing."""
 
     adw_id: str = Field(..., description="ADW ID of the task")
@@ -153,22 +164,24 @@ class TaskUpdate(BaseModel):
     worktree_name: str = Field(..., description="Worktree where task was executed")
     task_description: str = Field(..., description="Original task description")
 
-    @validator("status")
+    @field_validator("status")
+    @classmethod
     def validate_final_status(cls, v):
         """Ensure status is a terminal state."""
         if v not in ["[✅]", "[❌]"]:
             raise ValueError("Task update status must be either [✅] or [❌]")
         return v
 
-    @validator("commit_hash")
-    def validate_commit_hash(cls, v, values):
+    @field_validator("commit_hash")
+    @classmethod
+    def validate_commit_hash(cls, v, info):
         """Ensure commit hash is provided for successful tasks."""
-        if values.get("status") == "[✅]" and not v:
+        if info.data.get("status") == "[✅]" and not v:
             raise ValueError("Commit hash is required for successful tasks")
         return v
 
 
-class WorkflowState(BaseModel):
+class WorkflowState(ADWModel):
     """Tracks the state of a workflow execution."""
 
     adw_id: str = Field(..., description="Unique ADW ID for this workflow")
@@ -194,7 +207,30 @@ class WorkflowState(BaseModel):
             self.error = error
 
 
-class CronTriggerConfig(BaseModel):
+class DelegatedTask(ADWModel):
+    """A workflow process started by the cron trigger."""
+
+    adw_id: str = Field(..., description="ADW ID of the delegated task")
+    worktree_name: str = Field(..., description="Worktree the task runs in")
+    task_description: str = Field(..., description="Task being processed")
+    workflow: str = Field(..., description="Workflow script running the task")
+    model: str = Field(..., description="Claude model used by the workflow")
+    pid: int = Field(..., description="Process ID of the workflow")
+    started_at: datetime = Field(
+        default_factory=datetime.now, description="Process start time"
+    )
+    finished_at: Optional[datetime] = Field(None, description="Process exit time")
+    exit_code: Optional[int] = Field(
+        None, description="Process exit status, None while still running"
+    )
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the process has not been reaped yet."""
+        return self.exit_code is None
+
+
+class CronTriggerConfig(ADWModel):
     """Configuration for the cron trigger."""
 
     polling_interval: int = Field(
@@ -212,9 +248,29 @@ class CronTriggerConfig(BaseModel):
     worktree_base_path: str = Field(
         default="trees", description="Base directory for git worktrees"
     )
+    use_agent_task_processor: bool = Field(
+        default=False,
+        description="Use the /process_tasks agent instead of the native tasks.md parser",
+    )
+    watch_files: bool = Field(
+        default=True,
+        description="Wake on inotify file events instead of fixed-interval polling",
+    )
+    debounce_seconds: float = Field(
+        default=0.2, ge=0, description="Quiet period that ends a burst of file events"
+    )
+    worker_mode: Literal["forkserver", "subprocess"] = Field(
+        default="subprocess",
+        description="Run workflows as fresh subprocesses or in forks of a preloaded forkserver",
+    )
+    worktree_pool_size: int = Field(
+        default=0,
+        ge=0,
+        description="Spare pre-provisioned worktrees to keep ready (0 disables the pool)",
+    )
 
 
-class WorktreeConfig(BaseModel):
+class WorktreeConfig(ADWModel):
     """Configuration for creating a new worktree."""
 
     worktree_name: str = Field(..., description="Name of the worktree to create")
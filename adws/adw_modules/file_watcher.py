@@ -0,0 +1,221 @@
+"""
+Linux inotify watcher for the task list and worktree directory.
+
+Lets the cron trigger sleep until tasks.md (or the worktree base directory)
+actually changes instead of waking on a fixed interval. Uses the inotify
+syscalls through ctypes, so it needs no extra dependencies; on platforms or
+filesystems without inotify, InotifyWatcher raises WatcherUnavailable and
+the caller should fall back to polling.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from typing import Dict, List, Optional, Set
+
+# inotify event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+# Watch whole directories: editors and write_file_atomic replace files via rename
+DIRECTORY_EVENTS = (
+    IN_CLOSE_WRITE
+    | IN_MODIFY
+    | IN_ATTRIB
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+# struct inotify_event { int wd; uint32_t mask, cookie, len; char name[]; }
+EVENT_HEADER = struct.Struct("iIII")
+
+# Quiet period that ends a burst of rapid edits
+DEFAULT_DEBOUNCE_SECONDS = 0.2
+
+# Longest a continuous burst can delay a wake-up
+MAX_DEBOUNCE_SECONDS = 2.0
+
+
+class WatcherUnavailable(Exception):
+    """Raised when inotify cannot be used on this platform or filesystem."""
+
+
+def load_libc() -> ctypes.CDLL:
+    """Load libc with the inotify functions, or raise WatcherUnavailable."""
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        raise WatcherUnavailable("libc not found")
+    libc = ctypes.CDLL(libc_name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise WatcherUnavailable("inotify is not supported on this platform")
+    return libc
+
+
+class InotifyWatcher:
+    """Wait for changes to a set of files and directories.
+
+    Files are watched through their parent directory, so atomic replaces are
+    seen. Directories that don't exist yet are watched through their nearest
+    existing parent until they are created.
+
+    Usage:
+        watcher = InotifyWatcher(["tasks.md"], directories=["trees"])
+        while True:
+            if watcher.wait(timeout=30):
+                ...  # something changed
+    """
+
+    def __init__(
+        self,
+        files: List[str],
+        directories: Optional[List[str]] = None,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ):
+        self._libc = load_libc()
+        self.debounce_seconds = debounce_seconds
+        self.files = [os.path.abspath(path) for path in files]
+        self.directories = [os.path.abspath(path) for path in directories or []]
+
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise WatcherUnavailable(f"inotify_init1 failed: {os.strerror(err)}")
+
+        # Watch descriptor -> watched directory
+        self._watches: Dict[int, str] = {}
+        self._add_watches()
+
+    def _watch_directory(self, directory: str) -> None:
+        """Add an inotify watch on a directory (no-op if already watched)."""
+        if directory in self._watches.values():
+            return
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), DIRECTORY_EVENTS | IN_ONLYDIR
+        )
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOSPC, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise WatcherUnavailable(
+                    f"Cannot watch {directory}: {os.strerror(err)}"
+                )
+            # Directory vanished between the check and the call
+            return
+        self._watches[wd] = directory
+
+    def _add_watches(self) -> None:
+        """Watch file parents and target directories (or their nearest parent)."""
+        targets: Set[str] = {os.path.dirname(path) for path in self.files}
+        for directory in self.directories:
+            targets.add(directory)
+            targets.add(os.path.dirname(directory))
+
+        for target in sorted(targets):
+            while not os.path.isdir(target) and os.path.dirname(target) != target:
+                target = os.path.dirname(target)
+            self._watch_directory(target)
+
+    def _is_relevant(self, directory: str, name: str) -> bool:
+        """Whether an event on directory/name concerns a watched path."""
+        path = os.path.join(directory, name) if name else directory
+        if path in self.files or path in self.directories:
+            return True
+        return any(
+            directory == watched or path.startswith(watched + os.sep)
+            for watched in self.directories
+        )
+
+    def _read_events(self) -> bool:
+        """Drain pending events. Returns True if any concerned a watched path."""
+        relevant = False
+        rewatch = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0").decode(
+                    "utf-8", errors="replace"
+                )
+                offset += length
+
+                directory = self._watches.get(wd)
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    rewatch = True
+                if directory is None:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF):
+                    # A watched directory may have appeared or moved away
+                    rewatch = True
+                if self._is_relevant(directory, name):
+                    relevant = True
+
+        if rewatch:
+            self._add_watches()
+        return relevant
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until a watched path changes or the timeout expires.
+
+        Bursts of events are debounced: after the first relevant event, the
+        watcher keeps draining until no event arrives for debounce_seconds
+        (bounded by MAX_DEBOUNCE_SECONDS).
+
+        Returns:
+            True if something changed, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._read_events():
+                break
+
+        burst_deadline = time.monotonic() + MAX_DEBOUNCE_SECONDS
+        while time.monotonic() < burst_deadline:
+            quiet = min(self.debounce_seconds, burst_deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], max(0.0, quiet))
+            if not readable:
+                break
+            self._read_events()
+        return True
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "InotifyWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,215 @@
+"""
+Shared, content-addressed node_modules store for worktrees.
+
+Installing dependencies once per worktree costs minutes and hundreds of MB
+each. Instead, `npm ci` runs once per distinct package-lock.json, into
+trees/.node_modules_store/<lock hash>/, and every worktree with that lockfile
+gets its node_modules materialized from the store:
+
+- reflink copy (`cp --reflink=always`) where the filesystem supports it, so
+  each worktree gets private copy-on-write files
+- otherwise a full copy (`cp -a`), or with ADW_NODE_MODULES_FALLBACK=hardlink
+  hardlinks (`cp -al`), which share file data with the store
+
+Stored files are read-only, so a hardlinked worktree that writes a package
+file in place (postinstall scripts, patch-package, caches) fails instead of
+corrupting the store and every other worktree linked to it. Copies get their
+write permission back.
+
+A marker file in node_modules records the lockfile hash it was built from,
+so a worktree is only re-materialized when its lockfile changes.
+"""
+
+import fcntl
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional
+
+# Store location, relative to the repository root
+STORE_DIR = os.path.join("trees", ".node_modules_store")
+
+# Records the lockfile hash a node_modules directory was materialized from
+MARKER_FILE = ".adw-lock-hash"
+
+LOCKFILE = "package-lock.json"
+
+# Seconds allowed for `npm ci` when populating the store
+NPM_CI_TIMEOUT_SECONDS = 1800
+
+# How node_modules is materialized where reflinks aren't supported
+FALLBACK_MODES = ("copy", "hardlink")
+
+
+class DependencyStoreError(Exception):
+    """Raised when dependencies cannot be installed or materialized."""
+
+
+def get_fallback_mode() -> str:
+    """Materialization fallback from ADW_NODE_MODULES_FALLBACK ("copy" or "hardlink")."""
+    mode = os.getenv("ADW_NODE_MODULES_FALLBACK", "copy")
+    return mode if mode in FALLBACK_MODES else "copy"
+
+
+def make_read_only(tree: str) -> None:
+    """Clear the write bits of every regular file under tree (directories stay writable)."""
+    for dirpath, _dirnames, filenames in os.walk(tree):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path):
+                continue
+            mode = os.stat(path).st_mode
+            if mode & 0o222:
+                os.chmod(path, mode & ~0o222)
+
+
+def get_lockfile_hash(app_dir: str) -> Optional[str]:
+    """SHA-256 of app_dir/package-lock.json, or None if there is no lockfile."""
+    lockfile = os.path.join(app_dir, LOCKFILE)
+    if not os.path.isfile(lockfile):
+        return None
+    digest = hashlib.sha256()
+    with open(lockfile, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_marker(node_modules: str) -> Optional[str]:
+    """Lockfile hash a node_modules directory was built from, if recorded."""
+    try:
+        with open(os.path.join(node_modules, MARKER_FILE), "r") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def populate_store(app_dir: str, lock_hash: str, repo_root: str) -> str:
+    """Install dependencies for a lockfile into the store, once per hash.
+
+    Concurrent callers for the same hash wait on a lock and reuse the result.
+
+    Returns:
+        Path of the stored node_modules directory
+    """
+    store_root = os.path.join(repo_root, STORE_DIR)
+    entry = os.path.join(store_root, lock_hash)
+    stored_node_modules = os.path.join(entry, "node_modules")
+    if os.path.isdir(stored_node_modules):
+        return stored_node_modules
+
+    os.makedirs(store_root, exist_ok=True)
+    with open(os.path.join(store_root, f"{lock_hash}.lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            if os.path.isdir(stored_node_modules):
+                return stored_node_modules
+
+            build_dir = tempfile.mkdtemp(dir=store_root, prefix=f".{lock_hash[:12]}.")
+            try:
+                for name in ("package.json", LOCKFILE, ".npmrc"):
+                    source = os.path.join(app_dir, name)
+                    if os.path.isfile(source):
+                        shutil.copy2(source, os.path.join(build_dir, name))
+
+                try:
+                    result = subprocess.run(
+                        ["npm", "ci", "--no-audit", "--no-fund"],
+                        cwd=build_dir,
+                        capture_output=True,
+                        text=True,
+                        timeout=NPM_CI_TIMEOUT_SECONDS,
+                    )
+                except (OSError, subprocess.TimeoutExpired) as e:
+                    raise DependencyStoreError(f"npm ci failed: {e}")
+                if result.returncode != 0:
+                    raise DependencyStoreError(
+                        f"npm ci failed: {result.stderr.strip()[-2000:]}"
+                    )
+
+                # A lockfile without dependencies leaves no node_modules behind
+                os.makedirs(os.path.join(build_dir, "node_modules"), exist_ok=True)
+                with open(os.path.join(build_dir, "node_modules", MARKER_FILE), "w") as f:
+                    f.write(lock_hash)
+                make_read_only(os.path.join(build_dir, "node_modules"))
+                os.replace(build_dir, entry)
+            finally:
+                if os.path.exists(build_dir):
+                    shutil.rmtree(build_dir, ignore_errors=True)
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    return stored_node_modules
+
+
+def materialize(
+    stored_node_modules: str, destination: str, fallback: Optional[str] = None
+) -> str:
+    """Copy a stored node_modules tree with reflinks, falling back to a copy or hardlinks.
+
+    Args:
+        stored_node_modules: node_modules directory in the store
+        destination: node_modules directory to (re)create
+        fallback: "copy" or "hardlink" (default: by ADW_NODE_MODULES_FALLBACK)
+
+    Returns:
+        The method used: "reflink", "copy" or "hardlink"
+    """
+    fallback = fallback or get_fallback_mode()
+    staging = f"{destination}.adw-tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    fallback_flags = ["-al"] if fallback == "hardlink" else ["-a"]
+    for method, flags in (("reflink", ["-a", "--reflink=always"]), (fallback, fallback_flags)):
+        if method == "hardlink":
+            # Stores built before stored files were made read-only
+            make_read_only(stored_node_modules)
+        result = subprocess.run(
+            ["cp", *flags, stored_node_modules, staging],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            break
+        shutil.rmtree(staging, ignore_errors=True)
+    else:
+        raise DependencyStoreError(f"Could not materialize node_modules: {result.stderr.strip()}")
+
+    if method != "hardlink":
+        # Private files: give back the write permission the store took away
+        subprocess.run(["chmod", "-R", "u+w", staging], capture_output=True)
+
+    if os.path.lexists(destination):
+        if os.path.isdir(destination) and not os.path.islink(destination):
+            shutil.rmtree(destination)
+        else:
+            os.remove(destination)
+    os.replace(staging, destination)
+    return method
+
+
+def ensure_node_modules(app_dir: str, repo_root: str) -> Optional[str]:
+    """Make app_dir/node_modules match app_dir/package-lock.json.
+
+    Does nothing when there is no lockfile or node_modules was already
+    materialized from the same lockfile.
+
+    Returns:
+        "reflink", "copy" or "hardlink" if node_modules was (re)materialized,
+        else None
+
+    Raises:
+        DependencyStoreError: If npm ci or the copy fails
+    """
+    lock_hash = get_lockfile_hash(app_dir)
+    if lock_hash is None:
+        return None
+
+    node_modules = os.path.join(app_dir, "node_modules")
+    if read_marker(node_modules) == lock_hash:
+        return None
+
+    stored_node_modules = populate_store(app_dir, lock_hash, repo_root)
+    return materialize(stored_node_modules, node_modules)
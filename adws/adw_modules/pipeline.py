@@ -0,0 +1,850 @@
+"""
+Declarative phase pipelines for the compound workflows.
+
+A workflow is declared as a list of Phases, each naming the phases whose
+outputs it needs. Pipeline.run() executes them as a DAG:
+
+- phases whose dependencies have finished run concurrently on a thread pool
+- a phase whose dependency failed is skipped, unless it is marked run_always
+  (the tasks.md update has to record failures too)
+- on --resume, phases completed in the run's checkpoint are restored instead
+  of run, up to the first phase that has to run again
+
+The engine owns everything the workflow scripts used to repeat for every
+phase: status panels, the agent's custom_summary_output.json, the checkpoint
+record, per-phase timing, and the final workflow_summary.json and table.
+
+Example:
+    pipeline = Pipeline("chore_implement", [
+        template_phase(
+            "plan", "/chore", agent_name="planner", title="Planning",
+            args=lambda ctx: [ctx.adw_id, ctx.inputs["prompt"]],
+            outputs=lambda ctx, response: {"plan_path": extract_plan_path(response.output)},
+        ),
+        template_phase(
+            "implement", "/implement", agent_name="builder", title="Implementation",
+            args=lambda ctx: [ctx.output("plan", "plan_path")],
+            depends_on=["plan"],
+        ),
+    ])
+    result = pipeline.run(checkpoint, model="sonnet", working_dir=os.getcwd())
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.rule import Rule
+from rich.table import Table
+
+from agent import (
+    AgentPromptResponse,
+    AgentTemplateRequest,
+    cancel_agents,
+    execute_template,
+    get_message_events,
+    make_status_hook,
+)
+from checkpoint import AGENTS_DIR, record_phase
+from workflow_models import PhaseCheckpoint, PhaseResult, PipelineResult, WorkflowCheckpoint
+from task_list import mark_task_completed, mark_task_failed, mark_task_resumed
+from utils import print_status_panel
+
+# Output file name constants
+SUMMARY_JSON = "custom_summary_output.json"
+WORKFLOW_SUMMARY_JSON = "workflow_summary.json"
+
+# Tools an agent uses to (re)discover the repository
+EXPLORATION_TOOLS = ("Read", "Glob", "Grep", "LS")
+
+# How a phase can reuse an earlier phase's session
+SESSION_MODES = ("fresh", "continue", "fork")
+
+# Per-phase agent limits in seconds. Planning only reads; implementation
+# runs builds and tests. The idle limit sits well above Claude Code's
+# 10 minute cap on a single Bash tool call, so a long silent command is
+# never mistaken for a hung agent.
+PLAN_TIMEOUT_SECONDS = 30 * 60
+IMPLEMENT_TIMEOUT_SECONDS = 90 * 60
+PHASE_IDLE_TIMEOUT_SECONDS = 20 * 60
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline's phases don't form a valid DAG."""
+
+
+class PhaseContext:
+    """What a running phase sees: the run's settings and earlier results.
+
+    Attributes:
+        adw_id: ADW ID of the run
+        inputs: Workflow inputs (the checkpoint's inputs)
+        model: Default Claude model of the run
+        working_dir: Directory agents work in
+        resume: Whether the run resumes an earlier one
+        results: Results of the phases finished before this one started
+        on_message: Progress hook to hand to agent requests, if any
+    """
+
+    def __init__(
+        self,
+        adw_id: str,
+        inputs: Dict[str, Any],
+        model: str,
+        working_dir: str,
+        resume: bool,
+        results: Dict[str, PhaseResult],
+        on_message: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ):
+        self.adw_id = adw_id
+        self.inputs = inputs
+        self.model = model
+        self.working_dir = working_dir
+        self.resume = resume
+        self.results = results
+        self.on_message = on_message
+
+    def output(self, phase: str, key: str, default: Any = None) -> Any:
+        """A named output of an earlier phase."""
+        result = self.results.get(phase)
+        return result.outputs.get(key, default) if result else default
+
+    def first_error(self) -> Optional[str]:
+        """Error of the first earlier phase that failed, if any."""
+        for result in self.results.values():
+            if not result.success and result.error:
+                return result.error
+        return None
+
+
+class Phase:
+    """A node of a pipeline.
+
+    Args:
+        name: Phase name, unique in the pipeline and used as its checkpoint key
+        run: Runs the phase; exceptions it raises fail the phase
+        title: Display name (default: the capitalized name)
+        agent_name: Agent whose output directory receives the phase summary
+        depends_on: Phases that must finish first
+        run_always: Run even when a dependency failed
+        describe: Rows for the phase's inputs panel
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[PhaseContext], PhaseResult],
+        title: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        depends_on: Optional[List[str]] = None,
+        run_always: bool = False,
+        describe: Optional[Callable[[PhaseContext], Dict[str, str]]] = None,
+    ):
+        self.name = name
+        self.run = run
+        self.title = title or name.capitalize()
+        self.agent_name = agent_name
+        self.depends_on = depends_on or []
+        self.run_always = run_always
+        self.describe = describe
+
+
+def template_phase(
+    name: str,
+    slash_command: str,
+    agent_name: str,
+    args: Callable[[PhaseContext], List[str]],
+    title: Optional[str] = None,
+    depends_on: Optional[List[str]] = None,
+    outputs: Optional[Callable[[PhaseContext, AgentPromptResponse], Dict[str, Any]]] = None,
+    model: Optional[str] = None,
+    resume_on_retry: bool = False,
+    session_from: Optional[str] = None,
+    fork_session: bool = False,
+    timeout_seconds: Optional[int] = None,
+    idle_timeout_seconds: Optional[int] = None,
+) -> Phase:
+    """A phase that runs a slash command through execute_template.
+
+    Args:
+        name: Phase name
+        slash_command: Slash command to run, e.g. /plan
+        agent_name: Agent running the command
+        args: Builds the command's arguments from the context
+        title: Display name
+        depends_on: Phases that must finish first
+        outputs: Extracts named outputs from a successful response; a
+            ValueError it raises fails the phase with that message
+        model: Claude model (default: the run's model)
+        resume_on_retry: Resume the failed session on retry instead of replaying
+        session_from: Start from this phase's session, so the context it built
+            up (files read, searches made) carries over; implies depends_on
+        fork_session: Branch a new session from session_from's instead of
+            appending to it (required when several phases share one source)
+        timeout_seconds: Wall-clock limit for the agent (None = module default, 0 = none)
+        idle_timeout_seconds: Limit on seconds without agent output (None = module default, 0 = none)
+    """
+    title = title or name.capitalize()
+    depends_on = list(depends_on or [])
+    if session_from and session_from not in depends_on:
+        depends_on.append(session_from)
+
+    def describe(ctx: PhaseContext) -> Dict[str, str]:
+        return {
+            "Command": slash_command,
+            "Args": " ".join(args(ctx)),
+            "Model": model or ctx.model,
+            "Agent": agent_name,
+            **({"Session": f"{'fork' if fork_session else 'continue'} {session_from}"} if session_from else {}),
+        }
+
+    def run(ctx: PhaseContext) -> PhaseResult:
+        source = ctx.results.get(session_from) if session_from else None
+        tool_calls: Dict[str, int] = {}
+
+        def on_message(message: Dict[str, Any]) -> None:
+            for kind, payload in get_message_events(message):
+                if kind == "tool_use":
+                    tool = payload.get("name", "tool")
+                    tool_calls[tool] = tool_calls.get(tool, 0) + 1
+            if ctx.on_message:
+                ctx.on_message(message)
+
+        request = AgentTemplateRequest(
+            agent_name=agent_name,
+            slash_command=slash_command,
+            args=args(ctx),
+            adw_id=ctx.adw_id,
+            model=model or ctx.model,
+            working_dir=ctx.working_dir,
+            resume_session_id=source.session_id if source else None,
+            fork_session=fork_session,
+            resume_on_retry=resume_on_retry,
+            timeout_seconds=timeout_seconds,
+            idle_timeout_seconds=idle_timeout_seconds,
+            on_message=on_message,
+        )
+        response = execute_template(request)
+
+        result = PhaseResult(
+            phase=name,
+            success=response.success,
+            slash_command=slash_command,
+            args=request.args,
+            session_id=response.session_id,
+            output=response.output,
+            attempts=response.attempts,
+            retry_code=response.retry_code.value,
+            num_turns=response.num_turns,
+            usage=response.usage,
+            total_cost_usd=response.total_cost_usd,
+            tool_calls=tool_calls,
+        )
+        if request.resume_session_id:
+            result.session_source = session_from
+            result.session_mode = "fork" if fork_session else "continue"
+        if not response.success:
+            result.error = f"{title} phase failed"
+        elif outputs:
+            try:
+                result.outputs = outputs(ctx, response)
+            except ValueError as e:
+                result.success = False
+                result.error = str(e)
+        return result
+
+    return Phase(
+        name,
+        run,
+        title=title,
+        agent_name=agent_name,
+        depends_on=depends_on,
+        describe=describe,
+    )
+
+
+def update_task_phase(
+    agent_name: str,
+    depends_on: List[str],
+    name: str = "update",
+) -> Phase:
+    """A phase that marks the task in tasks.md with the run's outcome (no agent call).
+
+    Runs even when its dependencies failed: the task is marked
+    [✅ <commit_hash>, <adw_id>] when they all succeeded with a commit hash,
+    and [❌, <adw_id>] with the first phase error otherwise. Reads
+    worktree_name, task and task_file from the workflow inputs.
+    """
+
+    def run(ctx: PhaseContext) -> PhaseResult:
+        task_file = ctx.inputs["task_file"]
+        worktree_name = ctx.inputs["worktree_name"]
+        task = ctx.inputs["task"]
+        commit_hash = next(
+            (result.outputs["commit_hash"] for result in ctx.results.values() if result.outputs.get("commit_hash")),
+            None,
+        )
+        error_message = ctx.first_error()
+        succeeded = all(ctx.results[dependency].success for dependency in depends_on)
+        update_status = "success" if succeeded and commit_hash else "failed"
+
+        if ctx.resume:
+            # An earlier run may have marked the task failed; take it back to in-progress
+            try:
+                mark_task_resumed(task_file, worktree_name, ctx.adw_id)
+            except (ValueError, OSError):
+                pass
+
+        # Rewrite the task's status marker in place (locked, atomic write)
+        if update_status == "success":
+            mark_task_completed(task_file, worktree_name, task, ctx.adw_id, commit_hash)
+        else:
+            mark_task_failed(
+                task_file,
+                worktree_name,
+                task,
+                ctx.adw_id,
+                error_message or "No commit hash found",
+            )
+        return PhaseResult(
+            phase=name,
+            success=True,
+            output=f"Task marked as {update_status} in {task_file}",
+            outputs={"final_task_status": update_status, "commit_hash": commit_hash},
+        )
+
+    def describe(ctx: PhaseContext) -> Dict[str, str]:
+        return {
+            "Command": "native status update",
+            "Task File": ctx.inputs["task_file"],
+            "Agent": agent_name,
+        }
+
+    return Phase(
+        name,
+        run,
+        title="Update Task",
+        agent_name=agent_name,
+        depends_on=depends_on,
+        run_always=True,
+        describe=describe,
+    )
+
+
+def count_tokens(usage: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Input, cache and output tokens of a Claude Code usage report."""
+    if not usage:
+        return None
+    return sum(
+        usage.get(key) or 0
+        for key in (
+            "input_tokens",
+            "cache_creation_input_tokens",
+            "cache_read_input_tokens",
+            "output_tokens",
+        )
+    )
+
+
+def phase_metrics(result: PhaseResult) -> Dict[str, Any]:
+    """Turn, token, tool and timing figures of a phase, for its summary."""
+    return {
+        "num_turns": result.num_turns,
+        "total_tokens": count_tokens(result.usage),
+        "usage": result.usage,
+        "total_cost_usd": result.total_cost_usd,
+        "duration_seconds": result.duration_seconds,
+        "tool_calls": result.tool_calls,
+        "exploration_tool_calls": sum(result.tool_calls.get(tool, 0) for tool in EXPLORATION_TOOLS),
+    }
+
+
+def compare_metrics(result: PhaseResult, source: PhaseResult) -> Dict[str, Any]:
+    """Differences in turns, tokens, duration and exploration from the source phase."""
+    current, baseline = phase_metrics(result), phase_metrics(source)
+    differences = {}
+    for key in ("num_turns", "total_tokens", "duration_seconds", "exploration_tool_calls"):
+        if current[key] is not None and baseline[key] is not None:
+            differences[key] = round(current[key] - baseline[key], 3)
+    return differences
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable phase duration."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s"
+
+
+class Pipeline:
+    """A workflow declared as a DAG of phases.
+
+    Usage:
+        pipeline = Pipeline("build_update_task", [build_phase, update_phase])
+        result = pipeline.run(checkpoint, model="sonnet", working_dir=worktree_path)
+        sys.exit(0 if result.success else 1)
+    """
+
+    def __init__(self, workflow: str, phases: List[Phase]):
+        self.workflow = workflow
+        self.phases = phases
+        self._validate()
+
+    def _validate(self) -> None:
+        """Check that names are unique, dependencies exist and there are no cycles.
+
+        Raises:
+            PipelineError: If the phases don't form a DAG
+        """
+        names = [phase.name for phase in self.phases]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise PipelineError(f"Duplicate phase names: {', '.join(duplicates)}")
+
+        for phase in self.phases:
+            unknown = [dependency for dependency in phase.depends_on if dependency not in names]
+            if unknown:
+                raise PipelineError(
+                    f"Phase {phase.name} depends on unknown phases: {', '.join(unknown)}"
+                )
+
+        # Kahn's algorithm: whatever can never become ready is on a cycle
+        ordered = set()
+        while len(ordered) < len(self.phases):
+            ready = [
+                phase.name
+                for phase in self.phases
+                if phase.name not in ordered and all(dependency in ordered for dependency in phase.depends_on)
+            ]
+            if not ready:
+                cycle = [phase.name for phase in self.phases if phase.name not in ordered]
+                raise PipelineError(f"Phase dependencies form a cycle: {', '.join(cycle)}")
+            ordered.update(ready)
+
+    def run(
+        self,
+        checkpoint: WorkflowCheckpoint,
+        model: str,
+        working_dir: str,
+        resume: bool = False,
+        console: Optional[Console] = None,
+        label: Optional[str] = None,
+        verbose: bool = False,
+        live: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> PipelineResult:
+        """Run the phases, recording each one as it finishes.
+
+        Args:
+            checkpoint: The run's checkpoint; its inputs are the workflow inputs
+            model: Default Claude model for template phases
+            working_dir: Directory agents work in
+            resume: Restore phases completed in the checkpoint instead of running them
+            console: Console for status output (default: a new one)
+            label: Context shown in panel titles, e.g. the worktree name
+            verbose: Show full phase output in success panels
+            live: Show agent progress on a console status line
+            max_workers: Phases run at once (default: as many as are ready)
+
+        Returns:
+            The result of every phase, with per-phase timing
+        """
+        console = console or Console()
+        run = _PipelineRun(self, checkpoint, model, working_dir, resume, console, label or self.workflow, verbose)
+
+        if live:
+            with console.status(f"[bold yellow]Running {self.workflow}...[/bold yellow]") as status:
+                run.status = status
+                result = run.execute(max_workers)
+        else:
+            result = run.execute(max_workers)
+
+        run.print_summary(result)
+        return result
+
+
+class _PipelineRun:
+    """State of one Pipeline.run() call."""
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        checkpoint: WorkflowCheckpoint,
+        model: str,
+        working_dir: str,
+        resume: bool,
+        console: Console,
+        label: str,
+        verbose: bool,
+    ):
+        self.pipeline = pipeline
+        self.checkpoint = checkpoint
+        self.adw_id = checkpoint.adw_id
+        self.model = model
+        self.working_dir = working_dir
+        self.resume = resume
+        self.console = console
+        self.label = label
+        self.verbose = verbose
+        self.status = None
+        self.results: Dict[str, PhaseResult] = {}
+        # Set when the run is interrupted; phases that haven't started yet don't
+        self.cancelled = threading.Event()
+        # Phases finish on worker threads; checkpoint writes must not interleave
+        self._checkpoint_lock = threading.Lock()
+
+    def execute(self, max_workers: Optional[int]) -> PipelineResult:
+        """Schedule phases as their dependencies finish."""
+        started_at = time.perf_counter()
+        pending = {phase.name: phase for phase in self.pipeline.phases}
+        running = {}
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or len(pending) or 1)
+        try:
+            while pending or running:
+                for phase in self._take_ready(pending):
+                    settled = self._settle_without_running(phase)
+                    if settled:
+                        self.results[phase.name] = settled
+                        continue
+                    self.announce(phase)
+                    running[executor.submit(self.run_phase, phase, self.context(phase))] = phase
+
+                if not running:
+                    # Restored or skipped phases may have made others ready
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    phase = running.pop(future)
+                    result = future.result()
+                    self.results[phase.name] = result
+                    self.persist(phase, result)
+                    self.report(phase, result)
+        except BaseException:
+            self.cancel(executor)
+            raise
+        executor.shutdown()
+
+        result = PipelineResult(
+            workflow=self.pipeline.workflow,
+            adw_id=self.adw_id,
+            results=self.results,
+            duration_seconds=round(time.perf_counter() - started_at, 3),
+        )
+        result.summary_path = self.write_workflow_summary(result)
+        return result
+
+    def cancel(self, executor: ThreadPoolExecutor) -> None:
+        """Stop the run after Ctrl+C (or any error) in the scheduling thread.
+
+        The agents run in their own sessions, so the terminal's SIGINT never
+        reaches them, and waiting on the executor would block until every
+        running phase finished. Kill their process groups instead, keep
+        queued phases from starting, and leave without waiting.
+        """
+        self.cancelled.set()
+        stopped = cancel_agents()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if stopped:
+            self.console.print(f"[yellow]Interrupted: stopped {stopped} running agent(s)[/yellow]")
+
+    def _take_ready(self, pending: Dict[str, Phase]) -> List[Phase]:
+        """Remove and return the pending phases whose dependencies have all finished."""
+        ready = [
+            phase
+            for phase in pending.values()
+            if all(dependency in self.results for dependency in phase.depends_on)
+        ]
+        for phase in ready:
+            del pending[phase.name]
+        return ready
+
+    def _settle_without_running(self, phase: Phase) -> Optional[PhaseResult]:
+        """Restore the phase from the checkpoint, or skip it after a failed dependency."""
+        dependencies = [self.results[dependency] for dependency in phase.depends_on]
+
+        # Completed phases are restored only up to the first one that has to run again
+        completed = self.checkpoint.completed_phase(phase.name) if self.resume else None
+        if completed and all(dependency.resumed for dependency in dependencies):
+            outputs = {
+                key: value
+                for key, value in (("plan_path", completed.plan_path), ("commit_hash", completed.commit_hash))
+                if value
+            }
+            outputs.update(completed.outputs)
+            print_status_panel(
+                self.console, f"Skipped {phase.title.lower()} (checkpoint)", self.adw_id, self.label, phase.name, "success"
+            )
+            return PhaseResult(
+                phase=phase.name,
+                success=True,
+                resumed=True,
+                agent_name=completed.agent_name,
+                session_id=completed.session_id,
+                output=f"Resumed from checkpoint ({phase.name} completed {completed.finished_at:%Y-%m-%d %H:%M:%S})",
+                outputs=outputs,
+                duration_seconds=completed.duration_seconds or 0.0,
+            )
+
+        failed = [dependency.phase for dependency in dependencies if not dependency.success]
+        if failed and not phase.run_always:
+            self.console.print(
+                Panel(
+                    f"[yellow]⏭️  Skipping {phase.title.lower()}: {', '.join(failed)} failed[/yellow]",
+                    title=f"[bold yellow]{phase.title} Skipped | {self.adw_id} | {self.label}[/bold yellow]",
+                    border_style="yellow",
+                )
+            )
+            return PhaseResult(
+                phase=phase.name,
+                success=False,
+                skipped=True,
+                agent_name=phase.agent_name,
+            )
+        return None
+
+    def context(self, phase: Phase) -> PhaseContext:
+        """Context for a phase about to run, with a snapshot of the results so far."""
+        on_message = make_status_hook(self.status, f"{phase.title}...") if self.status else None
+        return PhaseContext(
+            adw_id=self.adw_id,
+            inputs=self.checkpoint.inputs,
+            model=self.model,
+            working_dir=self.working_dir,
+            resume=self.resume,
+            results=dict(self.results),
+            on_message=on_message,
+        )
+
+    def run_phase(self, phase: Phase, ctx: PhaseContext) -> PhaseResult:
+        """Run a phase on a worker thread, timing it and turning exceptions into failures."""
+        started_at = datetime.now()
+        started = time.perf_counter()
+        if self.cancelled.is_set():
+            return PhaseResult(
+                phase=phase.name,
+                success=False,
+                agent_name=phase.agent_name,
+                error=f"{phase.title} phase cancelled",
+            )
+        try:
+            result = phase.run(ctx)
+        except Exception as e:
+            result = PhaseResult(
+                phase=phase.name,
+                success=False,
+                output=f"{phase.title} raised: {e}",
+                error=f"{phase.title} phase failed: {e}",
+            )
+        result.phase = phase.name
+        result.agent_name = result.agent_name or phase.agent_name
+        result.started_at = started_at
+        result.duration_seconds = round(time.perf_counter() - started, 3)
+        return result
+
+    def announce(self, phase: Phase) -> None:
+        """Print a phase's inputs and start message."""
+        self.console.print(Rule(f"[bold yellow]{phase.title} ({phase.name})[/bold yellow]"))
+        if phase.describe:
+            info_table = Table(show_header=False, box=None, padding=(0, 1))
+            info_table.add_column(style="bold cyan")
+            info_table.add_column()
+            info_table.add_row("ADW ID", self.adw_id)
+            info_table.add_row("Phase", phase.title)
+            for key, value in phase.describe(self.context(phase)).items():
+                info_table.add_row(key, value)
+            self.console.print(
+                Panel(
+                    info_table,
+                    title=f"[bold blue]🚀 {phase.title} Inputs | {self.adw_id} | {self.label}[/bold blue]",
+                    border_style="blue",
+                )
+            )
+        print_status_panel(self.console, f"Starting {phase.title.lower()}", self.adw_id, self.label, phase.name)
+
+    def report(self, phase: Phase, result: PhaseResult) -> None:
+        """Print a finished phase's outcome."""
+        duration = format_duration(result.duration_seconds)
+        if result.success:
+            print_status_panel(
+                self.console, f"Completed {phase.title.lower()} in {duration}", self.adw_id, self.label, phase.name, "success"
+            )
+            self.console.print(
+                Panel(
+                    result.output if self.verbose else f"{phase.title} completed successfully",
+                    title=f"[bold green]✅ {phase.title} Success | {self.adw_id} | {self.label}[/bold green]",
+                    border_style="green",
+                    padding=(1, 2),
+                )
+            )
+        else:
+            print_status_panel(
+                self.console, f"Failed {phase.title.lower()} after {duration}", self.adw_id, self.label, phase.name, "error"
+            )
+            body = result.output
+            if result.error and result.error not in body:
+                body = f"{body}\n\n[bold red]{result.error}[/bold red]" if body else f"[bold red]{result.error}[/bold red]"
+            self.console.print(
+                Panel(
+                    body,
+                    title=f"[bold red]❌ {phase.title} Failed | {self.adw_id} | {self.label}[/bold red]",
+                    border_style="red",
+                    padding=(1, 2),
+                )
+            )
+
+    def output_dir(self, agent_name: str) -> str:
+        """An agent's output directory, relative to the project root (for display)."""
+        return f"./agents/{self.adw_id}/{agent_name}"
+
+    def run_path(self, *parts: str) -> str:
+        """Absolute path under the run's agents/<adw_id>/ directory."""
+        return os.path.join(AGENTS_DIR, self.adw_id, *parts)
+
+    def persist(self, phase: Phase, result: PhaseResult) -> None:
+        """Write the phase summary and record the phase in the checkpoint."""
+        if result.agent_name:
+            output_dir = self.run_path(result.agent_name)
+            os.makedirs(output_dir, exist_ok=True)
+            with open(os.path.join(output_dir, SUMMARY_JSON), "w") as f:
+                json.dump(
+                    {
+                        "phase": phase.name,
+                        "workflow": self.pipeline.workflow,
+                        "adw_id": self.adw_id,
+                        **self.checkpoint.inputs,
+                        "slash_command": result.slash_command,
+                        "args": result.args,
+                        "model": self.model,
+                        "working_dir": self.working_dir,
+                        "success": result.success,
+                        "session_id": result.session_id,
+                        "attempts": result.attempts,
+                        "retry_code": result.retry_code,
+                        "output": result.output,
+                        "error": result.error,
+                        **result.outputs,
+                        "started_at": result.started_at.isoformat() if result.started_at else None,
+                        "duration_seconds": result.duration_seconds,
+                        "metrics": phase_metrics(result),
+                        **self.session_report(result),
+                    },
+                    f,
+                    indent=2,
+                )
+
+        with self._checkpoint_lock:
+            record_phase(
+                self.checkpoint,
+                PhaseCheckpoint(
+                    phase=phase.name,
+                    status="completed" if result.success else "failed",
+                    agent_name=result.agent_name,
+                    session_id=result.session_id,
+                    plan_path=result.outputs.get("plan_path"),
+                    commit_hash=result.outputs.get("commit_hash"),
+                    outputs=result.outputs,
+                    error=result.error,
+                    duration_seconds=result.duration_seconds,
+                ),
+            )
+
+    def session_report(self, result: PhaseResult) -> Dict[str, Any]:
+        """Where a phase's session came from, and how the phase compares to its source."""
+        source = self.results.get(result.session_source) if result.session_source else None
+        if source is None:
+            return {}
+        return {
+            "session": {
+                "mode": result.session_mode,
+                "source_phase": source.phase,
+                "source_session_id": source.session_id,
+            },
+            "compared_to_source": compare_metrics(result, source),
+        }
+
+    def write_workflow_summary(self, result: PipelineResult) -> str:
+        """Write agents/<adw_id>/workflow_summary.json and return its path."""
+        outputs: Dict[str, Any] = {}
+        phases: Dict[str, Any] = {}
+        for phase in self.pipeline.phases:
+            phase_result = result.results[phase.name]
+            outputs.update({key: value for key, value in phase_result.outputs.items() if value is not None})
+            phases[phase.name] = {
+                "success": phase_result.success,
+                "skipped": phase_result.skipped,
+                "resumed": phase_result.resumed,
+                "session_id": phase_result.session_id,
+                "agent": phase_result.agent_name,
+                "output_dir": f"{self.output_dir(phase_result.agent_name)}/" if phase_result.agent_name else None,
+                "error": phase_result.error,
+                "session_mode": phase_result.session_mode,
+                "num_turns": phase_result.num_turns,
+                "total_tokens": count_tokens(phase_result.usage),
+                "started_at": phase_result.started_at.isoformat() if phase_result.started_at else None,
+                "duration_seconds": phase_result.duration_seconds,
+            }
+
+        summary_file = self.run_path(WORKFLOW_SUMMARY_JSON)
+        os.makedirs(os.path.dirname(summary_file), exist_ok=True)
+        with open(summary_file, "w") as f:
+            json.dump(
+                {
+                    "workflow": self.pipeline.workflow,
+                    "adw_id": self.adw_id,
+                    **self.checkpoint.inputs,
+                    "model": self.model,
+                    "working_dir": self.working_dir,
+                    **outputs,
+                    "phases": phases,
+                    "overall_success": result.success,
+                    "duration_seconds": result.duration_seconds,
+                },
+                f,
+                indent=2,
+            )
+        return f"./agents/{self.adw_id}/{WORKFLOW_SUMMARY_JSON}"
+
+    def print_summary(self, result: PipelineResult) -> None:
+        """Print the per-phase status and timing table."""
+        self.console.print()
+        self.console.print(Rule("[bold blue]Workflow Summary[/bold blue]"))
+        self.console.print()
+
+        summary_table = Table(show_header=True, box=None)
+        summary_table.add_column("Phase", style="bold cyan")
+        summary_table.add_column("Status", style="bold")
+        summary_table.add_column("Duration", justify="right")
+        summary_table.add_column("Turns", justify="right")
+        summary_table.add_column("Tokens", justify="right")
+        summary_table.add_column("Output Directory", style="dim")
+
+        for phase in self.pipeline.phases:
+            phase_result = result.results[phase.name]
+            if phase_result.skipped:
+                status = "⏭️ Skipped (dependency failed)"
+            elif phase_result.resumed:
+                status = "⏭️ Skipped (checkpoint)"
+            else:
+                status = "✅ Success" if phase_result.success else "❌ Failed"
+            summary_table.add_row(
+                f"{phase.title} ({phase.name})",
+                status,
+                "-" if phase_result.skipped or phase_result.resumed else format_duration(phase_result.duration_seconds),
+                "-" if phase_result.num_turns is None else str(phase_result.num_turns),
+                "-" if not phase_result.usage else f"{count_tokens(phase_result.usage):,}",
+                f"{self.output_dir(phase_result.agent_name)}/" if phase_result.agent_name and not phase_result.skipped else "-",
+            )
+        summary_table.add_row("Total", "", format_duration(result.duration_seconds), "", "", "")
+
+        self.console.print(summary_table)
+        self.console.print(f"\n[bold cyan]Workflow summary:[/bold cyan] {result.summary_path}")
+        self.console.print()
@@ -0,0 +1,229 @@
+"""
+Content-addressed result cache for read-only slash commands.
+
+A cached execute_template() call is keyed by its slash command, args, model,
+the contents of the input files it declares and the command template it
+runs, so a poll that re-runs /process_tasks over an unchanged tasks.md gets
+the stored response instead of a new Claude Code run. Editing any declared
+input or the template changes the key.
+
+Entries live under agents/.cache as one JSON file per key. They expire after
+a TTL (ADW_CACHE_TTL_SECONDS), and once the cache outgrows
+ADW_CACHE_MAX_BYTES the least recently used entries are evicted. Hit, miss
+and eviction counters are shared by every ADW process on the host.
+Only commands known to be read-only (READ_ONLY_COMMANDS) are ever cached.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.path.join(PROJECT_ROOT, "agents", ".cache")
+STATS_FILE = "stats.json"
+
+# Commands that only read the repository. Anything else (editing files,
+# committing, creating worktrees, updating tasks) always runs uncached.
+READ_ONLY_COMMANDS = frozenset(
+    {
+        "/process_tasks",
+    }
+)
+
+
+def get_cache_settings() -> Dict[str, int]:
+    """TTL and size limit of the cache from the environment."""
+    return {
+        "ttl_seconds": int(os.getenv("ADW_CACHE_TTL_SECONDS", "600")),
+        "max_bytes": int(os.getenv("ADW_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+    }
+
+
+def is_cacheable(slash_command: str) -> bool:
+    """Whether a command's results may be cached (it is known to be read-only)."""
+    return slash_command in READ_ONLY_COMMANDS
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's contents, or "missing" if it doesn't exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def get_template_path(slash_command: str, working_dir: Optional[str] = None) -> str:
+    """The .claude/commands/<name>.md file a slash command runs.
+
+    Claude Code looks in the working directory first, so a worktree's own
+    copy of a command wins over the project root's.
+    """
+    relative_path = os.path.join(".claude", "commands", f"{slash_command.lstrip('/')}.md")
+    for root in (working_dir, PROJECT_ROOT):
+        if root and os.path.exists(os.path.join(root, relative_path)):
+            return os.path.join(root, relative_path)
+    return os.path.join(working_dir or PROJECT_ROOT, relative_path)
+
+
+def build_cache_key(
+    slash_command: str,
+    args: List[str],
+    model: str,
+    input_files: List[str],
+    working_dir: Optional[str] = None,
+) -> str:
+    """The content-addressed key of a template execution.
+
+    Args:
+        slash_command: Command to run, e.g. "/process_tasks"
+        args: Command arguments
+        model: Model the command runs on
+        input_files: Files the result depends on; relative paths are
+            resolved against working_dir
+        working_dir: Directory the command runs in
+
+    Returns:
+        Hex SHA-256 over the command, args, model, input file hashes and
+        command template hash
+    """
+    base_dir = working_dir or os.getcwd()
+    inputs = {
+        path: hash_file(os.path.join(base_dir, path)) for path in sorted(input_files)
+    }
+    material = {
+        "slash_command": slash_command,
+        "args": args,
+        "model": model,
+        "inputs": inputs,
+        "template": hash_file(get_template_path(slash_command, working_dir)),
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """Responses stored on disk by cache key, with TTL and LRU size eviction.
+
+    Usage:
+        cache = ResultCache()
+        response = cache.get(key)
+        if response is None:
+            response = run()
+            cache.put(key, response)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        ttl_seconds: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        settings = get_cache_settings()
+        self.cache_dir = cache_dir
+        self.ttl_seconds = settings["ttl_seconds"] if ttl_seconds is None else ttl_seconds
+        self.max_bytes = settings["max_bytes"] if max_bytes is None else max_bytes
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _update_stats(self, **increments: int) -> Dict[str, int]:
+        """Add to the shared counters under a file lock and return them."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stats_path = os.path.join(self.cache_dir, STATS_FILE)
+        with open(f"{stats_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(stats_path, "r") as f:
+                        stats = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    stats = {}
+                for name in ("hits", "misses", "expired", "evicted"):
+                    stats[name] = stats.get(name, 0) + increments.get(name, 0)
+                if increments:
+                    temp_path = f"{stats_path}.{os.getpid()}.tmp"
+                    with open(temp_path, "w") as f:
+                        json.dump(stats, f)
+                    os.replace(temp_path, stats_path)
+                return stats
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, int]:
+        """Host-wide hit, miss, expiry and eviction counts."""
+        return self._update_stats()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored response for a key, or None on a miss or expired entry."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._update_stats(misses=1)
+            return None
+
+        if self.ttl_seconds and time.time() - entry.get("created_at", 0) >= self.ttl_seconds:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._update_stats(misses=1, expired=1)
+            return None
+
+        # The entry's mtime is its last use, which eviction orders by
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self._update_stats(hits=1)
+        return entry["response"]
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response and evict old entries if the cache is over its size limit."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"created_at": time.time(), "response": response}, f)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json") or name == STATS_FILE:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total_bytes = sum(size for _mtime, size, _name in entries)
+        evicted = 0
+        for _mtime, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            evicted += 1
+
+        if evicted:
+            self._update_stats(evicted=evicted)
+        return evicted
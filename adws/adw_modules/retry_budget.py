@@ -0,0 +1,167 @@
+"""
+Host-wide retry budget and circuit breaker for Claude Code executions.
+
+Every ADW process on the host records attempt outcomes in a small JSON state
+file under agents/, guarded by a file lock. Retries draw from a shared budget
+(a fraction of recent requests), and once the recent failure rate crosses a
+threshold the circuit opens and all retries pause until the cooldown ends.
+This keeps many concurrent workflows from multiplying load on a degraded API.
+"""
+
+import fcntl
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RETRY_STATE_FILE = os.path.join(PROJECT_ROOT, "agents", ".retry_budget.json")
+
+# Exponential backoff: BACKOFF_BASE_SECONDS * 2^(retry - 1), capped
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# Upper bound on recorded events so the state file stays small
+MAX_EVENTS = 1000
+
+
+def get_retry_settings() -> Dict[str, Any]:
+    """Budget and circuit breaker settings from the environment.
+
+    Read on each call rather than at import, so values from .env apply
+    once it has been loaded.
+
+    Returns:
+        window_seconds: Sliding window over which outcomes are counted
+        budget_ratio, budget_min: Retries allowed per window are
+            budget_ratio * requests + budget_min
+        failure_rate, min_samples: The circuit opens when at least
+            min_samples attempts in the window failed at this rate or more
+        cooldown_seconds: How long an open circuit pauses retries
+    """
+    return {
+        "window_seconds": int(os.getenv("ADW_RETRY_WINDOW_SECONDS", "300")),
+        "budget_ratio": float(os.getenv("ADW_RETRY_BUDGET_RATIO", "0.2")),
+        "budget_min": int(os.getenv("ADW_RETRY_BUDGET_MIN", "5")),
+        "failure_rate": float(os.getenv("ADW_CIRCUIT_FAILURE_RATE", "0.5")),
+        "min_samples": int(os.getenv("ADW_CIRCUIT_MIN_SAMPLES", "6")),
+        "cooldown_seconds": int(os.getenv("ADW_CIRCUIT_COOLDOWN_SECONDS", "60")),
+    }
+
+
+def get_backoff_delay(retry_number: int) -> float:
+    """Exponential backoff with equal jitter for the given retry (1-based).
+
+    Half of the delay is fixed and half is random, so concurrent clients
+    spread out without any of them retrying immediately.
+    """
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (retry_number - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+@contextmanager
+def locked_state(state_file: str = RETRY_STATE_FILE) -> Iterator[Dict[str, Any]]:
+    """Load the shared state under an exclusive lock and save it on exit."""
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    with open(f"{state_file}.lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            try:
+                with open(state_file, "r") as f:
+                    state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                state = {}
+
+            state.setdefault("events", [])
+            state.setdefault("retries", [])
+            state.setdefault("open_until", 0.0)
+            yield state
+
+            temp_file = f"{state_file}.{os.getpid()}.tmp"
+            with open(temp_file, "w") as f:
+                json.dump(state, f)
+            os.replace(temp_file, state_file)
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def prune_events(events: List[Dict[str, Any]], now: float, window_seconds: int) -> List[Dict[str, Any]]:
+    """Drop events that fell out of the window."""
+    cutoff = now - window_seconds
+    return [event for event in events if event["t"] >= cutoff][-MAX_EVENTS:]
+
+
+def prune_state(state: Dict[str, Any], now: float, window_seconds: int) -> None:
+    """Drop outcomes and retry grants that fell out of the window."""
+    state["events"] = prune_events(state["events"], now, window_seconds)
+    cutoff = now - window_seconds
+    state["retries"] = [t for t in state["retries"] if t >= cutoff][-MAX_EVENTS:]
+
+
+def record_attempt(
+    success: bool, is_retry: bool, state_file: str = RETRY_STATE_FILE
+) -> None:
+    """Record the outcome of one attempt and open the circuit if needed.
+
+    Args:
+        success: False only for transient (retryable) failures
+        is_retry: Whether the attempt was a retry rather than a first try
+        state_file: Shared state file path
+    """
+    settings = get_retry_settings()
+    now = time.time()
+    with locked_state(state_file) as state:
+        prune_state(state, now, settings["window_seconds"])
+        events = state["events"]
+        events.append({"t": now, "ok": success, "retry": is_retry})
+
+        failures = sum(1 for event in events if not event["ok"])
+        if (
+            len(events) >= settings["min_samples"]
+            and failures / len(events) >= settings["failure_rate"]
+            and state["open_until"] <= now
+        ):
+            state["open_until"] = now + settings["cooldown_seconds"]
+
+
+def acquire_retry(state_file: str = RETRY_STATE_FILE) -> Optional[float]:
+    """Take one retry from the shared budget.
+
+    The grant is recorded under the same lock as the budget check, so
+    concurrent processes can't all pass the check before any of them
+    retries and overshoot the budget together.
+
+    Returns:
+        Seconds to pause for an open circuit (0 when closed), or None if the
+        host-wide retry budget is exhausted and the caller should give up
+    """
+    settings = get_retry_settings()
+    now = time.time()
+    with locked_state(state_file) as state:
+        prune_state(state, now, settings["window_seconds"])
+
+        requests = sum(1 for event in state["events"] if not event["retry"])
+        if len(state["retries"]) >= settings["budget_ratio"] * requests + settings["budget_min"]:
+            return None
+
+        state["retries"].append(now)
+        return max(0.0, state["open_until"] - now)
+
+
+def get_retry_budget_status(state_file: str = RETRY_STATE_FILE) -> Dict[str, Any]:
+    """Summarize the shared state for dashboards."""
+    window_seconds = get_retry_settings()["window_seconds"]
+    now = time.time()
+    with locked_state(state_file) as state:
+        prune_state(state, now, window_seconds)
+        events = state["events"]
+        return {
+            "window_seconds": window_seconds,
+            "attempts": len(events),
+            "failures": sum(1 for event in events if not event["ok"]),
+            "retries": len(state["retries"]),
+            "circuit_open_seconds": round(max(0.0, state["open_until"] - now), 1),
+        }
@@ -0,0 +1,503 @@
+"""
+Native parser for the multi-agent task list (tasks.md).
+
+Turns the markdown task list into the Task/Worktree models from data_models.py
+and applies status transitions in place, without starting a Claude Code
+session. The expected format is:
+
+    ## Git Worktree feature-auth
+    [] Add login form                                # Pending
+    [⏰] Wire up OAuth {opus, adw_plan_implement_update_task}  # Blocked
+    [🟡, abc12345] Add logout button                 # In progress
+    [✅ 1a2b3c4d5, abc12345] Add session store       # Completed
+    [❌, abc12345] Add SSO // Failed: tests failed   # Failed
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from data_models import (
+    ProcessTasksResponse,
+    Task,
+    TaskToStart,
+    Worktree,
+    WorktreeTaskGroup,
+)
+
+# "## Git Worktree <name>" starts a new worktree section
+WORKTREE_HEADER_PATTERN = re.compile(r"^##\s+Git Worktree\s+(?P<name>\S+)\s*$")
+
+# Any other markdown header ends the current worktree section
+HEADER_PATTERN = re.compile(r"^#+\s")
+
+# "[<marker>] <description>" with optional indentation or list bullet
+TASK_LINE_PATTERN = re.compile(
+    r"^(?P<prefix>\s*(?:[-*]\s+)?)\[(?P<marker>[^\]]*)\](?P<rest>.*)$"
+)
+
+# Trailing "{tag1, tag2}" block on a task description
+TAGS_PATTERN = re.compile(r"\s*\{(?P<tags>[^{}]*)\}\s*$")
+
+# Failure note appended to failed tasks
+FAILURE_NOTE_SEPARATOR = " // Failed:"
+
+STATUS_EMOJIS = {
+    "⏰": "[⏰]",
+    "🟡": "[🟡]",
+    "✅": "[✅]",
+    "❌": "[❌]",
+}
+
+
+def parse_status_marker(
+    marker: str,
+) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """Parse the contents of a status marker.
+
+    Args:
+        marker: Text between the square brackets, e.g. "🟡, abc12345"
+
+    Returns:
+        Tuple of (status, adw_id, commit_hash), or None if the marker is not
+        a task status marker
+    """
+    marker = marker.strip()
+    if not marker:
+        return "[]", None, None
+
+    emoji = marker[0]
+    status = STATUS_EMOJIS.get(emoji)
+    if not status:
+        return None
+
+    # Strip emoji variation selectors left behind after the status emoji
+    details = marker[1:].replace("\ufe0f", "").strip()
+    parts = [part.strip() for part in details.split(",")]
+    adw_id = None
+    commit_hash = None
+
+    if status == "[✅]":
+        # [✅ <commit_hash>, <adw_id>]
+        commit_hash = parts[0] or None
+        if len(parts) > 1:
+            adw_id = parts[1] or None
+    elif status in ("[🟡]", "[❌]"):
+        # [🟡, <adw_id>] / [❌, <adw_id>]
+        non_empty = [part for part in parts if part]
+        if non_empty:
+            adw_id = non_empty[-1]
+
+    return status, adw_id, commit_hash
+
+
+def split_description_and_tags(text: str) -> Tuple[str, List[str]]:
+    """Split a task line's text into its description and tags.
+
+    Args:
+        text: Task text after the status marker
+
+    Returns:
+        Tuple of (description, tags)
+    """
+    text = text.split(FAILURE_NOTE_SEPARATOR, 1)[0].strip()
+
+    match = TAGS_PATTERN.search(text)
+    if not match:
+        return text, []
+
+    tags = [tag.strip() for tag in match.group("tags").split(",") if tag.strip()]
+    return text[: match.start()].strip(), tags
+
+
+def parse_task_line(line: str, worktree_name: Optional[str] = None) -> Optional[Task]:
+    """Parse a single tasks.md line into a Task.
+
+    Returns:
+        Task if the line is a task line, None otherwise
+    """
+    match = TASK_LINE_PATTERN.match(line)
+    if not match:
+        return None
+
+    parsed = parse_status_marker(match.group("marker"))
+    if not parsed:
+        return None
+
+    status, adw_id, commit_hash = parsed
+    description, tags = split_description_and_tags(match.group("rest"))
+    if not description:
+        return None
+
+    return Task(
+        description=description,
+        status=status,
+        adw_id=adw_id,
+        commit_hash=commit_hash,
+        tags=tags,
+        worktree_name=worktree_name,
+    )
+
+
+def parse_task_list(content: str) -> List[Worktree]:
+    """Parse tasks.md content into worktree sections.
+
+    Args:
+        content: Full text of the task list file
+
+    Returns:
+        Worktrees in file order, each with its tasks in file order
+    """
+    worktrees: List[Worktree] = []
+    current: Optional[Worktree] = None
+
+    for line in content.splitlines():
+        header = WORKTREE_HEADER_PATTERN.match(line)
+        if header:
+            current = Worktree(name=header.group("name"))
+            worktrees.append(current)
+            continue
+
+        if HEADER_PATTERN.match(line):
+            # Any other section ends the current worktree
+            current = None
+            continue
+
+        if current is None:
+            continue
+
+        task = parse_task_line(line, current.name)
+        if task:
+            current.tasks.append(task)
+
+    return worktrees
+
+
+def get_eligible_task_groups(content: str) -> ProcessTasksResponse:
+    """Build the /process_tasks response directly from tasks.md content.
+
+    Applies Worktree.get_eligible_tasks blocking rules, so a [⏰] task is only
+    returned once every task above it in the same worktree is [✅].
+
+    Args:
+        content: Full text of the task list file
+
+    Returns:
+        ProcessTasksResponse containing only worktrees with tasks to start
+    """
+    task_groups = []
+
+    for worktree in parse_task_list(content):
+        tasks_to_start = [
+            TaskToStart(description=task.description, tags=task.tags)
+            for task in worktree.get_eligible_tasks()
+        ]
+        if tasks_to_start:
+            task_groups.append(
+                WorktreeTaskGroup(
+                    worktree_name=worktree.name, tasks_to_start=tasks_to_start
+                )
+            )
+
+    return ProcessTasksResponse(task_groups=task_groups)
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of task list text, used to detect unchanged content."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def split_worktree_sections(content: str) -> List[Tuple[str, str]]:
+    """Split tasks.md content into worktree sections.
+
+    Uses the same section rules as parse_task_list: a worktree header starts
+    a section and any other header ends it.
+
+    Returns:
+        List of (worktree_name, section_text) in file order, where
+        section_text includes the header line
+    """
+    sections: List[Tuple[str, List[str]]] = []
+    current: Optional[List[str]] = None
+
+    for line in content.splitlines():
+        header = WORKTREE_HEADER_PATTERN.match(line)
+        if header:
+            current = [line]
+            sections.append((header.group("name"), current))
+        elif HEADER_PATTERN.match(line):
+            current = None
+        elif current is not None:
+            current.append(line)
+
+    return [(name, "\n".join(lines)) for name, lines in sections]
+
+
+class IncrementalTaskScanner:
+    """Find eligible tasks, re-evaluating only worktree sections that changed.
+
+    Eligibility only depends on the tasks within one worktree section, so the
+    result for each section is cached by the section's content hash. A scan
+    of unchanged content returns the previous response without parsing.
+    """
+
+    def __init__(self):
+        self.content_hash: Optional[str] = None
+        self.sections_evaluated = 0
+        self.sections_reused = 0
+        self._response: Optional[ProcessTasksResponse] = None
+        self._section_tasks: Dict[str, List[TaskToStart]] = {}
+
+    def scan(self, content: str) -> ProcessTasksResponse:
+        """Build the /process_tasks response for content.
+
+        Returns:
+            ProcessTasksResponse containing only worktrees with tasks to start
+        """
+        new_hash = content_hash(content)
+        if new_hash == self.content_hash and self._response is not None:
+            return self._response
+
+        section_tasks: Dict[str, List[TaskToStart]] = {}
+        task_groups = []
+        for worktree_name, section in split_worktree_sections(content):
+            section_hash = content_hash(section)
+            tasks_to_start = self._section_tasks.get(section_hash)
+            if tasks_to_start is None:
+                tasks_to_start = [
+                    TaskToStart(description=group_task.description, tags=group_task.tags)
+                    for group in get_eligible_task_groups(section).task_groups
+                    for group_task in group.tasks_to_start
+                ]
+                self.sections_evaluated += 1
+            else:
+                self.sections_reused += 1
+            section_tasks[section_hash] = tasks_to_start
+
+            if tasks_to_start:
+                task_groups.append(
+                    WorktreeTaskGroup(
+                        worktree_name=worktree_name,
+                        tasks_to_start=list(tasks_to_start),
+                    )
+                )
+
+        # Keep only the sections present in the current content
+        self._section_tasks = section_tasks
+        self.content_hash = new_hash
+        self._response = ProcessTasksResponse(task_groups=task_groups)
+        return self._response
+
+
+@contextmanager
+def locked_task_file(file_path: str) -> Iterator[None]:
+    """Hold an exclusive lock on the task list for the duration of the block.
+
+    The lock is taken on a sidecar "<file>.lock" file so that the task list
+    itself can be replaced atomically while the lock is held.
+    """
+    lock_path = f"{file_path}.lock"
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def write_file_atomic(file_path: str, content: str) -> None:
+    """Write content to file_path via a temp file and rename.
+
+    Readers see either the old or the new content, never a partial write.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+        os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def find_task_line(
+    lines: List[str],
+    worktree_name: str,
+    allowed_statuses: List[str],
+    task_description: Optional[str] = None,
+    adw_id: Optional[str] = None,
+) -> Optional[int]:
+    """Find the index of a task line within a worktree section.
+
+    A task matches on adw_id when given, otherwise on description. When both
+    are given, an adw_id match is preferred and description is the fallback.
+
+    Returns:
+        Index into lines, or None if no matching task was found
+    """
+    description_match = None
+    in_worktree = False
+
+    for index, line in enumerate(lines):
+        header = WORKTREE_HEADER_PATTERN.match(line.rstrip("\r\n"))
+        if header:
+            in_worktree = header.group("name") == worktree_name
+            continue
+        if HEADER_PATTERN.match(line):
+            in_worktree = False
+            continue
+        if not in_worktree:
+            continue
+
+        task = parse_task_line(line.rstrip("\r\n"), worktree_name)
+        if not task or task.status not in allowed_statuses:
+            continue
+
+        if adw_id and task.adw_id == adw_id:
+            return index
+        if (
+            description_match is None
+            and task_description
+            and task.description == task_description.strip()
+        ):
+            description_match = index
+
+    return description_match
+
+
+def format_status_marker(
+    status: str, adw_id: Optional[str] = None, commit_hash: Optional[str] = None
+) -> str:
+    """Render a status marker, e.g. "[🟡, abc12345]" or "[✅ 1a2b3c4, abc12345]"."""
+    emoji = status[1:-1]
+    if status == "[✅]":
+        details = ", ".join(part for part in [commit_hash, adw_id] if part)
+        return f"[{emoji} {details}]" if details else status
+    if status in ("[🟡]", "[❌]") and adw_id:
+        return f"[{emoji}, {adw_id}]"
+    return status
+
+
+def rewrite_task_line(
+    line: str, new_marker: str, failure_note: Optional[str] = None
+) -> str:
+    """Replace a task line's status marker, keeping description and tags."""
+    ending = line[len(line.rstrip("\r\n")) :]
+    match = TASK_LINE_PATTERN.match(line.rstrip("\r\n"))
+    rest = match.group("rest").split(FAILURE_NOTE_SEPARATOR, 1)[0].rstrip()
+
+    if failure_note:
+        note = " ".join(failure_note.split())
+        rest = f"{rest}{FAILURE_NOTE_SEPARATOR} {note}"
+
+    return f"{match.group('prefix')}{new_marker}{rest}{ending}"
+
+
+def transition_task_status(
+    file_path: str,
+    worktree_name: str,
+    allowed_statuses: List[str],
+    new_status: str,
+    task_description: Optional[str] = None,
+    adw_id: Optional[str] = None,
+    commit_hash: Optional[str] = None,
+    failure_note: Optional[str] = None,
+) -> None:
+    """Move one task to a new status with a locked, atomic rewrite of tasks.md.
+
+    Raises:
+        FileNotFoundError: If the task file does not exist
+        ValueError: If no task in allowed_statuses matches
+    """
+    with locked_task_file(file_path):
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            lines = f.read().splitlines(keepends=True)
+
+        index = find_task_line(
+            lines, worktree_name, allowed_statuses, task_description, adw_id
+        )
+        if index is None:
+            target = f"'{task_description}'" if task_description else f"adw_id {adw_id}"
+            raise ValueError(
+                f"No task {target} with status {', '.join(allowed_statuses)} "
+                f"found in worktree '{worktree_name}'"
+            )
+
+        new_marker = format_status_marker(new_status, adw_id, commit_hash)
+        lines[index] = rewrite_task_line(lines[index], new_marker, failure_note)
+        write_file_atomic(file_path, "".join(lines))
+
+
+def mark_task_in_progress(
+    file_path: str, worktree_name: str, task_description: str, adw_id: str
+) -> None:
+    """Move a task from [] or [⏰] to [🟡, adw_id]."""
+    transition_task_status(
+        file_path,
+        worktree_name,
+        allowed_statuses=["[]", "[⏰]"],
+        new_status="[🟡]",
+        task_description=task_description,
+        adw_id=adw_id,
+    )
+
+
+def mark_task_completed(
+    file_path: str,
+    worktree_name: str,
+    task_description: str,
+    adw_id: str,
+    commit_hash: str,
+) -> None:
+    """Move a task to [✅ commit_hash, adw_id]."""
+    transition_task_status(
+        file_path,
+        worktree_name,
+        allowed_statuses=["[🟡]", "[]", "[⏰]"],
+        new_status="[✅]",
+        task_description=task_description,
+        adw_id=adw_id,
+        commit_hash=commit_hash,
+    )
+
+
+def mark_task_resumed(file_path: str, worktree_name: str, adw_id: str) -> None:
+    """Move a failed task back from [❌, adw_id] to [🟡, adw_id] for a resumed run."""
+    transition_task_status(
+        file_path,
+        worktree_name,
+        allowed_statuses=["[❌]"],
+        new_status="[🟡]",
+        adw_id=adw_id,
+    )
+
+
+def mark_task_failed(
+    file_path: str,
+    worktree_name: str,
+    task_description: str,
+    adw_id: str,
+    error_message: Optional[str] = None,
+) -> None:
+    """Move a task to [❌, adw_id] with a "// Failed: <error>" note."""
+    transition_task_status(
+        file_path,
+        worktree_name,
+        allowed_statuses=["[🟡]", "[]", "[⏰]"],
+        new_status="[❌]",
+        task_description=task_description,
+        adw_id=adw_id,
+        failure_note=error_message or "Unknown error",
+    )
@@ -0,0 +1,486 @@
+"""
+Transcript storage and reading for agents/ artifacts.
+
+By default (ADW_TRANSCRIPT_STORAGE=plain) every run keeps its stream-json
+transcript twice: cc_raw_output.jsonl and the pretty-printed
+cc_raw_output.json array. With ADW_TRANSCRIPT_STORAGE=compressed a run keeps
+a single cc_raw_output.jsonl.gz instead, and prompts/*.txt files become hard
+links into a content-addressed store (agents/.prompts/), so identical
+prompts - every /process_tasks poll, every retry - are stored once.
+
+The compressed transcript is written as a series of independent gzip
+members ("frames") of about FRAME_BYTES each, so it stays a valid .gz file
+(zcat works) and a crash loses at most the frame being buffered. The result
+message always closes a frame, so it is on disk as soon as the run ends.
+
+Both layouts get a sidecar offset index, cc_raw_output.jsonl.idx, written
+during capture: one "<offset> <length> <type>" row per message (offsets into
+the uncompressed stream) and one "F <compressed offset> <offset>" row per
+gzip frame. With it, the result message, the last N assistant messages or
+message k are read with one seek (and at most one frame decompressed)
+instead of decoding the whole transcript.
+
+TranscriptReader reads either layout and builds the JSON array view on
+demand; tooling should read transcripts through it rather than opening
+cc_raw_output.json directly. Transcripts without an index fall back to
+reading plain files backwards from the end.
+"""
+
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROMPT_STORE_DIR = os.path.join(PROJECT_ROOT, "agents", ".prompts")
+
+# Output file name constants (matching agent.py)
+OUTPUT_JSONL = "cc_raw_output.jsonl"
+OUTPUT_JSON = "cc_raw_output.json"
+COMPRESSED_SUFFIX = ".gz"
+INDEX_SUFFIX = ".idx"
+
+STORAGE_MODES = ("plain", "compressed")
+
+# Uncompressed bytes buffered before a gzip frame is written
+FRAME_BYTES = 256 * 1024
+
+# Block size for reading plain transcripts backwards
+TAIL_BLOCK_BYTES = 64 * 1024
+
+# (offset, length, message type) of one indexed message
+IndexEntry = Tuple[int, int, str]
+
+
+def get_storage_mode() -> str:
+    """Transcript storage mode from ADW_TRANSCRIPT_STORAGE ("plain" or "compressed")."""
+    mode = os.getenv("ADW_TRANSCRIPT_STORAGE", "plain")
+    return mode if mode in STORAGE_MODES else "plain"
+
+
+class FramedGzipWriter:
+    """Write bytes as a series of independent gzip members.
+
+    Concatenated members form a valid gzip file, and each one can be
+    decompressed on its own. on_frame(compressed offset, uncompressed
+    offset) is called for every frame written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        frame_bytes: int = FRAME_BYTES,
+        on_frame: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.path = path
+        self.frame_bytes = frame_bytes
+        self.on_frame = on_frame
+        self._f = open(path, "wb")
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._compressed_offset = 0
+        self._offset = 0
+
+    def write(self, data: bytes) -> None:
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.frame_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered bytes as a frame."""
+        if not self._buffer:
+            return
+        frame = gzip.compress(b"".join(self._buffer))
+        self._f.write(frame)
+        self._f.flush()
+        if self.on_frame:
+            self.on_frame(self._compressed_offset, self._offset)
+        self._compressed_offset += len(frame)
+        self._offset += self._buffered
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._f.close()
+
+
+class TranscriptWriter:
+    """Write a transcript and its offset index in one pass.
+
+    Usage:
+        writer = TranscriptWriter("agents/abc12345/planner/cc_raw_output.jsonl")
+        writer.write(line, message.get("type"))
+        writer.close()
+    """
+
+    def __init__(self, output_file: str, compressed: Optional[bool] = None):
+        """
+        Args:
+            output_file: The cc_raw_output.jsonl path; compressed storage
+                appends .gz
+            compressed: Storage layout (default: by ADW_TRANSCRIPT_STORAGE)
+        """
+        if compressed is None:
+            compressed = get_storage_mode() == "compressed"
+        self.compressed = compressed
+        self.path = output_file + COMPRESSED_SUFFIX if compressed else output_file
+        self.index_file = output_file + INDEX_SUFFIX
+        self._offset = 0
+
+        self._index_f = open(self.index_file, "w")
+        # The header names the file the offsets belong to
+        self._index_f.write(f"# {os.path.basename(self.path)}\n")
+        if compressed:
+            self._f = FramedGzipWriter(self.path, on_frame=self._record_frame)
+        else:
+            self._f = open(self.path, "wb")
+
+    def _record_frame(self, compressed_offset: int, offset: int) -> None:
+        self._index_f.write(f"F {compressed_offset} {offset}\n")
+
+    def write(self, line: str, message_type: Optional[str] = None) -> None:
+        """Append one raw line; lines with a message type are indexed."""
+        data = line.encode("utf-8")
+        self._f.write(data)
+        if message_type is not None:
+            self._index_f.write(f"{self._offset} {len(data)} {message_type or '-'}\n")
+        self._offset += len(data)
+
+    def flush(self) -> None:
+        """Get everything written so far onto disk."""
+        self._f.flush()
+        self._index_f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+        self._index_f.close()
+
+
+def find_transcript_file(path: str) -> Optional[str]:
+    """Locate the stored transcript for an agent directory or JSONL path.
+
+    Args:
+        path: An agent output directory, or a transcript path with or
+            without the .gz suffix
+
+    Returns:
+        The existing .jsonl or .jsonl.gz file (the newer one if a run left
+        both), or None
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, OUTPUT_JSONL)
+    if path.endswith(COMPRESSED_SUFFIX):
+        path = path[: -len(COMPRESSED_SUFFIX)]
+
+    candidates = [
+        candidate
+        for candidate in (path, path + COMPRESSED_SUFFIX)
+        if os.path.exists(candidate)
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
+
+
+def read_lines_reversed(path: str, block_size: int = TAIL_BLOCK_BYTES) -> Iterator[str]:
+    """Yield a plain file's lines from last to first, reading blocks from the end."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # The first piece may be the end of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode("utf-8")
+        if remainder.strip():
+            yield remainder.decode("utf-8")
+
+
+def decode_message(line: str) -> Optional[Dict[str, Any]]:
+    """Decode one transcript line, or None for blank and non-JSON lines."""
+    if not line.strip():
+        return None
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+class TranscriptReader:
+    """Read a stored transcript, plain or compressed.
+
+    Usage:
+        reader = TranscriptReader("agents/abc12345/planner")
+        result = reader.result_message()
+        errors = reader.last_messages(5, "assistant")
+        reader.write_json_array()  # cc_raw_output.json, on demand
+    """
+
+    def __init__(self, path: str):
+        self.path = find_transcript_file(path)
+        base = path if os.path.isdir(path) else os.path.dirname(path)
+        self.output_dir = base
+        self._index: Optional[Tuple[List[IndexEntry], List[Tuple[int, int]]]] = None
+        self._index_loaded = False
+        self._frame_cache: Optional[Tuple[int, bytes]] = None
+
+    @property
+    def exists(self) -> bool:
+        return self.path is not None
+
+    @property
+    def compressed(self) -> bool:
+        return bool(self.path and self.path.endswith(COMPRESSED_SUFFIX))
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the raw JSONL lines.
+
+        A compressed transcript cut short by a crash yields the lines of its
+        complete frames.
+        """
+        if not self.path:
+            return
+        if not self.compressed:
+            with open(self.path, "r", encoding="utf-8") as f:
+                yield from f
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                yield from f
+        except (EOFError, OSError, zlib.error):
+            return
+
+    def iter_messages(self) -> Iterator[Dict[str, Any]]:
+        """Yield the decoded messages, skipping blank and non-JSON lines."""
+        for line in self.iter_lines():
+            message = decode_message(line)
+            if message is not None:
+                yield message
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """All messages, as in the cc_raw_output.json array."""
+        return list(self.iter_messages())
+
+    def load_index(self) -> Optional[Tuple[List[IndexEntry], List[Tuple[int, int]]]]:
+        """The sidecar index as (messages, frames), or None if there is no usable one.
+
+        An index is only used if it belongs to this transcript file and
+        doesn't point past the data on disk.
+        """
+        if self._index_loaded:
+            return self._index
+        self._index_loaded = True
+        if not self.path:
+            return None
+
+        base = self.path[: -len(COMPRESSED_SUFFIX)] if self.compressed else self.path
+        try:
+            with open(base + INDEX_SUFFIX, "r") as f:
+                if f.readline().strip() != f"# {os.path.basename(self.path)}":
+                    return None
+                entries: List[IndexEntry] = []
+                frames: List[Tuple[int, int]] = []
+                for row in f:
+                    fields = row.split()
+                    if len(fields) != 3:
+                        continue
+                    if fields[0] == "F":
+                        frames.append((int(fields[1]), int(fields[2])))
+                    else:
+                        entries.append((int(fields[0]), int(fields[1]), fields[2]))
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # Drop entries for data that never reached the disk (a crashed run)
+        frames.sort(key=lambda frame: frame[1])
+        if self.compressed:
+            # The last complete frame bounds the data (and is needed for tail reads anyway)
+            end = 0
+            while frames:
+                last_frame = self._read_frame(len(frames) - 1, frames)
+                if last_frame is not None:
+                    end = frames[-1][1] + len(last_frame)
+                    break
+                frames.pop()
+        else:
+            end = os.path.getsize(self.path)
+        entries = [entry for entry in entries if entry[0] + entry[1] <= end]
+        self._index = (entries, frames)
+        return self._index
+
+    def _read_frame(self, frame_number: int, frames: List[Tuple[int, int]]) -> Optional[bytes]:
+        """Decompress one gzip frame, keeping the last one decompressed."""
+        if self._frame_cache and self._frame_cache[0] == frame_number:
+            return self._frame_cache[1]
+        compressed_offset = frames[frame_number][0]
+        decompressor = zlib.decompressobj(wbits=31)
+        chunks = []
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(compressed_offset)
+                while not decompressor.eof:
+                    chunk = f.read(TAIL_BLOCK_BYTES)
+                    if not chunk:
+                        return None  # Truncated frame
+                    chunks.append(decompressor.decompress(chunk))
+        except zlib.error:
+            return None
+        data = b"".join(chunks)
+        self._frame_cache = (frame_number, data)
+        return data
+
+    def _read_entry(self, entry: IndexEntry) -> Optional[Dict[str, Any]]:
+        """Read one indexed message with a single seek."""
+        offset, length, _message_type = entry
+        if not self.compressed:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                return decode_message(f.read(length).decode("utf-8"))
+
+        _entries, frames = self._index
+        frame_number = bisect.bisect_right([frame[1] for frame in frames], offset) - 1
+        if frame_number < 0:
+            return None
+        data = self._read_frame(frame_number, frames)
+        if data is None:
+            return None
+        start = offset - frames[frame_number][1]
+        return decode_message(data[start : start + length].decode("utf-8"))
+
+    def _iter_messages_reversed(self) -> Iterator[Dict[str, Any]]:
+        """Messages from last to first: indexed, tail-read, or (gzip without index) a full read."""
+        index = self.load_index()
+        if index is not None:
+            for entry in reversed(index[0]):
+                message = self._read_entry(entry)
+                if message is not None:
+                    yield message
+        elif self.path and not self.compressed:
+            for line in read_lines_reversed(self.path):
+                message = decode_message(line)
+                if message is not None:
+                    yield message
+        else:
+            yield from reversed(self.messages())
+
+    def message_at(self, k: int) -> Optional[Dict[str, Any]]:
+        """Message k of the messages() list (negative k counts from the end), or None."""
+        index = self.load_index()
+        if index is not None:
+            entries = index[0]
+            if -len(entries) <= k < len(entries):
+                return self._read_entry(entries[k])
+            return None
+        if k < 0:
+            for position, message in enumerate(self._iter_messages_reversed(), start=1):
+                if position == -k:
+                    return message
+            return None
+        for position, message in enumerate(self.iter_messages()):
+            if position == k:
+                return message
+        return None
+
+    def last_messages(self, n: int, message_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The last n messages (of one type, if given), oldest first."""
+        found: List[Dict[str, Any]] = []
+        if n <= 0:
+            return found
+
+        index = self.load_index()
+        if index is not None:
+            for entry in reversed(index[0]):
+                if message_type and entry[2] != message_type:
+                    continue
+                message = self._read_entry(entry)
+                if message is not None:
+                    found.append(message)
+                    if len(found) == n:
+                        break
+        else:
+            for message in self._iter_messages_reversed():
+                if message_type and message.get("type") != message_type:
+                    continue
+                found.append(message)
+                if len(found) == n:
+                    break
+        return list(reversed(found))
+
+    def result_message(self) -> Optional[Dict[str, Any]]:
+        """The last result message, or None if the run didn't get that far."""
+        results = self.last_messages(1, "result")
+        return results[0] if results else None
+
+    def last_message(self) -> Optional[Dict[str, Any]]:
+        """The last message (what cc_final_object.json holds)."""
+        return self.message_at(-1)
+
+    def write_json_array(self, json_file: Optional[str] = None) -> str:
+        """Write the cc_raw_output.json array view.
+
+        Args:
+            json_file: Destination (default: cc_raw_output.json next to the transcript)
+
+        Returns:
+            Path to the written file
+        """
+        json_file = json_file or os.path.join(self.output_dir, OUTPUT_JSON)
+        with open(json_file, "w") as f:
+            json.dump(self.messages(), f, indent=2)
+        return json_file
+
+
+def write_prompt_file(
+    prompt_file: str,
+    prompt: str,
+    deduplicate: Optional[bool] = None,
+    store_dir: str = PROMPT_STORE_DIR,
+) -> None:
+    """Write a prompts/*.txt file, deduplicated by content in compressed mode.
+
+    The file becomes a hard link to agents/.prompts/<sha256>.txt, so readers
+    see an ordinary file. Links are replaced, never written through, so
+    overwriting one prompt can't change another run's copy.
+
+    Args:
+        prompt_file: Path of the prompt file
+        prompt: Prompt text
+        deduplicate: Force deduplication on or off (default: by storage mode)
+        store_dir: Content-addressed store; must be on the same filesystem
+    """
+    if deduplicate is None:
+        deduplicate = get_storage_mode() == "compressed"
+    temp_file = f"{prompt_file}.{os.getpid()}.tmp"
+    if not deduplicate:
+        # Replace rather than truncate: the old file may be a link into the store
+        with open(temp_file, "w") as f:
+            f.write(prompt)
+        os.replace(temp_file, prompt_file)
+        return
+
+    data = prompt.encode("utf-8")
+    blob_file = os.path.join(store_dir, f"{hashlib.sha256(data).hexdigest()}.txt")
+    try:
+        if not os.path.exists(blob_file):
+            os.makedirs(store_dir, exist_ok=True)
+            blob_temp_file = f"{blob_file}.{os.getpid()}.tmp"
+            with open(blob_temp_file, "wb") as f:
+                f.write(data)
+            os.replace(blob_temp_file, blob_file)
+        os.link(blob_file, temp_file)
+        os.replace(temp_file, prompt_file)
+    except OSError:
+        # No hard links here (e.g. another filesystem): keep a plain copy
+        write_prompt_file(prompt_file, prompt, deduplicate=False)
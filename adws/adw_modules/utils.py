@@ -236,6 +236,48 @@ def format_worktree_status(action: str, worktree: str, adw_id: str = None) -> st
     return base_msg
 
 
+def print_status_panel(console, action: str, adw_id: str, worktree: str, phase: str = None, status: str = "info"):
+    """Print a status panel with timestamp and context.
+
+    Args:
+        console: Rich console instance
+        action: The action being performed
+        adw_id: ADW ID for tracking
+        worktree: Worktree/branch name
+        phase: Optional phase name (build, plan, etc)
+        status: Status type (info, success, error)
+    """
+    from rich.panel import Panel
+
+    timestamp = datetime.now().strftime("%H:%M:%S")
+
+    # Choose color based on status
+    if status == "success":
+        border_style = "green"
+        icon = "✅"
+    elif status == "error":
+        border_style = "red"
+        icon = "❌"
+    else:
+        border_style = "cyan"
+        icon = "🔄"
+
+    # Build title with context
+    title_parts = [f"[{timestamp}]", adw_id[:6], worktree]
+    if phase:
+        title_parts.append(phase)
+    title = " | ".join(title_parts)
+
+    console.print(
+        Panel(
+            f"{icon} {action}",
+            title=f"[bold {border_style}]{title}[/bold {border_style}]",
+            border_style=border_style,
+            padding=(0, 1),
+        )
+    )
+
+
 def get_safe_subprocess_env() -> Dict[str, str]:
     """Get filtered environment variables safe for subprocess execution.
 
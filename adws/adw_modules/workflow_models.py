@@ -0,0 +1,150 @@
+"""
+Data models of workflow runs: phase checkpoints, pipeline results and the
+jobs the cron trigger hands to workflow workers.
+
+Kept apart from data_models.py so the cron trigger, which only needs its
+configuration and task list models at startup, doesn't define these.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import Field
+
+from data_models import ADWModel
+
+
+class PhaseCheckpoint(ADWModel):
+    """Result of one workflow phase, saved as soon as the phase finishes."""
+
+    phase: str = Field(..., description="Phase name, e.g. plan, implement, update")
+    status: Literal["completed", "failed"] = Field(..., description="Phase outcome")
+    agent_name: Optional[str] = Field(None, description="Agent that ran the phase")
+    session_id: Optional[str] = Field(None, description="Claude Code session ID")
+    plan_path: Optional[str] = Field(None, description="Plan file produced by the phase")
+    commit_hash: Optional[str] = Field(None, description="Commit produced by the phase")
+    outputs: Dict[str, Any] = Field(
+        default_factory=dict, description="Named outputs later phases consume"
+    )
+    error: Optional[str] = Field(None, description="Error message if the phase failed")
+    duration_seconds: Optional[float] = Field(None, description="Wall time of the phase")
+    finished_at: datetime = Field(
+        default_factory=datetime.now, description="When the phase finished"
+    )
+
+    @property
+    def is_completed(self) -> bool:
+        """Whether a resumed run can skip this phase."""
+        return self.status == "completed"
+
+
+class WorkflowCheckpoint(ADWModel):
+    """Phase checkpoints of one workflow run, stored in agents/<adw_id>/."""
+
+    adw_id: str = Field(..., description="ADW ID of the workflow run")
+    workflow: str = Field(..., description="Workflow name, e.g. plan_implement_update_task")
+    inputs: Dict[str, Any] = Field(
+        default_factory=dict, description="Arguments needed to resume the run"
+    )
+    phases: Dict[str, PhaseCheckpoint] = Field(
+        default_factory=dict, description="Checkpoint of each finished phase"
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.now, description="Last checkpoint time"
+    )
+
+    def completed_phase(self, phase: str) -> Optional[PhaseCheckpoint]:
+        """The phase's checkpoint if it completed, else None."""
+        checkpoint = self.phases.get(phase)
+        return checkpoint if checkpoint and checkpoint.is_completed else None
+
+
+class PhaseResult(ADWModel):
+    """Outcome of one phase of a pipeline run."""
+
+    phase: str = Field(..., description="Phase name")
+    success: bool = Field(..., description="Whether the phase succeeded")
+    skipped: bool = Field(
+        default=False, description="Not run because a dependency failed"
+    )
+    resumed: bool = Field(
+        default=False, description="Restored from the checkpoint instead of run"
+    )
+    agent_name: Optional[str] = Field(None, description="Agent that ran the phase")
+    slash_command: Optional[str] = Field(None, description="Slash command the phase ran")
+    args: List[str] = Field(default_factory=list, description="Slash command arguments")
+    session_id: Optional[str] = Field(None, description="Claude Code session ID")
+    output: str = Field(default="", description="Agent or phase output")
+    outputs: Dict[str, Any] = Field(
+        default_factory=dict, description="Named outputs later phases consume"
+    )
+    error: Optional[str] = Field(None, description="Error message if the phase failed")
+    attempts: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Per-attempt metadata from the retry wrappers"
+    )
+    retry_code: Optional[str] = Field(None, description="Retry code of the last attempt")
+    session_source: Optional[str] = Field(
+        None, description="Phase whose session this phase continued or forked"
+    )
+    session_mode: Optional[Literal["continue", "fork"]] = Field(
+        None, description="How the source phase's session was reused"
+    )
+    num_turns: Optional[int] = Field(None, description="Agent turns reported by Claude Code")
+    usage: Optional[Dict[str, Any]] = Field(None, description="Token usage reported by Claude Code")
+    total_cost_usd: Optional[float] = Field(None, description="Cost reported by Claude Code")
+    tool_calls: Dict[str, int] = Field(
+        default_factory=dict, description="Tool calls made in the phase, by tool name"
+    )
+    started_at: Optional[datetime] = Field(None, description="When the phase started")
+    duration_seconds: float = Field(default=0.0, description="Wall time of the phase")
+
+
+class PipelineResult(ADWModel):
+    """Outcome of a pipeline run."""
+
+    workflow: str = Field(..., description="Workflow name")
+    adw_id: str = Field(..., description="ADW ID of the run")
+    results: Dict[str, PhaseResult] = Field(
+        default_factory=dict, description="Result of each phase, in completion order"
+    )
+    duration_seconds: float = Field(default=0.0, description="Wall time of the run")
+    summary_path: Optional[str] = Field(None, description="Path of workflow_summary.json")
+
+    @property
+    def success(self) -> bool:
+        """Whether every phase succeeded."""
+        return all(result.success for result in self.results.values())
+
+    @property
+    def error(self) -> Optional[str]:
+        """Error of the first phase that failed, if any."""
+        for result in self.results.values():
+            if not result.success and result.error:
+                return result.error
+        return None
+
+
+class WorkflowJob(ADWModel):
+    """A task workflow run requested by the cron trigger."""
+
+    workflow: str = Field(..., description="Workflow script, e.g. adw_build_update_task.py")
+    adw_id: str = Field(..., description="ADW ID for this task execution")
+    worktree_name: str = Field(..., description="Worktree the task runs in")
+    task: str = Field(..., description="Task description")
+    model: str = Field(default="sonnet", description="Claude model to use")
+    task_file: str = Field(default="tasks.md", description="Path to the task list file")
+
+    def to_args(self) -> List[str]:
+        """Command-line arguments for the workflow script."""
+        return [
+            "--adw-id",
+            self.adw_id,
+            "--worktree-name",
+            self.worktree_name,
+            "--task",
+            self.task,
+            "--model",
+            self.model,
+            "--task-file",
+            self.task_file,
+        ]
@@ -0,0 +1,139 @@
+"""
+Forkserver-based workers for running task workflows.
+
+Starting a workflow as `python adw_build_update_task.py ...` pays for a fresh
+interpreter, the pydantic/rich/click imports and the .env load on every task.
+WorkflowWorkerPool instead keeps a multiprocessing forkserver that has the
+workflow modules preloaded; each job runs in its own process forked from that
+warm server, so jobs stay isolated from each other and from the trigger while
+skipping interpreter startup.
+"""
+
+import multiprocessing
+import os
+import sys
+from typing import List, Optional
+
+from workflow_models import WorkflowJob
+
+# Workflow script -> module name importable from the adws directory
+WORKFLOW_MODULES = {
+    "adw_build_update_task.py": "adw_build_update_task",
+    "adw_plan_implement_update_task.py": "adw_plan_implement_update_task",
+}
+
+# The workflows import these in main(), so preload them alongside the workflows
+PRELOAD_MODULES = [
+    *WORKFLOW_MODULES.values(),
+    "agent",
+    "checkpoint",
+    "claude_workers",
+    "pipeline",
+    "data_models",
+    "workflow_models",
+    "task_list",
+    "utils",
+    "worktree",
+    "rich.console",
+    "rich.panel",
+    "rich.rule",
+    "rich.table",
+]
+
+
+def run_workflow_job(module_name: str, args: List[str], cwd: str) -> None:
+    """Entry point of a forked worker: run one workflow's click command.
+
+    The workflow's sys.exit() status becomes the worker's exit code.
+    """
+    from claude_workers import shutdown_worker_pool
+
+    os.chdir(cwd)
+    module = sys.modules.get(module_name) or __import__(module_name)
+    sys.argv = [f"{module_name}.py", *args]
+    try:
+        module.main(args=args, prog_name=f"{module_name}.py")
+    finally:
+        # Forked workers leave with os._exit, which skips atexit handlers
+        shutdown_worker_pool()
+
+
+def expose_workflow_paths() -> None:
+    """Put adws/ and adw_modules/ on PYTHONPATH for the forkserver.
+
+    The forkserver is a fresh interpreter that doesn't inherit the caller's
+    sys.path, and preload imports that fail are silently skipped, so without
+    this the workflows would be imported per job instead of once.
+    """
+    adws_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = [adws_dir, os.path.join(adws_dir, "adw_modules")]
+    existing = [path for path in os.environ.get("PYTHONPATH", "").split(os.pathsep) if path]
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        [path for path in paths if path not in existing] + existing
+    )
+
+
+class WorkerProcess:
+    """Popen-like view of a forked worker, for the trigger's process table."""
+
+    def __init__(self, process: multiprocessing.process.BaseProcess):
+        self._process = process
+        self.pid = process.pid
+
+    def poll(self) -> Optional[int]:
+        """Reap the worker without blocking; return its exit code once finished."""
+        self._process.join(timeout=0)
+        return self._process.exitcode
+
+
+class WorkflowWorkerPool:
+    """Runs WorkflowJobs in processes forked from a preloaded forkserver.
+
+    Usage:
+        pool = WorkflowWorkerPool()
+        pool.warm()  # start the forkserver and preload the workflows now
+        process = pool.start_job(job)
+        exit_code = process.poll()
+        pool.shutdown()
+    """
+
+    def __init__(self, preload: Optional[List[str]] = None):
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(
+            preload if preload is not None else PRELOAD_MODULES
+        )
+        expose_workflow_paths()
+
+    def start_job(self, job: WorkflowJob) -> WorkerProcess:
+        """Fork a worker for the job and return a handle to it."""
+        module_name = WORKFLOW_MODULES.get(job.workflow)
+        if module_name is None:
+            raise ValueError(f"Unknown workflow: {job.workflow}")
+
+        process = self._context.Process(
+            target=run_workflow_job,
+            args=(module_name, job.to_args(), os.getcwd()),
+            name=f"adw-{job.adw_id}",
+        )
+        process.start()
+        return WorkerProcess(process)
+
+    def warm(self) -> None:
+        """Start the forkserver so the first job doesn't pay for the preload."""
+        process = self._context.Process(target=os.getpid)
+        process.start()
+        process.join()
+
+    def shutdown(self) -> None:
+        """Stop the forkserver; workers already forked from it keep running."""
+        from multiprocessing import forkserver
+
+        # multiprocessing has no public way to stop its forkserver
+        stop = getattr(forkserver._forkserver, "_stop", None)
+        if stop is not None:
+            stop()
+
+
+def is_worker_pool_supported() -> bool:
+    """Whether this platform supports the forkserver start method."""
+    return "forkserver" in multiprocessing.get_all_start_methods()
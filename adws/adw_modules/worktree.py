@@ -0,0 +1,255 @@
+"""
+Native git worktree provisioning.
+
+Creates the trees/<name> worktrees used by the multi-agent workflows directly
+with git instead of an /init_worktree agent session:
+
+    git worktree add --no-checkout -b <name> trees/<name> <base_branch>
+    git sparse-checkout set <target_directory>
+    git checkout <name>
+    cp .env trees/<name>/<target_directory>/.env
+    node_modules from the shared store (see node_modules_store.py)
+
+Only the `git worktree add` step touches shared repository metadata, so it
+runs under a per-repo file lock; checkout and .env copying run unlocked, which
+lets several worktrees be provisioned in parallel.
+"""
+
+import fcntl
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
+
+from data_models import WorktreeConfig
+from node_modules_store import DependencyStoreError, ensure_node_modules
+
+# Directory checked out in every worktree (sparse checkout)
+TARGET_DIRECTORY = "tac8_app2__multi_agent_todone"
+
+# Default base directory for worktrees, relative to the repository root
+WORKTREE_BASE_DIR = "trees"
+
+# Default number of worktrees provisioned at once
+MAX_PARALLEL_WORKTREES = 4
+
+
+class WorktreeError(Exception):
+    """Raised when a worktree cannot be provisioned."""
+
+
+def run_git(args: List[str], cwd: str) -> str:
+    """Run a git command and return its stdout.
+
+    Raises:
+        WorktreeError: If git exits with a non-zero status
+    """
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        message = result.stderr.strip() or result.stdout.strip()
+        raise WorktreeError(f"git {' '.join(args)} failed: {message}")
+    return result.stdout.strip()
+
+
+def get_repo_root(cwd: Optional[str] = None) -> str:
+    """Top-level directory of the main repository containing cwd."""
+    cwd = cwd or os.getcwd()
+    common_dir = run_git(["rev-parse", "--path-format=absolute", "--git-common-dir"], cwd)
+    return os.path.dirname(common_dir)
+
+
+@contextmanager
+def repo_lock(repo_root: str) -> Iterator[None]:
+    """Serialize worktree metadata changes across processes for one repository."""
+    common_dir = run_git(
+        ["rev-parse", "--path-format=absolute", "--git-common-dir"], repo_root
+    )
+    with open(os.path.join(common_dir, "adw-worktree.lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def get_worktree_path(
+    worktree_name: str, repo_root: str, base_dir: str = WORKTREE_BASE_DIR
+) -> str:
+    """Absolute path of trees/<worktree_name> (base_dir may be absolute)."""
+    return os.path.join(repo_root, base_dir, worktree_name)
+
+
+def branch_exists(branch: str, repo_root: str) -> bool:
+    """Whether a local branch with this name exists."""
+    try:
+        run_git(["rev-parse", "--verify", "--quiet", f"refs/heads/{branch}"], repo_root)
+        return True
+    except WorktreeError:
+        return False
+
+
+def copy_env_file(repo_root: str, worktree_path: str, target_directory: str) -> Optional[str]:
+    """Copy the target directory's .env (or the repository's) into the worktree.
+
+    Returns:
+        Destination path, or None if there was no .env file to copy
+    """
+    for source in (
+        os.path.join(repo_root, target_directory, ".env"),
+        os.path.join(repo_root, ".env"),
+    ):
+        if os.path.isfile(source):
+            destination = os.path.join(worktree_path, target_directory, ".env")
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(source, destination)
+            return destination
+    return None
+
+
+def install_dependencies(working_dir: str, repo_root: str) -> None:
+    """Materialize node_modules from the shared store, warning on failure.
+
+    Missing dependencies don't block the workflow (the agent can still
+    install them), so errors are reported rather than raised.
+    """
+    try:
+        if ensure_node_modules(working_dir, repo_root):
+            exclude_from_git("node_modules/", working_dir)
+    except (DependencyStoreError, WorktreeError, OSError) as e:
+        print(f"Warning: dependencies not installed in {working_dir}: {e}", file=sys.stderr)
+
+
+def exclude_from_git(pattern: str, working_dir: str) -> None:
+    """Add a pattern to the repository's info/exclude so agents can't commit it."""
+    exclude_file = run_git(["rev-parse", "--path-format=absolute", "--git-path", "info/exclude"], working_dir)
+    try:
+        with open(exclude_file, "r") as f:
+            if pattern in f.read().splitlines():
+                return
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(exclude_file), exist_ok=True)
+    with open(exclude_file, "a") as f:
+        f.write(f"{pattern}\n")
+
+
+def create_worktree(
+    config: WorktreeConfig,
+    target_directory: str = TARGET_DIRECTORY,
+    repo_root: Optional[str] = None,
+    base_dir: str = WORKTREE_BASE_DIR,
+    with_dependencies: bool = True,
+) -> str:
+    """Provision trees/<name> with a sparse checkout of target_directory.
+
+    A new branch named after the worktree is created from config.base_branch;
+    if that branch already exists it is checked out as is.
+
+    Args:
+        config: Worktree name, base branch and whether to copy .env
+        target_directory: Directory to sparse-checkout (None or "" = full checkout)
+        repo_root: Repository root (default: the repository containing cwd)
+        base_dir: Directory holding worktrees, relative to repo_root
+        with_dependencies: Materialize node_modules from the shared store
+
+    Returns:
+        Path of the directory agents work in (trees/<name>/<target_directory>)
+
+    Raises:
+        WorktreeError: If git fails or the worktree path is already taken
+    """
+    repo_root = repo_root or get_repo_root()
+    worktree_path = get_worktree_path(config.worktree_name, repo_root, base_dir)
+    if os.path.exists(worktree_path):
+        raise WorktreeError(f"Worktree path already exists: {worktree_path}")
+
+    with repo_lock(repo_root):
+        # Forget worktrees whose directories were deleted by hand
+        run_git(["worktree", "prune"], repo_root)
+
+        if branch_exists(config.worktree_name, repo_root):
+            add_args = [worktree_path, config.worktree_name]
+        else:
+            try:
+                run_git(
+                    ["rev-parse", "--verify", "--quiet", f"{config.base_branch}^{{commit}}"],
+                    repo_root,
+                )
+            except WorktreeError:
+                raise WorktreeError(f"Base branch not found: {config.base_branch}")
+            add_args = ["-b", config.worktree_name, worktree_path, config.base_branch]
+        run_git(["worktree", "add", "--no-checkout", *add_args], repo_root)
+
+    try:
+        if target_directory:
+            run_git(["sparse-checkout", "set", target_directory], worktree_path)
+        run_git(["checkout", config.worktree_name], worktree_path)
+
+        if target_directory and not os.path.isdir(
+            os.path.join(worktree_path, target_directory)
+        ):
+            raise WorktreeError(
+                f"'{target_directory}' does not exist on branch {config.worktree_name}"
+            )
+
+        if config.copy_env:
+            copy_env_file(repo_root, worktree_path, target_directory or "")
+    except Exception:
+        remove_worktree(config.worktree_name, repo_root, base_dir)
+        raise
+
+    working_dir = os.path.join(worktree_path, target_directory) if target_directory else worktree_path
+    if with_dependencies:
+        install_dependencies(working_dir, repo_root)
+    return working_dir
+
+
+def remove_worktree(
+    worktree_name: str, repo_root: Optional[str] = None, base_dir: str = WORKTREE_BASE_DIR
+) -> None:
+    """Remove a worktree directory and its git registration (the branch is kept)."""
+    repo_root = repo_root or get_repo_root()
+    worktree_path = get_worktree_path(worktree_name, repo_root, base_dir)
+    with repo_lock(repo_root):
+        try:
+            run_git(["worktree", "remove", "--force", worktree_path], repo_root)
+        except WorktreeError:
+            shutil.rmtree(worktree_path, ignore_errors=True)
+            run_git(["worktree", "prune"], repo_root)
+
+
+def create_worktrees(
+    configs: List[WorktreeConfig],
+    target_directory: str = TARGET_DIRECTORY,
+    repo_root: Optional[str] = None,
+    base_dir: str = WORKTREE_BASE_DIR,
+    max_workers: int = MAX_PARALLEL_WORKTREES,
+) -> Dict[str, Union[str, Exception]]:
+    """Provision several worktrees in parallel.
+
+    Returns:
+        Mapping of worktree name to its working directory, or to the
+        exception that prevented its creation
+    """
+    repo_root = repo_root or get_repo_root()
+    results: Dict[str, Union[str, Exception]] = {}
+    if not configs:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(configs)))) as pool:
+        futures = {
+            config.worktree_name: pool.submit(
+                create_worktree, config, target_directory, repo_root, base_dir
+            )
+            for config in configs
+        }
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+    return results
@@ -0,0 +1,304 @@
+"""
+Pre-warmed pool of spare worktrees.
+
+Keeps a few fully provisioned worktrees under trees/.pool/ on the current
+base branch, so a new worktree group can claim one (a `git worktree move` plus
+a branch rename) instead of being provisioned from scratch. A background
+thread refills the pool after claims and resets spares whose base branch
+moved on.
+
+A spare is only ready once trees/.pool/<spare name>.ready exists. The marker
+is written after checkout and dependency install succeed and removed while a
+spare is reset or claimed, so a spare left half-built by a killed run is
+discarded on the next start instead of being handed to a workflow.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from data_models import WorktreeConfig
+from worktree import (
+    TARGET_DIRECTORY,
+    WORKTREE_BASE_DIR,
+    WorktreeError,
+    branch_exists,
+    create_worktree,
+    get_repo_root,
+    get_worktree_path,
+    install_dependencies,
+    remove_worktree,
+    repo_lock,
+    run_git,
+)
+
+# Spares live in trees/.pool/<spare name>, on a branch of the same name
+POOL_DIR_NAME = ".pool"
+SPARE_PREFIX = "adw-pool-"
+
+# Completion marker next to each ready spare
+READY_SUFFIX = ".ready"
+
+# Seconds between background checks for stale spares
+REFRESH_INTERVAL_SECONDS = 60
+
+# Longest stop() waits for an in-flight provisioning
+STOP_TIMEOUT_SECONDS = 10
+
+
+class WorktreePool:
+    """A refillable pool of spare worktrees.
+
+    Usage:
+        pool = WorktreePool(size=2)
+        pool.start()  # refill in the background
+        path = pool.claim(WorktreeConfig(worktree_name="feature-x"))
+        if path is None:
+            ...  # pool miss, provision normally
+        pool.stop()
+    """
+
+    def __init__(
+        self,
+        size: int,
+        base_branch: str = "main",
+        target_directory: str = TARGET_DIRECTORY,
+        repo_root: Optional[str] = None,
+        base_dir: str = WORKTREE_BASE_DIR,
+    ):
+        self.size = size
+        self.base_branch = base_branch
+        self.target_directory = target_directory
+        self.repo_root = repo_root or get_repo_root()
+        self.base_dir = base_dir
+        self.pool_dir = os.path.join(base_dir, POOL_DIR_NAME)
+
+        self.hits = 0
+        self.misses = 0
+        self.provisioned = 0
+        self.provision_errors = 0
+        self.total_provision_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+        self._spares: List[str] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._recover_spares()
+
+    def _spare_path(self, spare_name: str) -> str:
+        return get_worktree_path(spare_name, self.repo_root, self.pool_dir)
+
+    def _ready_file(self, spare_name: str) -> str:
+        return self._spare_path(spare_name) + READY_SUFFIX
+
+    def _mark_ready(self, spare_name: str) -> None:
+        with open(self._ready_file(spare_name), "w"):
+            pass
+
+    def _unmark_ready(self, spare_name: str) -> None:
+        try:
+            os.remove(self._ready_file(spare_name))
+        except FileNotFoundError:
+            pass
+
+    def _discard_spare(self, spare_name: str) -> None:
+        """Remove a spare's worktree, marker and branch."""
+        self._unmark_ready(spare_name)
+        remove_worktree(spare_name, self.repo_root, self.pool_dir)
+        with repo_lock(self.repo_root):
+            try:
+                run_git(["branch", "-D", spare_name], self.repo_root)
+            except WorktreeError:
+                pass
+
+    def _recover_spares(self) -> None:
+        """Adopt the ready spares left behind by a previous run, discard the rest."""
+        pool_path = os.path.join(self.repo_root, self.pool_dir)
+        if not os.path.isdir(pool_path):
+            return
+        for entry in sorted(os.listdir(pool_path)):
+            if not entry.startswith(SPARE_PREFIX):
+                continue
+            if entry.endswith(READY_SUFFIX):
+                # A marker whose spare is gone
+                if not os.path.isdir(os.path.join(pool_path, entry[: -len(READY_SUFFIX)])):
+                    os.remove(os.path.join(pool_path, entry))
+            elif os.path.exists(self._ready_file(entry)):
+                self._spares.append(entry)
+            else:
+                # Killed mid-provision or mid-reset: it may lack files, .env or node_modules
+                try:
+                    self._discard_spare(entry)
+                except WorktreeError as e:
+                    self.last_error = str(e)
+
+    def _base_commit(self) -> str:
+        return run_git(["rev-parse", f"{self.base_branch}^{{commit}}"], self.repo_root)
+
+    def provision_spare(self) -> str:
+        """Create one spare worktree and add it to the pool."""
+        spare_name = f"{SPARE_PREFIX}{uuid.uuid4().hex[:8]}"
+        started_at = time.monotonic()
+        create_worktree(
+            WorktreeConfig(worktree_name=spare_name, base_branch=self.base_branch),
+            target_directory=self.target_directory,
+            repo_root=self.repo_root,
+            base_dir=self.pool_dir,
+        )
+        self._mark_ready(spare_name)
+        with self._lock:
+            self.provisioned += 1
+            self.total_provision_seconds += time.monotonic() - started_at
+            self._spares.append(spare_name)
+        return spare_name
+
+    def refresh_spares(self) -> None:
+        """Reset spares to the current base commit if the base branch moved."""
+        base_commit = self._base_commit()
+        with self._lock:
+            spares = list(self._spares)
+        for spare_name in spares:
+            # Take the spare out while it is refreshed so it can't be claimed
+            with self._lock:
+                if spare_name not in self._spares:
+                    continue
+                self._spares.remove(spare_name)
+
+            spare_path = self._spare_path(spare_name)
+            try:
+                if run_git(["rev-parse", "HEAD"], spare_path) != base_commit:
+                    self._unmark_ready(spare_name)
+                    run_git(["reset", "--hard", base_commit], spare_path)
+                    install_dependencies(
+                        os.path.join(spare_path, self.target_directory or ""),
+                        self.repo_root,
+                    )
+                    self._mark_ready(spare_name)
+            except WorktreeError:
+                # A broken spare is discarded rather than handed out
+                self._discard_spare(spare_name)
+                continue
+
+            with self._lock:
+                self._spares.append(spare_name)
+
+    def refill(self) -> None:
+        """Refresh stale spares and provision new ones up to the pool size."""
+        self.refresh_spares()
+        while not self._stopped.is_set():
+            with self._lock:
+                if len(self._spares) >= self.size:
+                    return
+            self.provision_spare()
+
+    def claim(self, config: WorktreeConfig) -> Optional[str]:
+        """Turn a spare into trees/<config.worktree_name>.
+
+        Returns:
+            The worktree's working directory, or None on a pool miss (no
+            spare ready, a different base branch, or the branch name taken)
+        """
+        spare_name = None
+        if config.base_branch == self.base_branch and not branch_exists(
+            config.worktree_name, self.repo_root
+        ):
+            with self._lock:
+                if self._spares:
+                    spare_name = self._spares.pop(0)
+
+        if spare_name is None:
+            with self._lock:
+                self.misses += 1
+            self._wake.set()
+            return None
+
+        spare_path = self._spare_path(spare_name)
+        worktree_path = get_worktree_path(config.worktree_name, self.repo_root, self.base_dir)
+        self._unmark_ready(spare_name)
+        try:
+            # The base branch may have moved since the spare was provisioned
+            base_commit = self._base_commit()
+            if run_git(["rev-parse", "HEAD"], spare_path) != base_commit:
+                run_git(["reset", "--hard", base_commit], spare_path)
+
+            with repo_lock(self.repo_root):
+                run_git(["worktree", "move", spare_path, worktree_path], self.repo_root)
+                run_git(["branch", "-m", spare_name, config.worktree_name], self.repo_root)
+
+            env_file = os.path.join(worktree_path, self.target_directory or "", ".env")
+            if not config.copy_env and os.path.exists(env_file):
+                os.remove(env_file)
+        except WorktreeError as e:
+            self.last_error = str(e)
+            with self._lock:
+                self.misses += 1
+            if os.path.exists(spare_path):
+                self._discard_spare(spare_name)
+            elif os.path.exists(worktree_path):
+                remove_worktree(config.worktree_name, self.repo_root, self.base_dir)
+            self._wake.set()
+            return None
+
+        working_dir = (
+            os.path.join(worktree_path, self.target_directory)
+            if self.target_directory
+            else worktree_path
+        )
+        # No-op unless the reset above changed the lockfile
+        install_dependencies(working_dir, self.repo_root)
+
+        with self._lock:
+            self.hits += 1
+        self._wake.set()
+        return working_dir
+
+    def _run(self) -> None:
+        """Background loop: refill after claims and refresh periodically."""
+        while not self._stopped.is_set():
+            try:
+                self.refill()
+                self.last_error = None
+            except Exception as e:
+                self.provision_errors += 1
+                self.last_error = str(e)
+            self._wake.wait(REFRESH_INTERVAL_SECONDS)
+            self._wake.clear()
+
+    def start(self) -> None:
+        """Start refilling the pool in a background thread."""
+        if self._thread is None and self.size > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="worktree-pool", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread (spares are kept for the next run)."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            # A spare being provisioned is finished by the daemon thread if time allows
+            self._thread.join(timeout=STOP_TIMEOUT_SECONDS)
+            self._thread = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool hit/miss and provisioning-time metrics."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "ready": len(self._spares),
+                "hits": self.hits,
+                "misses": self.misses,
+                "provisioned": self.provisioned,
+                "provision_errors": self.provision_errors,
+                "avg_provision_seconds": round(
+                    self.total_provision_seconds / self.provisioned, 2
+                )
+                if self.provisioned
+                else None,
+                "last_error": self.last_error,
+            }
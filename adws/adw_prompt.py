@@ -43,22 +43,12 @@ import sys
 import json
 from pathlib import Path
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.syntax import Syntax
-from rich.text import Text
 
 # Add the adw_modules directory to the path so we can import agent
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "adw_modules"))
 
-from agent import (
-    prompt_claude_code,
-    AgentPromptRequest,
-    AgentPromptResponse,
-    prompt_claude_code_with_retry,
-    generate_short_id,
-)
+# rich and the adw_modules (pydantic) are imported in main() so --help starts fast
+
 
 # Output file name constants
 OUTPUT_JSONL = "cc_raw_output.jsonl"
@@ -98,6 +88,22 @@ def main(
     agent_name: str,
 ):
     """Run an adhoc Claude Code prompt from the command line."""
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.syntax import Syntax
+    from rich.text import Text
+
+    from agent import (
+        prompt_claude_code,
+        AgentPromptRequest,
+        AgentPromptResponse,
+        prompt_claude_code_with_retry,
+        generate_short_id,
+        make_status_hook,
+    )
+    from transcripts import get_storage_mode
+
     console = Console()
 
     # Generate a unique ID for this execution
@@ -150,7 +156,8 @@ def main(
 
     try:
         # Execute the prompt
-        with console.status("[bold yellow]Executing prompt...[/bold yellow]"):
+        with console.status("[bold yellow]Executing prompt...[/bold yellow]") as status:
+            request.on_message = make_status_hook(status, "Executing prompt...")
             if no_retry:
                 # Direct execution without retry
 
@@ -209,6 +216,7 @@ def main(
                     "working_dir": working_dir,
                     "success": response.success,
                     "session_id": response.session_id,
+                    "attempts": response.attempts,
                     "retry_code": response.retry_code,
                     "output": response.output,
                 },
@@ -227,12 +235,22 @@ def main(
         json_array_path = os.path.join(output_dir, OUTPUT_JSON)
         final_object_path = os.path.join(output_dir, FINAL_OBJECT_JSON)
 
-        files_table.add_row(
-            "JSONL Stream", output, "Raw streaming output from Claude Code"
-        )
-        files_table.add_row(
-            "JSON Array", json_array_path, "All messages as a JSON array"
-        )
+        if get_storage_mode() == "compressed":
+            files_table.add_row(
+                "JSONL Stream", f"{output}.gz", "Raw streaming output (gzip frames)"
+            )
+            files_table.add_row(
+                "JSON Array",
+                f"./adws/adw_transcript.py show {output_dir}",
+                "All messages as a JSON array, generated on demand",
+            )
+        else:
+            files_table.add_row(
+                "JSONL Stream", output, "Raw streaming output from Claude Code"
+            )
+            files_table.add_row(
+                "JSON Array", json_array_path, "All messages as a JSON array"
+            )
         files_table.add_row(
             "Final Object", final_object_path, "Last message entry (final result)"
         )
@@ -40,19 +40,12 @@ import sys
 import json
 from pathlib import Path
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
 # Add the adw_modules directory to the path so we can import agent
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "adw_modules"))
 
-from agent import (
-    AgentTemplateRequest,
-    AgentPromptResponse,
-    execute_template,
-    generate_short_id,
-)
+# rich and the adw_modules (pydantic) are imported in main() so --help starts fast
+
 
 # Output file name constants
 OUTPUT_JSONL = "cc_raw_output.jsonl"
@@ -88,6 +81,19 @@ def main(
     agent_name: str,
 ):
     """Run Claude Code slash commands from the command line."""
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from agent import (
+        AgentTemplateRequest,
+        AgentPromptResponse,
+        execute_template,
+        generate_short_id,
+        make_status_hook,
+    )
+    from transcripts import get_storage_mode
+
     console = Console()
 
     # Generate a unique ID for this execution
@@ -130,7 +136,8 @@ def main(
 
     try:
         # Execute the slash command
-        with console.status("[bold yellow]Executing command...[/bold yellow]"):
+        with console.status("[bold yellow]Executing command...[/bold yellow]") as status:
+            request.on_message = make_status_hook(status, "Executing command...")
             response = execute_template(request)
 
         # Display the result
@@ -187,6 +194,7 @@ def main(
                     "working_dir": working_dir,
                     "success": response.success,
                     "session_id": response.session_id,
+                    "attempts": response.attempts,
                     "retry_code": response.retry_code,
                     "output": response.output,
                 },
@@ -200,16 +208,28 @@ def main(
         files_table.add_column("Path", style="dim")
         files_table.add_column("Description", style="italic")
 
-        files_table.add_row(
-            "JSONL Stream",
-            f"{output_dir}/{OUTPUT_JSONL}",
-            "Raw streaming output from Claude Code",
-        )
-        files_table.add_row(
-            "JSON Array",
-            f"{output_dir}/{OUTPUT_JSON}",
-            "All messages as a JSON array",
-        )
+        if get_storage_mode() == "compressed":
+            files_table.add_row(
+                "JSONL Stream",
+                f"{output_dir}/{OUTPUT_JSONL}.gz",
+                "Raw streaming output (gzip frames)",
+            )
+            files_table.add_row(
+                "JSON Array",
+                f"./adws/adw_transcript.py show {output_dir}",
+                "All messages as a JSON array, generated on demand",
+            )
+        else:
+            files_table.add_row(
+                "JSONL Stream",
+                f"{output_dir}/{OUTPUT_JSONL}",
+                "Raw streaming output from Claude Code",
+            )
+            files_table.add_row(
+                "JSON Array",
+                f"{output_dir}/{OUTPUT_JSON}",
+                "All messages as a JSON array",
+            )
         files_table.add_row(
             "Final Object",
             f"{output_dir}/{FINAL_OBJECT_JSON}",
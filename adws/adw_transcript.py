@@ -0,0 +1,228 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#   "click",
+#   "rich",
+# ]
+# ///
+"""
+Read and compact stored agent transcripts.
+
+Transcripts may be stored plain (cc_raw_output.jsonl plus the
+cc_raw_output.json array) or compressed (cc_raw_output.jsonl.gz only, see
+ADW_TRANSCRIPT_STORAGE). This tool reads either and converts plain runs to
+compressed storage.
+
+Usage:
+    # Print a run's messages as a JSON array
+    ./adws/adw_transcript.py show agents/<adw_id>/<agent_name>
+
+    # Print only the result message
+    ./adws/adw_transcript.py show agents/<adw_id>/<agent_name> --result
+
+    # Print the last 3 assistant messages, or message 10
+    ./adws/adw_transcript.py show agents/<adw_id>/<agent_name> --tail 3
+    ./adws/adw_transcript.py show agents/<adw_id>/<agent_name> --message 10
+
+    # Compress every finished run under agents/
+    ./adws/adw_transcript.py compact
+
+Examples:
+    # Generate cc_raw_output.json next to a compressed transcript
+    ./adws/adw_transcript.py show agents/abc12345/planner --write
+
+    # See what compaction would save without changing anything
+    ./adws/adw_transcript.py compact agents/abc12345 --dry-run
+"""
+
+import json
+import os
+import sys
+from typing import List, Optional, Tuple
+
+import click
+
+# Add the adw_modules directory to the path so we can import transcripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "adw_modules"))
+
+# Written when a run closes its transcript (see agent.TranscriptCollector)
+FINAL_OBJECT_JSON = "cc_final_object.json"
+
+
+@click.group()
+def cli():
+    """Read and compact stored agent transcripts."""
+
+
+@cli.command()
+@click.argument("path", type=click.Path(exists=True))
+@click.option("--result", is_flag=True, help="Print only the result message")
+@click.option("--tail", type=int, help="Print only the last N assistant messages")
+@click.option("--message", "message_number", type=int, help="Print only message K (negative counts from the end)")
+@click.option("--write", is_flag=True, help="Write cc_raw_output.json next to the transcript")
+def show(
+    path: str,
+    result: bool,
+    tail: Optional[int],
+    message_number: Optional[int],
+    write: bool,
+):
+    """Print the transcript in PATH (agent directory or transcript file).
+
+    --result, --tail and --message seek through the offset index instead of
+    reading the whole transcript.
+    """
+    from transcripts import TranscriptReader
+
+    reader = TranscriptReader(path)
+    if not reader.exists:
+        click.echo(f"No transcript found in {path}", err=True)
+        sys.exit(1)
+
+    if write:
+        click.echo(reader.write_json_array())
+    elif result:
+        click.echo(json.dumps(reader.result_message(), indent=2))
+    elif tail is not None:
+        click.echo(json.dumps(reader.last_messages(tail, "assistant"), indent=2))
+    elif message_number is not None:
+        click.echo(json.dumps(reader.message_at(message_number), indent=2))
+    else:
+        click.echo(json.dumps(reader.messages(), indent=2))
+
+
+def find_agent_dirs(paths: List[str]) -> List[str]:
+    """Directories under the given paths that hold a plain transcript."""
+    from transcripts import OUTPUT_JSONL
+
+    agent_dirs = []
+    for path in paths:
+        for root, dirs, files in os.walk(path):
+            # Skip shared state such as agents/.cache and agents/.prompts
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            if OUTPUT_JSONL in files:
+                agent_dirs.append(root)
+    return agent_dirs
+
+
+def run_finished(agent_dir: str) -> bool:
+    """Whether the run in agent_dir is done writing its plain transcript.
+
+    A run is done once cc_final_object.json, written when the transcript is
+    closed, is at least as new as the transcript, or once the transcript
+    ends in a result message (which a run killed before closing still
+    leaves). A run that has been quiet for a long time is not done: a long
+    tool call can keep it silent for many minutes.
+    """
+    from transcripts import OUTPUT_JSONL, TranscriptReader
+
+    jsonl_file = os.path.join(agent_dir, OUTPUT_JSONL)
+    final_object_file = os.path.join(agent_dir, FINAL_OBJECT_JSON)
+    if os.path.exists(final_object_file) and os.path.getmtime(final_object_file) >= os.path.getmtime(jsonl_file):
+        return True
+    last_message = TranscriptReader(jsonl_file).last_message()
+    return last_message is not None and last_message.get("type") == "result"
+
+
+def compact_agent_dir(agent_dir: str, dry_run: bool) -> Tuple[int, int]:
+    """Compress and index one run's transcript, drop its array view and dedupe its prompts.
+
+    Returns:
+        (bytes before, bytes after)
+    """
+    import shutil
+
+    from transcripts import (
+        OUTPUT_JSON,
+        OUTPUT_JSONL,
+        TranscriptReader,
+        TranscriptWriter,
+        decode_message,
+        write_prompt_file,
+    )
+
+    jsonl_file = os.path.join(agent_dir, OUTPUT_JSONL)
+    json_file = os.path.join(agent_dir, OUTPUT_JSON)
+    before = os.path.getsize(jsonl_file)
+    if os.path.exists(json_file):
+        before += os.path.getsize(json_file)
+
+    # Build the compressed transcript and its index under their final names in a scratch directory
+    temp_dir = os.path.join(agent_dir, f".compact-{os.getpid()}")
+    os.makedirs(temp_dir, exist_ok=True)
+    try:
+        writer = TranscriptWriter(os.path.join(temp_dir, OUTPUT_JSONL), compressed=True)
+        with open(jsonl_file, "r", encoding="utf-8") as f:
+            for line in f:
+                message = decode_message(line)
+                writer.write(line, None if message is None else message.get("type") or "-")
+        writer.close()
+        after = os.path.getsize(writer.path)
+
+        # Never drop the original unless the compressed copy reads back identically
+        with open(jsonl_file, "r", encoding="utf-8") as f:
+            identical = list(f) == list(TranscriptReader(temp_dir).iter_lines())
+        if not identical:
+            raise click.ClickException(f"Compressed copy of {jsonl_file} does not match")
+        if dry_run:
+            return before, after
+
+        for path in (writer.path, writer.index_file):
+            os.replace(path, os.path.join(agent_dir, os.path.basename(path)))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    os.remove(jsonl_file)
+    if os.path.exists(json_file):
+        os.remove(json_file)
+
+    # agents/<adw_id>/<agent_name>/prompts -> agents/.prompts
+    prompt_dir = os.path.join(agent_dir, "prompts")
+    store_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(agent_dir))), ".prompts")
+    if os.path.isdir(prompt_dir):
+        for name in os.listdir(prompt_dir):
+            if name.endswith(".txt"):
+                prompt_file = os.path.join(prompt_dir, name)
+                with open(prompt_file, "r") as f:
+                    write_prompt_file(prompt_file, f.read(), deduplicate=True, store_dir=store_dir)
+
+    return before, after
+
+
+@cli.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True, file_okay=False))
+@click.option("--dry-run", is_flag=True, help="Report the savings without changing files")
+def compact(paths: Tuple[str, ...], dry_run: bool):
+    """Convert finished plain transcripts under PATHS (default: agents/) to compressed storage."""
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.table import Table
+
+    console = Console()
+    agent_dirs = find_agent_dirs(list(paths) or ["agents"])
+
+    table = Table(show_header=True, box=None)
+    table.add_column("Agent Directory", style="bold cyan")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+
+    total_before = total_after = skipped = 0
+    for agent_dir in agent_dirs:
+        if not run_finished(agent_dir):
+            skipped += 1
+            continue
+        before, after = compact_agent_dir(agent_dir, dry_run)
+        total_before += before
+        total_after += after
+        table.add_row(agent_dir, f"{before / 1024:,.0f} KB", f"{after / 1024:,.0f} KB")
+
+    table.add_row("Total", f"{total_before / 1024:,.0f} KB", f"{total_after / 1024:,.0f} KB", style="bold")
+    title = "🗜️  Transcript Compaction" + (" (dry run)" if dry_run else "")
+    console.print(Panel(table, title=f"[bold blue]{title}[/bold blue]", border_style="blue"))
+    if skipped:
+        console.print(f"[yellow]Skipped {skipped} run(s) that haven't finished writing their transcript[/yellow]")
+
+
+if __name__ == "__main__":
+    cli()
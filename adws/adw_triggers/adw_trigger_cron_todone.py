@@ -37,6 +37,15 @@ Examples:
 
     # Run once and exit
     ./adws/adw_triggers/adw_trigger_cron_todone.py --once
+
+    # Keep two pre-provisioned worktrees ready for new worktree groups
+    ./adws/adw_triggers/adw_trigger_cron_todone.py --pool-size 2
+
+    # Poll on a fixed interval instead of waking on tasks.md changes
+    ./adws/adw_triggers/adw_trigger_cron_todone.py --poll
+
+    # Use the /process_tasks agent instead of the native tasks.md parser
+    ./adws/adw_triggers/adw_trigger_cron_todone.py --agent-parser
 """
 
 import os
@@ -46,15 +55,12 @@ import time
 import subprocess
 import re
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, Tuple
 from datetime import datetime
 import click
-import schedule
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.live import Live
-from rich.layout import Layout
 from rich.align import Align
 
 # Add the parent directory to the path so we can import modules
@@ -62,12 +68,6 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 sys.path.insert(0, os.path.join(parent_dir, "adw_modules"))
 
-from agent import (
-    AgentTemplateRequest,
-    execute_template,
-    generate_short_id,
-)
-
 # Import our data models
 from data_models import (
     Task,
@@ -75,14 +75,29 @@ from data_models import (
     WorktreeTaskGroup,
     ProcessTasksResponse,
     CronTriggerConfig,
+    DelegatedTask,
     SystemTag,
+    WorktreeConfig,
 )
 
 # Import utility functions
-from utils import parse_json
+from utils import make_adw_id, parse_json
+from task_list import (
+    IncrementalTaskScanner,
+    content_hash,
+    locked_task_file,
+    mark_task_in_progress,
+    write_file_atomic,
+)
 
-# Configuration constants
-TARGET_DIRECTORY = "tac8_app2__multi_agent_todone"
+# The agent, worktree, watcher, worker and workflow model modules (and schedule)
+# are imported where they are first used, so a --once check with nothing to
+# dispatch starts fast
+if TYPE_CHECKING:
+    from file_watcher import InotifyWatcher
+    from workflow_models import WorkflowJob
+    from workflow_workers import WorkflowWorkerPool
+    from worktree_pool import WorktreePool
 
 
 class TaskListManager:
@@ -101,33 +116,12 @@ class TaskListManager:
     def update_task_to_in_progress(
         self, worktree_name: str, task_desc: str, adw_id: str
     ) -> bool:
-        """Update a task from [] or [⏰] to [🟡, adw_id] status using the /mark_in_progress command."""
+        """Update a task from [] or [⏰] to [🟡, adw_id] status with a locked, atomic write."""
         try:
-            request = AgentTemplateRequest(
-                agent_name="task-marker",
-                slash_command="/mark_in_progress",
-                args=[
-                    str(self.file_path),  # task_file_path
-                    worktree_name,
-                    task_desc,
-                    adw_id,
-                ],
-                adw_id=generate_short_id(),
-                model="sonnet",
-                working_dir=os.getcwd(),  # Run from project root
+            mark_task_in_progress(
+                str(self.file_path), worktree_name, task_desc, adw_id
             )
-
-            response = execute_template(request)
-            if response.success:
-                return True
-            else:
-                error_panel = Panel(
-                    f"Failed to mark task as in-progress: {task_desc}",
-                    title="[bold red]❌ Update Failed[/bold red]",
-                    border_style="red",
-                )
-                self.console.print(error_panel)
-                return False
+            return True
         except Exception as e:
             error_panel = Panel(
                 f"Error marking task as in-progress: {str(e)}",
@@ -139,7 +133,56 @@ class TaskListManager:
 
     def write_task_list(self, content: str):
         """Write updated content back to the task list file."""
-        self.file_path.write_text(content)
+        with locked_task_file(str(self.file_path)):
+            write_file_atomic(str(self.file_path), content)
+
+
+class TaskProcessTable:
+    """Tracks delegated workflow processes by ADW ID.
+
+    Finished processes are reaped with a non-blocking poll, so the trigger
+    always knows how many workflows are actually running and no zombie
+    processes are left behind.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[str, DelegatedTask] = {}
+        self._processes: Dict[str, Any] = {}
+
+    def add(self, task: DelegatedTask, process: Any):
+        """Start tracking a newly launched workflow process.
+
+        process is a subprocess.Popen or a WorkerProcess; only poll() is used.
+        """
+        self.tasks[task.adw_id] = task
+        self._processes[task.adw_id] = process
+
+    def reap(self) -> List[DelegatedTask]:
+        """Collect exit statuses of finished processes without blocking.
+
+        Returns:
+            Tasks whose processes exited since the last reap
+        """
+        finished = []
+        for adw_id, process in list(self._processes.items()):
+            exit_code = process.poll()
+            if exit_code is None:
+                continue
+
+            del self._processes[adw_id]
+            task = self.tasks[adw_id]
+            task.exit_code = exit_code
+            task.finished_at = datetime.now()
+            finished.append(task)
+        return finished
+
+    def running(self) -> List[DelegatedTask]:
+        """Tasks whose processes are still running."""
+        return [self.tasks[adw_id] for adw_id in self._processes]
+
+    @property
+    def running_count(self) -> int:
+        return len(self._processes)
 
 
 class CronTrigger:
@@ -149,40 +192,121 @@ class CronTrigger:
         self.config = config
         self.console = Console()
         self.task_manager = TaskListManager(config.task_file_path)
+        self.process_table = TaskProcessTable()
+        self.task_scanner = IncrementalTaskScanner()
+        self.worktree_pool = self.create_worktree_pool()
+        self.worker_pool = self.create_worker_pool()
+        # (mtime_ns, size, inode) of tasks.md and its content hash at the last evaluation
+        self._task_file_fingerprint: Optional[Tuple[int, int, int]] = None
+        self._evaluated_hash: Optional[str] = None
+        # Set when the last evaluation left eligible tasks undispatched
+        self._needs_recheck = True
         self.running = True
         self.stats = {
             "checks": 0,
+            "checks_skipped": 0,
+            "cached_parses": 0,
             "tasks_started": 0,
+            "tasks_finished": 0,
+            "tasks_failed": 0,
             "worktrees_created": 0,
             "errors": 0,
             "last_check": None,
         }
 
+    def create_worker_pool(self) -> Optional["WorkflowWorkerPool"]:
+        """Set up the forkserver worker pool unless subprocess mode is selected."""
+        if self.config.worker_mode != "forkserver" or self.config.dry_run:
+            return None
+        from workflow_workers import WorkflowWorkerPool, is_worker_pool_supported
+
+        if not is_worker_pool_supported():
+            self.config.worker_mode = "subprocess"
+            self.console.print(
+                "[yellow]forkserver not supported here, running workflows as subprocesses[/yellow]"
+            )
+            return None
+        return WorkflowWorkerPool()
+
+    def create_worktree_pool(self) -> Optional["WorktreePool"]:
+        """Set up the spare worktree pool, if enabled."""
+        if not self.config.worktree_pool_size or self.config.dry_run:
+            return None
+        from worktree import TARGET_DIRECTORY
+        from worktree_pool import WorktreePool
+
+        try:
+            return WorktreePool(
+                self.config.worktree_pool_size,
+                target_directory=TARGET_DIRECTORY,
+                repo_root=os.getcwd(),
+                base_dir=self.config.worktree_base_path,
+            )
+        except Exception as e:
+            self.console.print(
+                f"[yellow]Worktree pool disabled: {e}[/yellow]"
+            )
+            return None
+
     def check_worktree_exists(self, worktree_name: str) -> bool:
         """Check if a worktree already exists."""
         worktree_path = Path(self.config.worktree_base_path) / worktree_name
         return worktree_path.exists()
 
     def create_worktree(self, worktree_name: str) -> bool:
-        """Create a new worktree using the init_worktree command."""
+        """Create a new worktree with a sparse checkout of TARGET_DIRECTORY."""
+        return self.create_worktrees([worktree_name])[worktree_name]
+
+    def create_worktrees(self, worktree_names: List[str]) -> Dict[str, bool]:
+        """Create several worktrees in parallel with native git commands.
+
+        Returns:
+            Mapping of worktree name to whether it was created
+        """
         if self.config.dry_run:
-            self.console.print(
-                f"[yellow]DRY RUN: Would create worktree '{worktree_name}'[/yellow]"
-            )
-            return True
+            for worktree_name in worktree_names:
+                self.console.print(
+                    f"[yellow]DRY RUN: Would create worktree '{worktree_name}'[/yellow]"
+                )
+            return {worktree_name: True for worktree_name in worktree_names}
+
+        from worktree import TARGET_DIRECTORY, create_worktrees
+
+        # Claim pre-provisioned spares first, provision the rest from scratch
+        results = {}
+        to_provision = []
+        for worktree_name in worktree_names:
+            config = WorktreeConfig(worktree_name=worktree_name)
+            claimed_path = self.worktree_pool.claim(config) if self.worktree_pool else None
+            if claimed_path:
+                results[worktree_name] = claimed_path
+            else:
+                to_provision.append(config)
 
         try:
-            request = AgentTemplateRequest(
-                agent_name="worktree-creator",
-                slash_command="/init_worktree",
-                args=[worktree_name, TARGET_DIRECTORY],
-                adw_id=generate_short_id(),
-                model="sonnet",
-                working_dir=os.getcwd(),
+            results.update(
+                create_worktrees(
+                    to_provision,
+                    target_directory=TARGET_DIRECTORY,
+                    repo_root=os.getcwd(),
+                    base_dir=self.config.worktree_base_path,
+                )
             )
+        except Exception as e:
+            results.update({config.worktree_name: e for config in to_provision})
 
-            response = execute_template(request)
-            if response.success:
+        created = {}
+        for worktree_name, result in results.items():
+            if isinstance(result, Exception):
+                error_panel = Panel(
+                    f"Failed to create worktree '{worktree_name}': {result}",
+                    title="[bold red]❌ Worktree Creation Failed[/bold red]",
+                    border_style="red",
+                )
+                self.console.print(error_panel)
+                self.stats["errors"] += 1
+                created[worktree_name] = False
+            else:
                 self.stats["worktrees_created"] += 1
                 success_panel = Panel(
                     f"✓ Created worktree: {worktree_name}",
@@ -190,27 +314,38 @@ class CronTrigger:
                     border_style="green",
                 )
                 self.console.print(success_panel)
-                return True
-            else:
-                error_panel = Panel(
-                    f"Failed to create worktree: {worktree_name}",
-                    title="[bold red]❌ Worktree Creation Failed[/bold red]",
-                    border_style="red",
-                )
-                self.console.print(error_panel)
-                self.stats["errors"] += 1
-                return False
+                created[worktree_name] = True
+        return created
+
+    def get_eligible_tasks(self) -> List[WorktreeTaskGroup]:
+        """Get eligible tasks from the task list.
+
+        Parses tasks.md natively by default. The /process_tasks agent is only
+        used when use_agent_task_processor is enabled.
+        """
+        if self.config.use_agent_task_processor:
+            return self.get_eligible_tasks_via_agent()
+
+        try:
+            task_content = self.task_manager.read_task_list()
+        except FileNotFoundError:
+            # Task file doesn't exist, return empty list
+            return []
+
+        try:
+            response = self.task_scanner.scan(task_content)
+            return response.task_groups
         except Exception as e:
             error_panel = Panel(
-                f"Error creating worktree: {str(e)}",
-                title="[bold red]❌ Worktree Creation Error[/bold red]",
+                f"Error parsing task list: {str(e)}",
+                title="[bold red]❌ Parse Error[/bold red]",
                 border_style="red",
             )
             self.console.print(error_panel)
             self.stats["errors"] += 1
-            return False
+            return []
 
-    def get_eligible_tasks(self) -> List[WorktreeTaskGroup]:
+    def get_eligible_tasks_via_agent(self) -> List[WorktreeTaskGroup]:
         """Get eligible tasks by running the process_tasks command."""
         # First, check if there are any pending tasks in the file
         # to avoid unnecessary agent calls
@@ -233,17 +368,24 @@ class CronTrigger:
             )
 
         # If we found pending tasks (or couldn't check), proceed with agent call
+        from agent import AgentTemplateRequest, execute_template
+
         try:
             request = AgentTemplateRequest(
                 agent_name="task-processor",
                 slash_command="/process_tasks",
                 args=[],
-                adw_id=generate_short_id(),
+                adw_id=make_adw_id(),
                 model="sonnet",
                 working_dir=os.getcwd(),
+                timeout_seconds=300,
+                # Polls over an unchanged task file reuse the last answer
+                cache_inputs=[self.config.task_file_path],
             )
 
             response = execute_template(request)
+            if response.cached:
+                self.stats["cached_parses"] += 1
             if response.success:
                 # Parse the JSON response using the utility function
                 try:
@@ -272,6 +414,7 @@ class CronTrigger:
                 )
                 self.console.print(error_panel)
                 self.stats["errors"] += 1
+                self._needs_recheck = True
                 return []
         except Exception as e:
             error_panel = Panel(
@@ -281,16 +424,20 @@ class CronTrigger:
             )
             self.console.print(error_panel)
             self.stats["errors"] += 1
+            self._needs_recheck = True
             return []
 
     def delegate_task(
         self, worktree_name: str, task_desc: str, adw_id: str, tags: List[str] = None
-    ):
+    ) -> bool:
         """Delegate a task to the appropriate workflow based on tags.
 
         By default, uses the lightweight build-update workflow.
         If 'adw_plan_implement_update_task' tag is present, uses the full plan-implement-update workflow.
         Model selection: 'opus' tag uses opus model, 'sonnet' tag uses sonnet model, default is sonnet.
+
+        Returns:
+            True if the workflow was started (or would be, in dry-run mode)
         """
         # Extract workflow and model from tags
         tags = tags or []
@@ -304,7 +451,9 @@ class CronTrigger:
             self.console.print(
                 f"[yellow]DRY RUN: Would delegate task '{task_desc}' with ADW ID {adw_id} using {workflow_type} workflow with {model} model[/yellow]"
             )
-            return
+            return True
+
+        from workflow_models import WorkflowJob
 
         try:
             # Determine which workflow script to use
@@ -312,26 +461,21 @@ class CronTrigger:
                 # Use the full plan-implement-update workflow
                 workflow_script = "adw_plan_implement_update_task.py"
                 workflow_type = "plan-implement-update"
-                slash_command = "/plan + /implement + /update_task"
+                slash_command = "/plan + /implement + tasks.md update"
             else:
                 # Use the lightweight build-update workflow (default)
                 workflow_script = "adw_build_update_task.py"
                 workflow_type = "build-update"
-                slash_command = "/build + /update_task"
-
-            # Build the command to run the workflow
-            cmd = [
-                sys.executable,
-                os.path.join(parent_dir, workflow_script),
-                "--adw-id",
-                adw_id,
-                "--worktree-name",
-                worktree_name,
-                "--task",
-                task_desc,
-                "--model",
-                model,
-            ]
+                slash_command = "/build + tasks.md update"
+
+            job = WorkflowJob(
+                workflow=workflow_script,
+                adw_id=adw_id,
+                worktree_name=worktree_name,
+                task=task_desc,
+                model=model,
+                task_file=str(self.task_manager.file_path),
+            )
 
             # Create a panel showing the agent execution details
             exec_details = f"[bold]Slash Command:[/bold] {slash_command}\n"
@@ -350,8 +494,19 @@ class CronTrigger:
             )
             self.console.print(exec_panel)
 
-            # Run the workflow in a subprocess
-            result = subprocess.Popen(cmd)
+            # Run the workflow in a worker or subprocess, tracked so it can be reaped
+            process = self.start_workflow(job)
+            self.process_table.add(
+                DelegatedTask(
+                    adw_id=adw_id,
+                    worktree_name=worktree_name,
+                    task_description=task_desc,
+                    workflow=workflow_script,
+                    model=model,
+                    pid=process.pid,
+                ),
+                process,
+            )
 
             self.stats["tasks_started"] += 1
 
@@ -362,6 +517,7 @@ class CronTrigger:
                 border_style="green",
             )
             self.console.print(delegation_panel)
+            return True
 
         except Exception as e:
             error_panel = Panel(
@@ -371,12 +527,111 @@ class CronTrigger:
             )
             self.console.print(error_panel)
             self.stats["errors"] += 1
+            return False
+
+    def start_workflow(self, job: "WorkflowJob"):
+        """Start a workflow job in a forked worker, or a fresh subprocess.
+
+        Returns:
+            Handle with pid and a non-blocking poll() for the process table
+        """
+        if self.worker_pool:
+            return self.worker_pool.start_job(job)
+
+        cmd = [sys.executable, os.path.join(parent_dir, job.workflow), *job.to_args()]
+        return subprocess.Popen(cmd)
+
+    def reap_finished_tasks(self) -> int:
+        """Reap finished workflow processes and report their exit status.
+
+        Returns:
+            Number of workflows that finished since the last reap
+        """
+        finished = self.process_table.reap()
+        for task in finished:
+            self.stats["tasks_finished"] += 1
+            duration = (task.finished_at - task.started_at).total_seconds()
+            if task.exit_code == 0:
+                self.console.print(
+                    Panel(
+                        f"✓ {task.task_description}\n"
+                        f"[dim]ADW ID {task.adw_id} • {task.worktree_name} • {duration:.0f}s[/dim]",
+                        title="[bold green]🏁 Workflow Finished[/bold green]",
+                        border_style="green",
+                    )
+                )
+            else:
+                self.stats["tasks_failed"] += 1
+                self.console.print(
+                    Panel(
+                        f"✗ {task.task_description}\n"
+                        f"[dim]ADW ID {task.adw_id} • {task.worktree_name} • "
+                        f"exit code {task.exit_code} • {duration:.0f}s[/dim]",
+                        title="[bold red]❌ Workflow Exited With Error[/bold red]",
+                        border_style="red",
+                    )
+                )
+        return len(finished)
+
+    def task_file_changed(self) -> bool:
+        """Whether tasks.md differs from the content evaluated last time.
+
+        A stat() with an unchanged mtime, size and inode is trusted without
+        reading the file; otherwise the content hash decides, so touching or
+        rewriting the file with the same content doesn't count as a change.
+        """
+        try:
+            stat = os.stat(self.config.task_file_path)
+        except FileNotFoundError:
+            fingerprint = None
+        else:
+            fingerprint = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        if fingerprint == self._task_file_fingerprint:
+            return False
+        self._task_file_fingerprint = fingerprint
+
+        try:
+            new_hash = content_hash(self.task_manager.read_task_list())
+        except FileNotFoundError:
+            new_hash = None
+        if new_hash == self._evaluated_hash:
+            return False
+        self._evaluated_hash = new_hash
+        return True
+
+    def has_free_slot(self) -> bool:
+        """Whether another task may start under max_concurrent_tasks."""
+        return self.process_table.running_count < self.config.max_concurrent_tasks
+
+    def report_task_limit(self):
+        """Tell the user that dispatch is paused until a running task finishes."""
+        warning_panel = Panel(
+            f"Reached max concurrent tasks ({self.config.max_concurrent_tasks} running)",
+            title="[bold yellow]⚠️ Task Limit[/bold yellow]",
+            border_style="yellow",
+        )
+        self.console.print(warning_panel)
 
     def process_tasks(self):
         """Main task processing logic."""
         self.stats["checks"] += 1
         self.stats["last_check"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+        # Free the slots of workflows that exited since the last check
+        finished_count = self.reap_finished_tasks()
+        if not self.has_free_slot():
+            self.report_task_limit()
+            return
+
+        # Skip the evaluation when tasks.md is unchanged, no workflow finished
+        # and the last evaluation dispatched everything it found
+        file_changed = self.task_file_changed()
+        if not (file_changed or finished_count or self._needs_recheck):
+            self.stats["checks_skipped"] += 1
+            return
+        self._needs_recheck = False
+
         # Get eligible tasks
         task_groups = self.get_eligible_tasks()
 
@@ -433,23 +688,37 @@ class CronTrigger:
             )
             self.console.print(tasks_panel)
 
+        # Create missing worktrees up front, in parallel
+        missing_worktrees = [
+            group.worktree_name
+            for group in task_groups
+            if not self.check_worktree_exists(group.worktree_name)
+        ]
+        for worktree_name in missing_worktrees:
+            info_panel = Panel(
+                f"Worktree '{worktree_name}' doesn't exist, creating...",
+                title="[bold yellow]ℹ️ Creating Worktree[/bold yellow]",
+                border_style="yellow",
+            )
+            self.console.print(info_panel)
+        worktrees_created = self.create_worktrees(missing_worktrees)
+
         # Process each worktree group
+        dispatched = 0
         for group in task_groups:
-            # Check if worktree exists, create if needed
-            if not self.check_worktree_exists(group.worktree_name):
-                info_panel = Panel(
-                    f"Worktree '{group.worktree_name}' doesn't exist, creating...",
-                    title="[bold yellow]ℹ️ Creating Worktree[/bold yellow]",
-                    border_style="yellow",
-                )
-                self.console.print(info_panel)
-                if not self.create_worktree(group.worktree_name):
-                    continue  # Skip this group if worktree creation failed
+            if not worktrees_created.get(group.worktree_name, True):
+                continue  # Skip this group if worktree creation failed
 
             # Process tasks in this worktree
             for task in group.tasks_to_start:
+                # Respect max concurrent tasks, counting only running workflows
+                if not self.has_free_slot():
+                    self.report_task_limit()
+                    self._needs_recheck = True
+                    return
+
                 # Generate ADW ID for this task
-                adw_id = generate_short_id()
+                adw_id = make_adw_id()
 
                 # Update task status to in-progress
                 try:
@@ -480,9 +749,10 @@ class CronTrigger:
                         )
 
                     # Delegate task to workflow
-                    self.delegate_task(
+                    if self.delegate_task(
                         group.worktree_name, task.description, adw_id, task.tags
-                    )
+                    ):
+                        dispatched += 1
 
                 except Exception as e:
                     error_panel = Panel(
@@ -494,15 +764,9 @@ class CronTrigger:
                     self.stats["errors"] += 1
                     continue
 
-                # Respect max concurrent tasks
-                if self.stats["tasks_started"] >= self.config.max_concurrent_tasks:
-                    warning_panel = Panel(
-                        f"Reached max concurrent tasks ({self.config.max_concurrent_tasks})",
-                        title="[bold yellow]⚠️ Task Limit[/bold yellow]",
-                        border_style="yellow",
-                    )
-                    self.console.print(warning_panel)
-                    return
+        # Retry undispatched tasks on the next check even if tasks.md is unchanged
+        if dispatched < total_tasks:
+            self._needs_recheck = True
 
     def create_status_display(self) -> Panel:
         """Create a status display panel."""
@@ -514,12 +778,51 @@ class CronTrigger:
             "Status", "[green]Running[/green]" if self.running else "[red]Stopped[/red]"
         )
         table.add_row("Polling Interval", f"{self.config.polling_interval} seconds")
+        table.add_row(
+            "Wake Mode",
+            "File events (inotify)" if self.config.watch_files else "Polling",
+        )
         table.add_row("Task File", str(self.config.task_file_path))
         table.add_row("Dry Run", "Yes" if self.config.dry_run else "No")
+        table.add_row(
+            "Workers",
+            "Forkserver (preloaded)"
+            if self.config.worker_mode == "forkserver"
+            else "Subprocess per task",
+        )
+        table.add_row(
+            "Task Parser",
+            f"Agent (/process_tasks, {self.stats['cached_parses']} cached)"
+            if self.config.use_agent_task_processor
+            else "Native",
+        )
         table.add_row("", "")
-        table.add_row("Checks", str(self.stats["checks"]))
+        table.add_row(
+            "Checks",
+            f"{self.stats['checks']} ({self.stats['checks_skipped']} skipped, unchanged)",
+        )
         table.add_row("Tasks Started", str(self.stats["tasks_started"]))
+        table.add_row(
+            "Tasks Running",
+            f"{self.process_table.running_count} / {self.config.max_concurrent_tasks}",
+        )
+        table.add_row(
+            "Tasks Finished",
+            f"{self.stats['tasks_finished']} ({self.stats['tasks_failed']} failed)",
+        )
         table.add_row("Worktrees Created", str(self.stats["worktrees_created"]))
+        if self.worktree_pool:
+            pool = self.worktree_pool.get_metrics()
+            avg_provision = (
+                f", avg provision {pool['avg_provision_seconds']}s"
+                if pool["avg_provision_seconds"] is not None
+                else ""
+            )
+            table.add_row(
+                "Worktree Pool",
+                f"{pool['ready']}/{pool['size']} ready, "
+                f"{pool['hits']} hits / {pool['misses']} misses{avg_provision}",
+            )
         table.add_row("Errors", str(self.stats["errors"]))
         table.add_row("Last Check", self.stats["last_check"] or "Never")
 
@@ -536,26 +839,87 @@ class CronTrigger:
         self.process_tasks()
         self.console.print("\n[green]✅ Single check completed[/green]")
 
+    def create_watcher(self) -> Optional["InotifyWatcher"]:
+        """Watch tasks.md and the worktree base, or return None to fall back to polling."""
+        if not self.config.watch_files:
+            return None
+        from file_watcher import InotifyWatcher, WatcherUnavailable
+
+        try:
+            return InotifyWatcher(
+                [self.config.task_file_path],
+                directories=[self.config.worktree_base_path],
+                debounce_seconds=self.config.debounce_seconds,
+            )
+        except (WatcherUnavailable, OSError) as e:
+            self.config.watch_files = False
+            self.console.print(
+                f"[yellow]File events unavailable ({e}), falling back to polling[/yellow]"
+            )
+            return None
+
     def run_continuous(self):
-        """Run continuously with scheduled checks."""
-        # Schedule the task processing
-        schedule.every(self.config.polling_interval).seconds.do(self.process_tasks)
+        """Run continuously, waking on file events or scheduled checks."""
+        import schedule
+
+        watcher = self.create_watcher()
+        if self.worker_pool:
+            # Pay the workflow imports once, before the first task arrives
+            self.worker_pool.warm()
+        if self.worktree_pool:
+            self.worktree_pool.start()
+        if watcher is None:
+            # Schedule the task processing
+            schedule.every(self.config.polling_interval).seconds.do(self.process_tasks)
 
         self.console.print(self.create_status_display())
-        self.console.print(
-            f"\n[green]Started monitoring tasks every {self.config.polling_interval} seconds[/green]"
-        )
+        if watcher is not None:
+            self.console.print(
+                f"\n[green]Watching {self.config.task_file_path} for changes "
+                f"(re-checking at least every {self.config.polling_interval} seconds)[/green]"
+            )
+        else:
+            self.console.print(
+                f"\n[green]Started monitoring tasks every {self.config.polling_interval} seconds[/green]"
+            )
         self.console.print("[dim]Press Ctrl+C to stop[/dim]\n")
 
         try:
-            while self.running:
-                schedule.run_pending()
-                time.sleep(1)
+            if watcher is not None:
+                # Check once at startup, then whenever tasks.md or trees/ change.
+                # The polling interval still bounds the wait so finished
+                # workflows are reaped and their slots refilled.
+                self.process_tasks()
+                while self.running:
+                    watcher.wait(timeout=self.config.polling_interval)
+                    self.process_tasks()
+            else:
+                while self.running:
+                    schedule.run_pending()
+                    time.sleep(1)
         except KeyboardInterrupt:
             self.running = False
             self.console.print("\n[yellow]Stopping cron trigger...[/yellow]")
+            if self.worktree_pool:
+                self.worktree_pool.stop()
+            self.reap_finished_tasks()
+            running = self.process_table.running()
+            if running:
+                self.console.print(
+                    Panel(
+                        "\n".join(
+                            f"• {task.adw_id} (pid {task.pid}) {task.worktree_name}: {task.task_description}"
+                            for task in running
+                        ),
+                        title="[bold yellow]Workflows Still Running[/bold yellow]",
+                        border_style="yellow",
+                    )
+                )
             self.console.print(self.create_status_display())
             self.console.print("[green]✅ Cron trigger stopped[/green]")
+        finally:
+            if self.worker_pool:
+                self.worker_pool.shutdown()
 
 
 @click.command()
@@ -577,6 +941,28 @@ class CronTrigger:
 @click.option(
     "--once", is_flag=True, help="Run once and exit instead of continuous monitoring"
 )
+@click.option(
+    "--agent-parser",
+    is_flag=True,
+    help="Use the /process_tasks agent instead of the native tasks.md parser",
+)
+@click.option(
+    "--pool-size",
+    type=int,
+    default=0,
+    help="Spare pre-provisioned worktrees to keep ready (default: 0, disabled)",
+)
+@click.option(
+    "--worker-mode",
+    type=click.Choice(["forkserver", "subprocess"]),
+    default="subprocess",
+    help="Run workflows as fresh subprocesses (default) or in forks of a preloaded forkserver",
+)
+@click.option(
+    "--poll",
+    is_flag=True,
+    help="Poll on a fixed interval instead of waking on tasks.md changes (inotify)",
+)
 @click.option("--verbose", is_flag=True, help="Enable verbose output")
 def main(
     interval: int,
@@ -584,6 +970,10 @@ def main(
     dry_run: bool,
     max_tasks: int,
     once: bool,
+    agent_parser: bool,
+    pool_size: int,
+    worker_mode: str,
+    poll: bool,
     verbose: bool,
 ):
     """Monitor and distribute tasks from the multi-agent task list."""
@@ -595,6 +985,10 @@ def main(
         task_file_path=task_file,
         dry_run=dry_run,
         max_concurrent_tasks=max_tasks,
+        use_agent_task_processor=agent_parser,
+        watch_files=not poll,
+        worktree_pool_size=pool_size,
+        worker_mode=worker_mode,
     )
 
     # Create and run the trigger
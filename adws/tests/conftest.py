@@ -0,0 +1,6 @@
+"""Shared pytest setup: make adw_modules importable the way the ADW scripts do."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "adw_modules"))
@@ -0,0 +1,114 @@
+"""Tests for pipeline checkpointing: a resumed run skips phases that already completed."""
+
+import io
+import json
+
+import pytest
+from rich.console import Console
+
+import checkpoint
+import pipeline
+from workflow_models import PhaseResult
+from pipeline import Phase, Pipeline
+
+ADW_ID = "test1234"
+WORKFLOW = "test_workflow"
+
+
+@pytest.fixture(autouse=True)
+def agents_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "AGENTS_DIR", str(tmp_path))
+    monkeypatch.setattr(pipeline, "AGENTS_DIR", str(tmp_path))
+    return tmp_path
+
+
+class Recorder:
+    """Phase runners that count their calls and fail on demand."""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = set()
+
+    def phase(self, name, depends_on=None, run_always=False):
+        def run(ctx):
+            self.calls.append(name)
+            if name in self.failing:
+                return PhaseResult(phase=name, success=False, error=f"{name} broke")
+            upstream = {dependency: ctx.output(dependency, "value") for dependency in depends_on or []}
+            return PhaseResult(phase=name, success=True, outputs={"value": f"{name}-out", "upstream": upstream})
+
+        return Phase(name, run, agent_name=f"{name}_agent", depends_on=depends_on, run_always=run_always)
+
+    def pipeline(self):
+        return Pipeline(
+            WORKFLOW,
+            [
+                self.phase("plan"),
+                self.phase("implement", depends_on=["plan"]),
+                self.phase("update", depends_on=["implement"], run_always=True),
+            ],
+        )
+
+
+def run(recorder, resume):
+    if resume:
+        state = checkpoint.resume_checkpoint(ADW_ID, WORKFLOW)
+    else:
+        state = checkpoint.start_checkpoint(ADW_ID, WORKFLOW, {"task": "x"})
+    return recorder.pipeline().run(
+        state, model="sonnet", working_dir=".", resume=resume, console=Console(file=io.StringIO())
+    )
+
+
+def test_checkpoint_records_each_phase(agents_dir):
+    recorder = Recorder()
+    recorder.failing.add("implement")
+
+    result = run(recorder, resume=False)
+
+    assert not result.success
+    assert recorder.calls == ["plan", "implement", "update"]
+    saved = checkpoint.load_checkpoint(ADW_ID)
+    assert {name: phase.status for name, phase in saved.phases.items()} == {
+        "plan": "completed",
+        "implement": "failed",
+        "update": "completed",
+    }
+    assert (agents_dir / ADW_ID / "workflow_summary.json").exists()
+    with open(agents_dir / ADW_ID / "plan_agent" / pipeline.SUMMARY_JSON) as f:
+        assert json.load(f)["value"] == "plan-out"
+
+
+def test_resume_skips_completed_phases():
+    recorder = Recorder()
+    recorder.failing.add("implement")
+    run(recorder, resume=False)
+
+    recorder = Recorder()
+    result = run(recorder, resume=True)
+
+    assert result.success
+    # plan is restored; update ran before but must run again after implement
+    assert recorder.calls == ["implement", "update"]
+    assert result.results["plan"].resumed
+    assert not result.results["update"].resumed
+    # Restored outputs still reach the phases that run again
+    assert result.results["implement"].outputs["upstream"] == {"plan": "plan-out"}
+
+
+def test_resume_of_a_finished_run_runs_nothing():
+    run(Recorder(), resume=False)
+
+    recorder = Recorder()
+    result = run(recorder, resume=True)
+
+    assert result.success
+    assert recorder.calls == []
+    assert all(phase_result.resumed for phase_result in result.results.values())
+
+
+def test_resume_rejects_another_workflow():
+    run(Recorder(), resume=False)
+
+    with pytest.raises(checkpoint.CheckpointError):
+        checkpoint.resume_checkpoint(ADW_ID, "other_workflow")
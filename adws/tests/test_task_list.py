@@ -0,0 +1,112 @@
+"""Tests for the native tasks.md parser and status transitions."""
+
+import pytest
+
+from task_list import (
+    get_eligible_task_groups,
+    mark_task_completed,
+    mark_task_failed,
+    mark_task_in_progress,
+    mark_task_resumed,
+    parse_task_list,
+)
+
+TASKS_MD = """# Tasks
+
+## Git Worktree feature-auth
+[] Add login form
+[⏰] Wire up OAuth {opus, adw_plan_implement_update_task}
+[🟡, abc12345] Add logout button
+[✅ 1a2b3c4d5, def67890] Add session store
+[❌, 0badf00d] Add SSO // Failed: tests failed
+
+## Git Worktree feature-docs
+[✅ 9f8e7d6, 11111111] Write the README
+[⏰] Publish the docs {sonnet}
+
+## Notes
+[] Not a task: outside any worktree section
+"""
+
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    path = tmp_path / "tasks.md"
+    path.write_text(TASKS_MD, encoding="utf-8")
+    return path
+
+
+def test_parse_task_list_reads_every_status():
+    worktrees = parse_task_list(TASKS_MD)
+
+    assert [worktree.name for worktree in worktrees] == ["feature-auth", "feature-docs"]
+    auth = worktrees[0].tasks
+    assert [(task.status, task.adw_id, task.commit_hash) for task in auth] == [
+        ("[]", None, None),
+        ("[⏰]", None, None),
+        ("[🟡]", "abc12345", None),
+        ("[✅]", "def67890", "1a2b3c4d5"),
+        ("[❌]", "0badf00d", None),
+    ]
+    assert auth[1].description == "Wire up OAuth"
+    assert auth[1].tags == ["opus", "adw_plan_implement_update_task"]
+    # The failure note is not part of the description
+    assert auth[4].description == "Add SSO"
+    assert all(task.worktree_name == "feature-auth" for task in auth)
+
+
+def test_round_trip_keeps_untouched_lines(tasks_file):
+    mark_task_in_progress(str(tasks_file), "feature-auth", "Add login form", "aaaa1111")
+    mark_task_completed(str(tasks_file), "feature-auth", "Add login form", "aaaa1111", "c0ffee1")
+
+    content = tasks_file.read_text(encoding="utf-8")
+    assert content == TASKS_MD.replace("[] Add login form", "[✅ c0ffee1, aaaa1111] Add login form")
+
+    task = parse_task_list(content)[0].tasks[0]
+    assert (task.status, task.adw_id, task.commit_hash) == ("[✅]", "aaaa1111", "c0ffee1")
+
+
+def test_blocked_task_waits_for_every_task_above():
+    groups = {group.worktree_name: group.tasks_to_start for group in get_eligible_task_groups(TASKS_MD).task_groups}
+
+    # Tasks above "Wire up OAuth" are not all completed, so only the pending one starts
+    assert [task.description for task in groups["feature-auth"]] == ["Add login form"]
+    # Everything above "Publish the docs" is completed, so the blocked task starts
+    assert [(task.description, task.tags) for task in groups["feature-docs"]] == [("Publish the docs", ["sonnet"])]
+
+
+def test_blocked_tagged_task_keeps_tags_through_transitions(tasks_file):
+    mark_task_in_progress(str(tasks_file), "feature-auth", "Wire up OAuth", "bbbb2222")
+
+    line = tasks_file.read_text(encoding="utf-8").splitlines()[4]
+    assert line == "[🟡, bbbb2222] Wire up OAuth {opus, adw_plan_implement_update_task}"
+    task = parse_task_list(tasks_file.read_text(encoding="utf-8"))[0].tasks[1]
+    assert (task.status, task.adw_id, task.tags) == ("[🟡]", "bbbb2222", ["opus", "adw_plan_implement_update_task"])
+
+
+def test_failed_task_gets_note_and_resumes(tasks_file):
+    mark_task_failed(str(tasks_file), "feature-auth", "Add logout button", "abc12345", "build\nbroke")
+
+    lines = tasks_file.read_text(encoding="utf-8").splitlines()
+    assert lines[5] == "[❌, abc12345] Add logout button // Failed: build broke"
+
+    mark_task_resumed(str(tasks_file), "feature-auth", "abc12345")
+    lines = tasks_file.read_text(encoding="utf-8").splitlines()
+    # Resuming drops the failure note
+    assert lines[5] == "[🟡, abc12345] Add logout button"
+
+
+def test_refailing_replaces_the_previous_note(tasks_file):
+    mark_task_resumed(str(tasks_file), "feature-auth", "0badf00d")
+    mark_task_failed(str(tasks_file), "feature-auth", "Add SSO", "0badf00d")
+
+    lines = tasks_file.read_text(encoding="utf-8").splitlines()
+    assert lines[7] == "[❌, 0badf00d] Add SSO // Failed: Unknown error"
+
+
+def test_transition_rejects_tasks_in_other_statuses(tasks_file):
+    with pytest.raises(ValueError):
+        mark_task_in_progress(str(tasks_file), "feature-auth", "Add session store", "cccc3333")
+    with pytest.raises(ValueError):
+        mark_task_in_progress(str(tasks_file), "feature-missing", "Add login form", "cccc3333")
+    assert tasks_file.read_text(encoding="utf-8") == TASKS_MD
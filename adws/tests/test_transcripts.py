@@ -0,0 +1,96 @@
+"""Tests for transcript storage: reading back with and without the .idx index."""
+
+import json
+import os
+
+import pytest
+
+import transcripts
+from transcripts import TranscriptReader, TranscriptWriter
+
+MESSAGES = [
+    {"type": "system", "subtype": "init", "session_id": "s1"},
+    # Large enough that a compressed transcript spans several gzip frames
+    *({"type": "assistant", "message": {"text": f"step {i} " + "x" * (transcripts.FRAME_BYTES // 3)}} for i in range(6)),
+    {"type": "user", "message": {"text": "tool result"}},
+    {"type": "assistant", "message": {"text": "done"}},
+    {"type": "result", "subtype": "success", "result": "ok", "session_id": "s1"},
+]
+
+
+def write_transcript(output_dir, compressed):
+    output_file = os.path.join(output_dir, transcripts.OUTPUT_JSONL)
+    writer = TranscriptWriter(output_file, compressed=compressed)
+    for message in MESSAGES:
+        writer.write(json.dumps(message) + "\n", message["type"])
+    writer.close()
+    return writer
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "compressed"])
+def compressed(request):
+    return request.param
+
+
+@pytest.fixture(params=[True, False], ids=["indexed", "unindexed"])
+def reader(request, tmp_path, compressed):
+    writer = write_transcript(str(tmp_path), compressed)
+    if not request.param:
+        os.remove(writer.index_file)
+    reader = TranscriptReader(str(tmp_path))
+    assert reader.path == writer.path
+    index = reader.load_index()
+    assert (index is not None) == request.param
+    if index and compressed:
+        assert len(index[1]) > 1
+    return reader
+
+
+def test_messages_round_trip(reader):
+    assert reader.messages() == MESSAGES
+
+
+def test_result_and_last_message(reader):
+    assert reader.result_message() == MESSAGES[-1]
+    assert reader.last_message() == MESSAGES[-1]
+
+
+def test_message_at(reader):
+    assert reader.message_at(0) == MESSAGES[0]
+    assert reader.message_at(3) == MESSAGES[3]
+    assert reader.message_at(-2) == MESSAGES[-2]
+    assert reader.message_at(len(MESSAGES)) is None
+
+
+def test_last_messages_by_type(reader):
+    assistant = [message for message in MESSAGES if message["type"] == "assistant"]
+    assert reader.last_messages(3, "assistant") == assistant[-3:]
+    assert reader.last_messages(2) == MESSAGES[-2:]
+    assert reader.last_messages(0) == []
+
+
+def test_write_json_array(reader):
+    with open(reader.write_json_array()) as f:
+        assert json.load(f) == MESSAGES
+
+
+def test_index_for_another_file_is_ignored(tmp_path):
+    writer = write_transcript(str(tmp_path), compressed=False)
+    with open(writer.index_file, "r+") as f:
+        f.write("# other.jsonl")
+
+    reader = TranscriptReader(writer.path)
+    assert reader.load_index() is None
+    assert reader.result_message() == MESSAGES[-1]
+
+
+def test_index_entries_past_the_data_are_dropped(tmp_path):
+    writer = write_transcript(str(tmp_path), compressed=False)
+    # A crashed run: the last message was indexed but never reached the disk
+    with open(writer.path, "rb+") as f:
+        f.truncate(os.path.getsize(writer.path) - 5)
+
+    reader = TranscriptReader(writer.path)
+    assert len(reader.load_index()[0]) == len(MESSAGES) - 1
+    assert reader.result_message() is None
+    assert reader.last_message() == MESSAGES[-2]